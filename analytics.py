@@ -0,0 +1,242 @@
+import numpy as np
+import pandas as pd
+from database import (get_db_connection, get_read_connection, execute_with_retry, run_write,
+                      get_data_version, set_derived_version, FT_POSSESSION_FACTOR)
+from leaderboard import DERIVED_NAME as LEADERBOARD_NAME
+
+# 파생 데이터 이름 (derived_versions 테이블 키)
+DERIVED_NAME = 'advanced_stats'
+
+# 계산에 쓰는 원시 기록 컬럼
+RAW_COLUMNS = [
+    'points', 'field_goals_made', 'field_goals_attempt', 'three_points_made',
+    'free_throws_attempt', 'offensive_rebounds', 'defensive_rebounds', 'rebounds',
+    'assists', 'turnovers'
+]
+
+# 지표 컬럼과 표시 이름
+PLAYER_METRICS = {
+    'true_shooting': 'TS%',
+    'effective_fg': 'eFG%',
+    'ast_tov': 'AST/TOV',
+    'usage_rate': 'USG%',
+    'offensive_rebound_rate': 'ORB%',
+    'defensive_rebound_rate': 'DRB%',
+    'rebound_rate': 'REB%',
+    'possessions_used': '공격 점유',
+    'offensive_rating': 'ORtg'
+}
+
+TEAM_METRICS = {
+    'true_shooting': 'TS%',
+    'effective_fg': 'eFG%',
+    'ast_tov': 'AST/TOV',
+    'offensive_rebound_rate': 'ORB%',
+    'defensive_rebound_rate': 'DRB%',
+    'rebound_rate': 'REB%',
+    'possessions': '포제션',
+    'pace': '페이스',
+    'offensive_rating': 'ORtg',
+    'defensive_rating': 'DRtg',
+    'net_rating': 'NetRtg'
+}
+
+def _ratio(num, den, scale=1.0):
+    """0으로 나누는 경우 NaN을 돌려주는 벡터 나눗셈"""
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    out = np.full(np.broadcast(num, den).shape, np.nan)
+    np.divide(num * scale, den, out=out, where=den != 0)
+    return out
+
+def compute_shooting_metrics(df):
+    """TS%, eFG%, AST/TOV 계산 (선수/팀 공통)"""
+    fga = df['field_goals_attempt'].to_numpy(dtype=float)
+    fta = df['free_throws_attempt'].to_numpy(dtype=float)
+    return {
+        'true_shooting': _ratio(df['points'], 2 * (fga + FT_POSSESSION_FACTOR * fta), 100),
+        'effective_fg': _ratio(df['field_goals_made'] + 0.5 * df['three_points_made'], fga, 100),
+        'ast_tov': _ratio(df['assists'], df['turnovers'])
+    }
+
+def compute_team_metrics(team_df):
+    """팀 경기별 고급 지표 계산
+
+    team_df는 (game_date, team, opponent) 행과 원시 기록 컬럼, 그리고
+    같은 경기 상대팀 기록이 opp_ 접두어로 붙어 있어야 한다.
+    """
+    metrics = compute_shooting_metrics(team_df)
+
+    oreb = team_df['offensive_rebounds'].to_numpy(dtype=float)
+    dreb = team_df['defensive_rebounds'].to_numpy(dtype=float)
+    opp_oreb = team_df['opp_offensive_rebounds'].to_numpy(dtype=float)
+    opp_dreb = team_df['opp_defensive_rebounds'].to_numpy(dtype=float)
+
+    possessions = (team_df['field_goals_attempt'] + FT_POSSESSION_FACTOR * team_df['free_throws_attempt']
+                   - team_df['offensive_rebounds'] + team_df['turnovers']).to_numpy(dtype=float)
+    opp_possessions = (team_df['opp_field_goals_attempt'] + FT_POSSESSION_FACTOR * team_df['opp_free_throws_attempt']
+                       - team_df['opp_offensive_rebounds'] + team_df['opp_turnovers']).to_numpy(dtype=float)
+    # 양 팀 포제션 평균을 경기 페이스로 사용
+    pace = (possessions + opp_possessions) / 2
+
+    metrics.update({
+        'offensive_rebound_rate': _ratio(oreb, oreb + opp_dreb, 100),
+        'defensive_rebound_rate': _ratio(dreb, dreb + opp_oreb, 100),
+        'rebound_rate': _ratio(team_df['rebounds'], team_df['rebounds'] + team_df['opp_rebounds'], 100),
+        'possessions': possessions,
+        'pace': pace,
+        'offensive_rating': _ratio(team_df['points'], pace, 100),
+        'defensive_rating': _ratio(team_df['opp_points'], pace, 100)
+    })
+    metrics['net_rating'] = metrics['offensive_rating'] - metrics['defensive_rating']
+    return pd.DataFrame(metrics, index=team_df.index)
+
+def compute_player_metrics(player_df, team_df):
+    """선수 경기별 고급 지표 계산
+
+    USG%와 리바운드 비율은 팀 합계 대비 비율에 출전시간 가중치
+    (팀 출전시간 / 5 / 선수 출전시간)를 곱한다. 팀 출전시간은 같은 경기 팀 선수들의 합이다.
+    """
+    metrics = compute_shooting_metrics(player_df)
+
+    # 선수 행마다 소속팀 / 상대팀 경기 기록 붙이기
+    team_cols = ['game_date', 'team', 'field_goals_attempt', 'free_throws_attempt', 'turnovers',
+                 'offensive_rebounds', 'defensive_rebounds', 'rebounds',
+                 'opp_offensive_rebounds', 'opp_defensive_rebounds', 'opp_rebounds']
+    merged = player_df[['game_date', 'team']].merge(
+        team_df[team_cols].add_prefix('team_').rename(columns={'team_game_date': 'game_date', 'team_team': 'team'}),
+        on=['game_date', 'team'], how='left'
+    )
+
+    seconds = player_df['seconds_played'].to_numpy(dtype=float)
+    team_seconds = player_df.groupby(['game_date', 'team'])['seconds_played'].transform('sum').to_numpy(dtype=float)
+    minute_share = _ratio(team_seconds / 5, seconds)
+
+    used = (player_df['field_goals_attempt'] + FT_POSSESSION_FACTOR * player_df['free_throws_attempt']
+            + player_df['turnovers']).to_numpy(dtype=float)
+    team_used = (merged['team_field_goals_attempt'] + FT_POSSESSION_FACTOR * merged['team_free_throws_attempt']
+                 + merged['team_turnovers']).to_numpy(dtype=float)
+
+    metrics.update({
+        'usage_rate': _ratio(used, team_used, 100) * minute_share,
+        'offensive_rebound_rate': _ratio(player_df['offensive_rebounds'],
+                                         merged['team_offensive_rebounds'] + merged['team_opp_defensive_rebounds'],
+                                         100) * minute_share,
+        'defensive_rebound_rate': _ratio(player_df['defensive_rebounds'],
+                                         merged['team_defensive_rebounds'] + merged['team_opp_offensive_rebounds'],
+                                         100) * minute_share,
+        'rebound_rate': _ratio(player_df['rebounds'], merged['team_rebounds'] + merged['team_opp_rebounds'],
+                               100) * minute_share,
+        'possessions_used': used,
+        'offensive_rating': _ratio(player_df['points'], used, 100)
+    })
+    return pd.DataFrame(metrics, index=player_df.index)
+
+def _load_league_rows(conn, league_id):
+    """리그의 팀 경기 / 선수 경기 원시 기록 조회"""
+    # team_stats는 득점 컬럼 이름이 total_score
+    team_columns = {c: ('total_score' if c == 'points' else c) for c in RAW_COLUMNS}
+    team_query = f'''
+    SELECT ts.game_date, ts.team, ts.opponent,
+           {', '.join(f'ts.{src} as {c}' for c, src in team_columns.items())},
+           {', '.join(f'opp.{src} as opp_{c}' for c, src in team_columns.items())}
+    FROM game_league gl
+    JOIN team_stats ts ON ts.game_date = gl.game_date AND ts.team IN (gl.team1, gl.team2)
+    JOIN team_stats opp ON opp.game_date = ts.game_date AND opp.team = ts.opponent
+    WHERE gl.league_id = ?
+    '''
+    player_query = f'''
+    SELECT ps.game_date, ps.team, ps.player, ps.seconds_played, {', '.join('ps.' + c for c in RAW_COLUMNS)}
+    FROM game_league gl
+    JOIN player_stats ps ON ps.game_date = gl.game_date AND ps.team IN (gl.team1, gl.team2)
+    WHERE gl.league_id = ?
+    '''
+    team_df = pd.read_sql_query(team_query, conn, params=(league_id,))
+    player_df = pd.read_sql_query(player_query, conn, params=(league_id,))
+    return team_df, player_df
+
+def _to_rows(df):
+    """NaN을 None으로 바꿔 executemany 입력으로 변환"""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+def refresh_advanced_metrics(league_id):
+    """리그의 모든 선수/팀 경기 고급 지표를 다시 계산해 저장
+
+    경기 저장 / 리그 할당 뒤에 호출한다. 조회 함수는 저장된 지표만 읽고 다시 계산하지 않는다.
+    """
+    version = get_data_version(league_id)
+
+    def _load():
+        with get_db_connection() as conn:
+            return _load_league_rows(conn, league_id)
+
+    team_df, player_df = execute_with_retry(_load)
+    team_out = pd.concat([team_df[['game_date', 'team', 'opponent']],
+                          compute_team_metrics(team_df)], axis=1)
+    player_out = pd.concat([player_df[['game_date', 'team', 'player']],
+                            compute_player_metrics(player_df, team_df)], axis=1)
+    team_out.insert(3, 'league_id', league_id)
+    player_out.insert(3, 'league_id', league_id)
+
+    def _write(conn):
+        conn.execute('DELETE FROM team_advanced_stats WHERE league_id = ?', (league_id,))
+        conn.execute('DELETE FROM player_advanced_stats WHERE league_id = ?', (league_id,))
+        conn.executemany(
+            f'''INSERT OR REPLACE INTO team_advanced_stats ({', '.join(team_out.columns)})
+                VALUES ({', '.join(['?'] * len(team_out.columns))})''',
+            _to_rows(team_out))
+        conn.executemany(
+            f'''INSERT OR REPLACE INTO player_advanced_stats ({', '.join(player_out.columns)})
+                VALUES ({', '.join(['?'] * len(player_out.columns))})''',
+            _to_rows(player_out))
+        set_derived_version(conn, DERIVED_NAME, league_id, version)
+        # 순위표의 USG%도 이 지표에서 읽으므로 다음 조회 때 다시 계산되도록
+        conn.execute('DELETE FROM derived_versions WHERE name = ? AND league_id = ?', (LEADERBOARD_NAME, league_id))
+
+    # 계산은 호출한 스레드에서, 저장만 writer 스레드에서
+    run_write(_write)
+    print(f"리그 {league_id} 고급 지표 갱신: 팀 {len(team_out)}행, 선수 {len(player_out)}행")
+
+def get_player_season_advanced(player_name, team, league_id):
+    """선수의 시즌 고급 지표 (원시 기록 합계 기준) 조회
+
+    저장된 경기별 지표를 읽기만 한다 (갱신 전이면 이전 지표, 없으면 None).
+    USG% / REB%는 출전시간 가중 평균이다.
+    """
+
+    def _get_stats():
+        with get_read_connection() as conn:
+            query = '''
+            SELECT
+                SUM(ps.points) as points,
+                SUM(ps.field_goals_made) as field_goals_made,
+                SUM(ps.field_goals_attempt) as field_goals_attempt,
+                SUM(ps.three_points_made) as three_points_made,
+                SUM(ps.free_throws_attempt) as free_throws_attempt,
+                SUM(ps.assists) as assists,
+                SUM(ps.turnovers) as turnovers,
+                SUM(pas.usage_rate * ps.seconds_played)
+                    / NULLIF(SUM(CASE WHEN pas.usage_rate IS NOT NULL THEN ps.seconds_played END), 0) as usage_rate,
+                SUM(pas.rebound_rate * ps.seconds_played)
+                    / NULLIF(SUM(CASE WHEN pas.rebound_rate IS NOT NULL THEN ps.seconds_played END), 0) as rebound_rate,
+                SUM(ps.points) * 100.0 / NULLIF(SUM(pas.possessions_used), 0) as offensive_rating
+            FROM player_advanced_stats pas
+            JOIN player_stats ps ON ps.game_date = pas.game_date
+                AND ps.team = pas.team AND ps.player = pas.player
+            WHERE pas.league_id = ? AND pas.player = ? AND pas.team = ?
+            '''
+            return pd.read_sql_query(query, conn, params=(league_id, player_name, team))
+
+    df = execute_with_retry(_get_stats)
+    if df.empty or pd.isna(df['points'].iloc[0]):
+        return None
+    season = df.iloc[0]
+    shooting = compute_shooting_metrics(df.fillna(0))
+    return {
+        'true_shooting': shooting['true_shooting'][0],
+        'effective_fg': shooting['effective_fg'][0],
+        'ast_tov': shooting['ast_tov'][0],
+        'usage_rate': season['usage_rate'],
+        'rebound_rate': season['rebound_rate'],
+        'offensive_rating': season['offensive_rating']
+    }
@@ -8,7 +8,13 @@ from components.player_page import show_player_page
 from components.game_page import show_game_page
 from components.upload_page import show_upload_page
 from components.team_ranking_page import show_team_ranking_page
+from components.team_page import show_team_page
 from components.player_ranking_page import show_player_ranking_page
+from components.records_page import show_records_page
+from components.game_log_page import show_game_log_page
+from components.debug_panel import (is_debug_mode, show_debug_panel, get_profile_mode,
+                                    show_render_profile)
+from profiling import start_render_profile, finish_render_profile, render_span, enable_query_profiling
 
 # 페이지 설정을 가장 먼저 호출
 st.set_page_config(
@@ -70,36 +76,68 @@ st.markdown("""
 
 def main():
     """메인 함수"""
-    # data 폴더가 없으면 생성
-    os.makedirs("./data", exist_ok=True)
+    # 렌더링 프로파일 (?profile=1, ?profile=cprofile 또는 환경 변수로 켬)
+    profile_mode = get_profile_mode()
+    # 쿼리 프로파일링은 디버그 패널이나 렌더링 프로파일을 볼 때만 켬
+    if is_debug_mode() or profile_mode:
+        enable_query_profiling()
+    if profile_mode:
+        start_render_profile(cprofile=profile_mode == 'cprofile')
     
-    # 데이터베이스 초기화 (앱 시작 시 한 번만)
-    if 'db_initialized' not in st.session_state:
-        init_db()
-        st.session_state.db_initialized = True
+    try:
+        # data 폴더가 없으면 생성
+        os.makedirs("./data", exist_ok=True)
     
-    # 탭 메뉴
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["경기 기록", "선수 기록", "팀 순위", "개인 순위", "업로드"])
+        # 데이터베이스 초기화 (앱 시작 시 한 번만)
+        if 'db_initialized' not in st.session_state:
+            with render_span('page', 'init_db'):
+                init_db()
+            st.session_state.db_initialized = True
     
-    # 경기 기록 탭
-    with tab1:
-        show_game_page()
+        # 탭 메뉴
+        tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs(["경기 기록", "선수 기록", "팀 순위", "팀 기록", "개인 순위", "기록", "기록 검색", "업로드"])
     
-    # 선수 기록 탭
-    with tab2:
-        show_player_page()
+        # 경기 기록 탭
+        with tab1, render_span('page', '경기 기록'):
+            show_game_page()
     
-    # 팀 순위 탭
-    with tab3:
-        show_team_ranking_page()
+        # 선수 기록 탭
+        with tab2, render_span('page', '선수 기록'):
+            show_player_page()
     
-    # 개인 순위 탭
-    with tab4:
-        show_player_ranking_page()
+        # 팀 순위 탭
+        with tab3, render_span('page', '팀 순위'):
+            show_team_ranking_page()
     
-    # 업로드 탭
-    with tab5:
-        show_upload_page()
+        # 팀 기록 탭
+        with tab4, render_span('page', '팀 기록'):
+            show_team_page()
+    
+        # 개인 순위 탭
+        with tab5, render_span('page', '개인 순위'):
+            show_player_ranking_page()
+    
+        # 기록 탭
+        with tab6, render_span('page', '기록'):
+            show_records_page()
+    
+        # 기록 검색 탭
+        with tab7, render_span('page', '기록 검색'):
+            show_game_log_page()
+    
+        # 업로드 탭
+        with tab8, render_span('page', '업로드'):
+            show_upload_page()
+    
+        # 디버그 패널 (?debug=1일 때만 표시)
+        if is_debug_mode():
+            show_debug_panel()
+    
+    finally:
+        # 예외로 rerun이 중단돼도 스레드에 프로파일이 남지 않게 정리
+        profile = finish_render_profile() if profile_mode else None
+    
+    show_render_profile(profile)
 
 if __name__ == "__main__":
     main()
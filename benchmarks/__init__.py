@@ -0,0 +1 @@
+"""데이터 계층 성능 측정용 합성 리그 생성기와 벤치마크"""
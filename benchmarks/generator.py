@@ -0,0 +1,193 @@
+import os
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+
+# 합성 리그 시작 날짜 (라운드마다 하루씩 증가)
+START_DATE = date(2024, 1, 6)
+
+# 선수 기록 컬럼 순서 (업로드 파일 형식)
+PLAYER_COLUMNS = [
+    'Nº', 'Player', 'MIN', 'PTS', 'FGM', 'FGA', 'FG%', '2PM', '2PA', '2P%',
+    '3PM', '3PA', '3P%', 'FTM', 'FTA', 'FT%', 'OREB', 'DREB', 'REB',
+    'AST', 'STL', 'BLK', 'TOV', 'PF', '+/-', 'EFF'
+]
+
+# 엑셀 세 번째 시트의 팀 스탯 라벨 (팀명 행 다음 22행)
+EXCEL_STAT_LABELS = [
+    '2PA', '2PM', '2P%', '3PA', '3PM', '3P%', 'FGA', 'FGM', 'FG%',
+    'FTA', 'FTM', 'FT%', 'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK',
+    'TOV', 'PF', '+/-', 'EFF'
+]
+
+def team_name(league_index, team_index):
+    return f"리그{league_index + 1}팀{team_index + 1:02d}"
+
+def round_robin(n_teams):
+    """원형 방식 라운드 로빈 일정 (라운드별 (홈, 원정) 목록)"""
+    teams = list(range(n_teams))
+    if n_teams % 2:
+        teams.append(None)  # 부전승
+    rounds = []
+    for _ in range(len(teams) - 1):
+        half = len(teams) // 2
+        pairs = [(teams[i], teams[-1 - i]) for i in range(half)]
+        rounds.append([p for p in pairs if None not in p])
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds
+
+def _percentage(made, attempt):
+    return np.round(np.divide(made * 100.0, attempt, out=np.zeros(len(made)), where=attempt > 0), 1)
+
+def generate_box_score(rng, players, skills):
+    """팀 한 경기 선수 기록 (업로드 파일과 같은 컬럼)"""
+    n = len(players)
+    seconds = rng.integers(5 * 60, 36 * 60, n)
+    share = seconds / seconds.sum()
+    usage = skills * share * n
+
+    fga2 = rng.poisson(8 * usage)
+    fgm2 = rng.binomial(fga2, 0.48)
+    fga3 = rng.poisson(4 * usage)
+    fgm3 = rng.binomial(fga3, 0.33)
+    fta = rng.poisson(2.5 * usage)
+    ftm = rng.binomial(fta, 0.7)
+    oreb = rng.poisson(1.2 * share * n)
+    dreb = rng.poisson(3.0 * share * n)
+    ast = rng.poisson(2.5 * usage)
+    stl = rng.poisson(0.8 * share * n)
+    blk = rng.poisson(0.5 * share * n)
+    tov = rng.poisson(1.5 * usage)
+    pf = rng.integers(0, 5, n)
+    pts = fgm2 * 2 + fgm3 * 3 + ftm
+    fga = fga2 + fga3
+    fgm = fgm2 + fgm3
+    reb = oreb + dreb
+    eff = pts + reb + ast + stl + blk - (fga - fgm) - (fta - ftm) - tov
+
+    return pd.DataFrame({
+        'Nº': np.arange(1, n + 1),
+        'Player': players,
+        'MIN': [f"{s // 60}:{s % 60:02d}" for s in seconds],
+        'PTS': pts, 'FGM': fgm, 'FGA': fga, 'FG%': _percentage(fgm, fga),
+        '2PM': fgm2, '2PA': fga2, '2P%': _percentage(fgm2, fga2),
+        '3PM': fgm3, '3PA': fga3, '3P%': _percentage(fgm3, fga3),
+        'FTM': ftm, 'FTA': fta, 'FT%': _percentage(ftm, fta),
+        'OREB': oreb, 'DREB': dreb, 'REB': reb,
+        'AST': ast, 'STL': stl, 'BLK': blk, 'TOV': tov, 'PF': pf,
+        '+/-': rng.integers(-15, 16, n), 'EFF': eff
+    })[PLAYER_COLUMNS]
+
+def team_total(rng, players_df):
+    """선수 기록 합계로 팀 전체 기록 생성 (쿼터 점수 포함)"""
+    total = {c: int(players_df[c].sum()) for c in PLAYER_COLUMNS if c not in ('Nº', 'Player', 'MIN')
+             and not c.endswith('%')}
+    for pct, made, attempt in (('FG%', 'FGM', 'FGA'), ('2P%', '2PM', '2PA'),
+                               ('3P%', '3PM', '3PA'), ('FT%', 'FTM', 'FTA')):
+        total[pct] = f"{total[made] * 100.0 / total[attempt]:.1f}%" if total[attempt] else "0.0%"
+    quarters = rng.multinomial(total['PTS'], [0.25] * 4)
+    total.update({f'Q{i + 1}': int(q) for i, q in enumerate(quarters)})
+    return pd.Series(total)
+
+def generate_leagues(n_leagues, n_teams, n_games, n_players, seed=0):
+    """합성 리그 경기 목록 생성 (같은 인자와 seed면 항상 같은 결과)
+
+    리그마다 n_teams팀 라운드 로빈 일정을 반복해 n_games경기를 만들고,
+    팀마다 n_players명 로스터(선수별 고정 실력 계수)를 쓴다.
+    """
+    rng = np.random.default_rng(seed)
+    games = []
+    for league_index in range(n_leagues):
+        teams = [team_name(league_index, t) for t in range(n_teams)]
+        rosters = {team: [f"{team}선수{p + 1:02d}" for p in range(n_players)] for team in teams}
+        skills = {team: rng.gamma(4.0, 0.25, n_players) for team in teams}
+
+        schedule = round_robin(n_teams)
+        round_index = 0
+        league_games = 0
+        while league_games < n_games:
+            game_date = (START_DATE + timedelta(days=round_index)).isoformat()
+            for home, away in schedule[round_index % len(schedule)]:
+                if league_games >= n_games:
+                    break
+                team1, team2 = teams[home], teams[away]
+                team1_players = generate_box_score(rng, rosters[team1], skills[team1])
+                team2_players = generate_box_score(rng, rosters[team2], skills[team2])
+                games.append({
+                    'league': f"합성리그{league_index + 1}",
+                    'game_date': game_date,
+                    'team1': team1,
+                    'team2': team2,
+                    'team1_players': team1_players,
+                    'team1_total': team_total(rng, team1_players),
+                    'team2_players': team2_players,
+                    'team2_total': team_total(rng, team2_players)
+                })
+                league_games += 1
+            round_index += 1
+    return games
+
+def populate_database(games):
+    """생성한 경기를 리그 생성 → 저장 → 리그 할당 → 고급 지표 갱신 순서로 DB에 넣음 (리그 이름: id)"""
+    from database import create_league, get_leagues, save_game_data, assign_game_to_league
+    from analytics import refresh_advanced_metrics
+
+    for league in dict.fromkeys(g['league'] for g in games):
+        create_league(league)
+    leagues_df = get_leagues()
+    league_ids = dict(zip(leagues_df['league_name'].astype(str), leagues_df['league_id'].astype(int)))
+
+    for g in games:
+        save_game_data(g['game_date'], g['team1'], g['team2'], g['team1_players'], g['team1_total'],
+                       g['team2_players'], g['team2_total'])
+        assign_game_to_league(g['game_date'], g['team1'], g['team2'], league_ids[g['league']])
+    for league_id in league_ids.values():
+        refresh_advanced_metrics(league_id)
+    return league_ids
+
+def game_filename(game, ext):
+    """업로드 페이지가 해석하는 파일명 (stats_팀1_vs_팀2_YY-M-D.ext)"""
+    d = date.fromisoformat(game['game_date'])
+    return f"stats_{game['team1']}_vs_{game['team2']}_{d.year % 100:02d}-{d.month}-{d.day}.{ext}"
+
+def write_csv_file(game, directory):
+    """CSV 형식 경기 파일 (팀1 선수 + 합계, 빈 구분 행, 팀2 선수 + 합계)"""
+    rows = []
+    for players_key, total_key in (('team1_players', 'team1_total'), ('team2_players', 'team2_total')):
+        players_df = game[players_key].astype(object)
+        total = game[total_key]
+        total_row = {c: total.get(c, '') for c in PLAYER_COLUMNS}
+        total_row.update({'Nº': 'TOTAL', 'Player': '', 'MIN': ''})
+        rows.append(pd.concat([players_df, pd.DataFrame([total_row])], ignore_index=True))
+        rows.append(pd.DataFrame([{c: None for c in PLAYER_COLUMNS}]))
+    df = pd.concat(rows[:-1], ignore_index=True)
+
+    path = os.path.join(directory, game_filename(game, 'csv'))
+    df.to_csv(path, index=False)
+    return path
+
+def write_excel_file(game, directory):
+    """엑셀 형식 경기 파일 (팀1 선수 / 팀2 선수 / 스코어보드 + 팀 스탯 시트)"""
+    path = os.path.join(directory, game_filename(game, 'xlsx'))
+    t1, t2 = game['team1_total'], game['team2_total']
+    scoreboard = pd.DataFrame([
+        [game['team1'], t1['Q1'], t1['Q2'], t1['Q3'], t1['Q4'], t1['PTS']],
+        [game['team2'], t2['Q1'], t2['Q2'], t2['Q3'], t2['Q4'], t2['PTS']]
+    ], columns=['Team', 'Q1', 'Q2', 'Q3', 'Q4', 'PTS'])
+    team_stats = pd.DataFrame(
+        [[game['team1'], '', game['team2']]] +
+        [[t1.get(label, 0), label, t2.get(label, 0)] for label in EXCEL_STAT_LABELS],
+        columns=['team1', 'stat', 'team2']
+    )
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        game['team1_players'].to_excel(writer, sheet_name='team1', index=False)
+        game['team2_players'].to_excel(writer, sheet_name='team2', index=False)
+        scoreboard.to_excel(writer, sheet_name='team_stats', index=False, startrow=0)
+        team_stats.to_excel(writer, sheet_name='team_stats', index=False, startrow=4)
+    return path
+
+def write_game_files(games, directory, formats=('csv', 'xlsx')):
+    """경기마다 업로드 형식 파일 생성 (형식별 경로 목록 반환)"""
+    os.makedirs(directory, exist_ok=True)
+    writers = {'csv': write_csv_file, 'xlsx': write_excel_file}
+    return {fmt: [writers[fmt](g, directory) for g in games] for fmt in formats}
@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import database
+import profiling
+from analytics import refresh_advanced_metrics
+from benchmarks.generator import generate_leagues, populate_database
+from benchmarks.run import use_database, quiet
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+
+# 세션 동작: (탭, 위젯 종류, 찾는 기준, 라벨 또는 key)
+# rerun 지연 시간은 동작이 속한 탭별로 집계한다
+ACTIONS = {
+    'switch_league': ('경기 기록', 'selectbox', 'label', '리그 선택'),
+    'pick_game': ('경기 기록', 'selectbox', 'label', '경기 선택'),
+    'pick_player': ('선수 기록', 'selectbox', 'label', '선수 선택'),
+    'trend_scope': ('선수 기록', 'radio', 'key', 'player_trend_scope'),
+    'team_league': ('팀 순위', 'selectbox', 'key', 'team_ranking_league_select'),
+    'ranking_stat': ('개인 순위', 'selectbox', 'key', 'player_ranking_stat_select'),
+    'ranking_basis': ('개인 순위', 'radio', 'key', 'player_ranking_basis_select')
+}
+
+PERCENTILES = (50, 95, 99)
+
+# 첫 실행 때 스크립트를 컴파일하는데, Python 3.11의 ast.parse는 여러 스레드에서
+# 동시에 호출하면 실패할 수 있어 세션 첫 실행만 순서대로 진행
+_first_run_lock = threading.Lock()
+
+class LoadTestResults:
+    """세션 스레드들이 함께 쓰는 측정 결과 (동작별 rerun 시간, 탭별 렌더링 시간)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reruns = []  # (탭, 동작, 초)
+        self.page_spans = []  # (탭, ms)
+        self.uploads = []  # 초
+        self.errors = []
+
+    def add_rerun(self, action, seconds):
+        with self.lock:
+            self.reruns.append((ACTIONS[action][0] if action in ACTIONS else action, action, seconds))
+
+    def add_profile(self, profile):
+        with self.lock:
+            self.page_spans += [(name, ms) for kind, name, _, ms, _ in profile.spans if kind == 'page']
+
+    def add_error(self, message):
+        with self.lock:
+            self.errors.append(message)
+
+def _percentile_table(df, group, value):
+    """그룹별 횟수와 p50/p95/p99 (ms)"""
+    if df.empty:
+        return pd.DataFrame(columns=[group, 'count'] + [f'p{p}_ms' for p in PERCENTILES])
+    rows = []
+    for key, values in df.groupby(group, sort=False)[value]:
+        values = values.to_numpy()
+        row = {group: key, 'count': len(values)}
+        row.update({f'p{p}_ms': round(float(np.percentile(values, p)), 2) for p in PERCENTILES})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def _find_widget(at, kind, by, name):
+    """위젯 종류와 라벨/key로 첫 번째 위젯 찾기 (없으면 None)"""
+    for widget in getattr(at, kind):
+        if getattr(widget, by) == name:
+            return widget
+    return None
+
+def _apply_action(rng, at, action):
+    """동작 하나를 위젯에 반영 (현재 값이 아닌 다른 옵션 선택, 위젯이 없으면 False)"""
+    _, kind, by, name = ACTIONS[action]
+    widget = _find_widget(at, kind, by, name)
+    if widget is None or len(widget.options) < 2:
+        return False
+    index = rng.choice([i for i in range(len(widget.options)) if i != widget.index])
+    if kind == 'selectbox':
+        widget.select_index(index)
+    else:
+        widget.set_value(widget.options[index])
+    return True
+
+def run_session(session_index, steps, seed, results):
+    """세션 하나: 첫 실행 후 steps번 무작위 동작 + rerun"""
+    rng = random.Random(seed + session_index)
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.query_params['profile'] = '1'
+        with _first_run_lock:
+            started = time.perf_counter()
+            at.run()
+            results.add_rerun('first_load', time.perf_counter() - started)
+
+        for _ in range(steps):
+            action = rng.choice(list(ACTIONS))
+            if not _apply_action(rng, at, action):
+                continue
+            started = time.perf_counter()
+            at.run()
+            results.add_rerun(action, time.perf_counter() - started)
+            if at.exception:
+                results.add_error(f"{action}: {at.exception[0].message}")
+    except Exception as e:
+        results.add_error(f"세션 {session_index}: {e}")
+
+def run_uploads(games, league_ids, interval, results, stop):
+    """세션과 동시에 경기 업로드 (저장 → 리그 할당 → 고급 지표 갱신)"""
+    for g in games:
+        if stop.is_set():
+            break
+        started = time.perf_counter()
+        league_id = league_ids[g['league']]
+        database.save_game_data(g['game_date'], g['team1'], g['team2'], g['team1_players'],
+                                g['team1_total'], g['team2_players'], g['team2_total'])
+        database.assign_game_to_league(g['game_date'], g['team1'], g['team2'], league_id)
+        refresh_advanced_metrics(league_id)
+        with results.lock:
+            results.uploads.append(time.perf_counter() - started)
+        stop.wait(interval)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='동시 세션 부하 테스트 (Streamlit AppTest)')
+    parser.add_argument('--sessions', type=int, default=4, help='동시 세션 수 (K)')
+    parser.add_argument('--steps', type=int, default=10, help='세션당 동작 수')
+    parser.add_argument('--leagues', type=int, default=2)
+    parser.add_argument('--teams', type=int, default=8)
+    parser.add_argument('--games', type=int, default=40, help='리그당 시드 경기 수')
+    parser.add_argument('--players', type=int, default=10)
+    parser.add_argument('--uploads', type=int, default=0, help='세션과 동시에 업로드할 리그당 경기 수')
+    parser.add_argument('--upload-interval', type=float, default=0.5, help='업로드 간격 (초)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', default=None)
+    parser.add_argument('--output', default=None, help='결과 JSON 저장 경로')
+    args = parser.parse_args(argv)
+
+    # app.py가 상대 경로(./font, ./data)를 쓰므로 저장소 루트에서 실행
+    os.chdir(ROOT)
+    workdir = args.workdir or tempfile.mkdtemp(prefix='navoto_load_')
+    db_path = os.path.join(workdir, 'load.db')
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    use_database(db_path, os.path.join(workdir, 'snapshots'))
+
+    print(f"시드 데이터 생성: 리그 {args.leagues}개 x {args.games}경기")
+    games = generate_leagues(args.leagues, args.teams, args.games + args.uploads, args.players, seed=args.seed)
+    seed_games = [g for i, g in enumerate(games) if i % (args.games + args.uploads) < args.games]
+    upload_games = [g for i, g in enumerate(games) if i % (args.games + args.uploads) >= args.games]
+    with quiet():
+        database.init_db()
+        league_ids = populate_database(seed_games)
+
+    results = LoadTestResults()
+    profiling.add_profile_listener(results.add_profile)
+    retries_before = database.get_write_metrics()['lock_retries']
+
+    stop = threading.Event()
+    threads = [threading.Thread(target=run_session, args=(i, args.steps, args.seed, results))
+               for i in range(args.sessions)]
+    if upload_games:
+        threads.append(threading.Thread(target=run_uploads,
+                                        args=(upload_games, league_ids, args.upload_interval, results, stop)))
+    # sys.stdout 교체는 스레드마다 하면 꼬이므로 동시 실행 구간 전체에서 한 번만 숨김
+    started = time.perf_counter()
+    with quiet():
+        for t in threads:
+            t.start()
+        for t in threads[:args.sessions]:
+            t.join()
+        stop.set()
+        for t in threads[args.sessions:]:
+            t.join()
+    elapsed = time.perf_counter() - started
+
+    reruns = pd.DataFrame(results.reruns, columns=['tab', 'action', 'seconds'])
+    reruns['ms'] = reruns['seconds'] * 1000
+    pages = pd.DataFrame(results.page_spans, columns=['tab', 'ms'])
+    write_metrics = database.get_write_metrics()
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'config': vars(args),
+        'elapsed_seconds': round(elapsed, 2),
+        'reruns': int(len(reruns)),
+        'rerun_latency_by_tab': _percentile_table(reruns, 'tab', 'ms').to_dict('records'),
+        'rerun_latency_by_action': _percentile_table(reruns, 'action', 'ms').to_dict('records'),
+        'page_render_by_tab': _percentile_table(pages, 'tab', 'ms').to_dict('records'),
+        'uploads': len(results.uploads),
+        'upload_p95_ms': round(float(np.percentile(results.uploads, 95)) * 1000, 2) if results.uploads else None,
+        'lock_retries': write_metrics['lock_retries'] - retries_before,
+        'write_metrics': write_metrics,
+        'errors': results.errors
+    }
+
+    print(f"\n세션 {args.sessions}개, rerun {len(reruns)}회, {elapsed:.1f}초")
+    print("\n[탭별 rerun 지연 시간]")
+    print(pd.DataFrame(report['rerun_latency_by_tab']).to_string(index=False))
+    print("\n[탭별 페이지 렌더링 시간]")
+    print(pd.DataFrame(report['page_render_by_tab']).to_string(index=False))
+    print(f"\n업로드 {report['uploads']}건 (p95 {report['upload_p95_ms']}ms), 락 재시도 {report['lock_retries']}회, "
+          f"쓰기 대기열 최대 {write_metrics['max_queue_depth']}")
+    if results.errors:
+        print(f"\n오류 {len(results.errors)}건")
+        for message in results.errors[:10]:
+            print(f"  {message}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        print(f"결과 저장: {args.output}")
+    return report
+
+if __name__ == '__main__':
+    main()
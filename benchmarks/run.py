@@ -0,0 +1,223 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+import snapshot
+import percentiles
+import head_to_head
+import simulation
+import similarity
+import profiling
+from data_loader import load_csv_data, load_excel_data
+from leaderboard import get_leaderboard
+from standings import get_standings
+from components.player_page import (get_league_players, get_player_teams, get_player_games,
+                                    get_player_game_stats, get_player_recent_games)
+from benchmarks.generator import generate_leagues, write_game_files
+
+# 크기별 합성 리그 설정 (리그 수, 리그당 팀 수, 리그당 경기 수, 로스터 인원)
+SIZES = {
+    'small': {'n_leagues': 1, 'n_teams': 6, 'n_games': 30, 'n_players': 10},
+    'medium': {'n_leagues': 2, 'n_teams': 10, 'n_games': 90, 'n_players': 12},
+    'large': {'n_leagues': 4, 'n_teams': 16, 'n_games': 240, 'n_players': 15}
+}
+
+# 로더 측정에 쓸 최대 파일 수 (형식별)
+MAX_LOADER_FILES = 20
+
+def use_database(db_path, snapshot_dir):
+    """벤치마크용 DB / 스냅샷 경로로 전환하고 프로세스 캐시 초기화"""
+    database.DB_PATH = db_path
+    snapshot.SNAPSHOT_DIR = snapshot_dir
+    snapshot._open_snapshots.clear()
+    percentiles._cache.clear()
+    head_to_head._cache.clear()
+    simulation._cache.clear()
+    similarity._index = None
+    profiling.reset_query_stats()
+
+@contextlib.contextmanager
+def quiet():
+    """측정 중 데이터 계층의 print 출력 숨김"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+def summarize(samples):
+    """측정값(초) 목록을 ms 통계로 변환"""
+    ms = [s * 1000 for s in samples]
+    return {
+        'count': len(ms),
+        'min_ms': round(min(ms), 3),
+        'median_ms': round(statistics.median(ms), 3),
+        'mean_ms': round(statistics.fmean(ms), 3),
+        'p95_ms': round(float(np.percentile(ms, 95)), 3),
+        'max_ms': round(max(ms), 3)
+    }
+
+def time_call(func, repeat):
+    """func를 repeat번 실행한 시간 목록"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with quiet():
+            func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def run_size(name, spec, repeat, seed, workdir):
+    """크기 하나에 대해 DB를 새로 만들고 모든 시나리오 측정"""
+    size_dir = os.path.join(workdir, name)
+    os.makedirs(size_dir, exist_ok=True)
+    db_path = os.path.join(size_dir, 'bench.db')
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    use_database(db_path, os.path.join(size_dir, 'snapshots'))
+
+    games = generate_leagues(seed=seed, **spec)
+    scenarios = {}
+    with quiet():
+        database.init_db()
+        for league in dict.fromkeys(g['league'] for g in games):
+            database.create_league(league)
+        leagues_df = database.get_leagues()
+    league_ids = dict(zip(leagues_df['league_name'].astype(str), leagues_df['league_id'].astype(int)))
+
+    # 경기 저장 (경기마다 한 번씩)
+    save_samples, assign_samples = [], []
+    for g in games:
+        save_samples += time_call(lambda: database.save_game_data(
+            g['game_date'], g['team1'], g['team2'], g['team1_players'], g['team1_total'],
+            g['team2_players'], g['team2_total']), 1)
+        assign_samples += time_call(lambda: database.assign_game_to_league(
+            g['game_date'], g['team1'], g['team2'], league_ids[g['league']]), 1)
+    scenarios['save_game_data'] = summarize(save_samples)
+    scenarios['assign_game_to_league'] = summarize(assign_samples)
+
+    league_id = league_ids[games[0]['league']]
+
+    # 파생 테이블 최초 계산 (캐시 없는 첫 조회)
+    scenarios['get_leaderboard_cold'] = summarize(time_call(lambda: get_leaderboard(league_id, 'points'), 1))
+
+    # 리그 조회
+    scenarios['get_league_games'] = summarize(time_call(lambda: database.get_league_games(league_id), repeat))
+    scenarios['get_standings'] = summarize(time_call(lambda: get_standings(league_id), repeat))
+    scenarios['get_player_rankings'] = summarize(
+        time_call(lambda: database.get_player_rankings(league_id, 'points'), repeat))
+    scenarios['get_leaderboard'] = summarize(time_call(lambda: get_leaderboard(league_id, 'points'), repeat))
+
+    # 선수 페이지 조회 (득점 1위 선수 기준)
+    with quiet():
+        leader = get_leaderboard(league_id, 'points', limit=1).iloc[0]
+        player = str(leader['선수명'])
+        game_date = str(get_player_games(player, league_id)['game_date'].iloc[0])
+        player_id = database.get_player_id(player, str(leader['팀명']))
+    scenarios['get_league_players'] = summarize(time_call(lambda: get_league_players(league_id), repeat))
+    scenarios['get_player_teams'] = summarize(time_call(lambda: get_player_teams(player, league_id), repeat))
+    scenarios['get_player_games'] = summarize(time_call(lambda: get_player_games(player, league_id), repeat))
+    scenarios['get_player_game_stats'] = summarize(
+        time_call(lambda: get_player_game_stats(player, game_date), repeat))
+    scenarios['get_player_recent_games'] = summarize(
+        time_call(lambda: get_player_recent_games(player_id, league_id), repeat))
+    scenarios['get_player_career_stats'] = summarize(
+        time_call(lambda: database.get_player_career_stats(player_id), repeat))
+
+    # 업로드 파일 로더 (파일마다 한 번씩)
+    files = write_game_files(games[:MAX_LOADER_FILES], os.path.join(size_dir, 'files'))
+    scenarios['load_csv_data'] = summarize(sum((time_call(lambda: load_csv_data(f), 1) for f in files['csv']), []))
+    scenarios['load_excel_data'] = summarize(sum((time_call(lambda: load_excel_data(f), 1) for f in files['xlsx']), []))
+
+    with quiet():
+        conn = database.get_db_connection()
+        rows = {
+            'player_stats': conn.execute('SELECT COUNT(*) FROM player_stats').fetchone()[0],
+            'team_stats': conn.execute('SELECT COUNT(*) FROM team_stats').fetchone()[0],
+            'db_bytes': os.path.getsize(db_path)
+        }
+        conn.close()
+    return {'spec': spec, 'rows': rows, 'scenarios': scenarios}
+
+def environment():
+    """측정 환경 정보 (결과 비교 시 확인용)"""
+    return {
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'query_profile': profiling.QUERY_PROFILE_ENABLED,
+        'read_replica': database.READ_REPLICA_ENABLED
+    }
+
+def compare(baseline, current):
+    """두 결과 파일의 시나리오별 중앙값 비교표"""
+    rows = []
+    for size, result in current['sizes'].items():
+        base_scenarios = baseline.get('sizes', {}).get(size, {}).get('scenarios', {})
+        for scenario, stats in result['scenarios'].items():
+            base = base_scenarios.get(scenario)
+            rows.append({
+                'size': size,
+                'scenario': scenario,
+                'baseline_ms': base['median_ms'] if base else None,
+                'current_ms': stats['median_ms'],
+                'ratio': round(stats['median_ms'] / base['median_ms'], 2) if base and base['median_ms'] else None
+            })
+    return pd.DataFrame(rows)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='데이터 계층 벤치마크')
+    parser.add_argument('--sizes', default='small,medium', help=f"쉼표로 구분 ({', '.join(SIZES)})")
+    parser.add_argument('--repeat', type=int, default=5, help='조회 시나리오 반복 횟수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', default=None, help='DB / 파일 생성 경로 (기본: 임시 디렉토리)')
+    parser.add_argument('--output', default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', default=None, help='비교할 이전 결과 JSON')
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip() for s in args.sizes.split(',') if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"알 수 없는 크기: {', '.join(unknown)}")
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='navoto_bench_')
+    result = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'environment': environment(),
+        'sizes': {}
+    }
+    for name in sizes:
+        print(f"[{name}] {SIZES[name]}")
+        result['sizes'][name] = run_size(name, SIZES[name], args.repeat, args.seed, workdir)
+        table = pd.DataFrame(result['sizes'][name]['scenarios']).T[['count', 'median_ms', 'p95_ms', 'max_ms']]
+        print(table.to_string())
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(compare(baseline, result).to_string(index=False))
+    return result
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+from profiling import render_span
+
+# 캐시에 보관할 최대 차트 수 (서버 프로세스 단위)
+MAX_CACHED_FIGURES = 256
+
+# 차트 하나당 직렬화 크기 예산 (바이트)
+PAYLOAD_BUDGET_BYTES = 200_000
+
+# 트렌드 차트에 그릴 최대 점 수 (초과 시 서버에서 다운샘플링)
+TREND_POINT_BUDGET = 400
+
+_figure_cache = OrderedDict()
+_payload_stats = {}
+_lock = threading.Lock()
+
+def make_stat_key(data):
+    """차트 입력 데이터를 캐시 키로 변환"""
+    if isinstance(data, pd.DataFrame):
+        hashed = pd.util.hash_pandas_object(data, index=False).values.tobytes()
+        return hashlib.sha1(hashed + ','.join(map(str, data.columns)).encode()).hexdigest()
+    if isinstance(data, (dict, pd.Series)):
+        return tuple((str(k), round(float(v), 4)) for k, v in data.items())
+    return data
+
+def _record_payload(kind, payload_bytes, hit):
+    """차트 종류별 직렬화 크기와 캐시 적중 기록"""
+    stats = _payload_stats.setdefault(kind, {
+        'charts': 0, 'hits': 0, 'misses': 0, 'last_bytes': 0, 'max_bytes': 0, 'total_bytes': 0
+    })
+    stats['charts'] += 1
+    stats['hits' if hit else 'misses'] += 1
+    stats['last_bytes'] = payload_bytes
+    stats['max_bytes'] = max(stats['max_bytes'], payload_bytes)
+    stats['total_bytes'] += payload_bytes
+
+def get_cached_figure(kind, data, version, builder):
+    """(차트 종류, 스탯 벡터, 데이터 버전) 기준으로 캐시된 차트 반환
+
+    캐시에 없으면 builder()로 차트를 생성해 저장한다. 직렬화 크기는 예산 확인용으로
+    생성할 때 한 번만 재고 JSON은 보관하지 않는다 (st.plotly_chart가 직접 직렬화).
+    """
+    key = (kind, version, make_stat_key(data))
+
+    with _lock:
+        entry = _figure_cache.get(key)
+        if entry is not None:
+            _figure_cache.move_to_end(key)
+            _record_payload(kind, entry['payload_bytes'], hit=True)
+            return entry['figure']
+
+    with render_span('chart', kind):
+        fig = builder()
+        payload_bytes = len(pio.to_json(fig, validate=False).encode('utf-8'))
+    if payload_bytes > PAYLOAD_BUDGET_BYTES:
+        print(f"차트 크기 예산 초과: {kind} ({payload_bytes:,} bytes)")
+
+    with _lock:
+        _figure_cache[key] = {
+            'figure': fig,
+            'payload_bytes': payload_bytes
+        }
+        _figure_cache.move_to_end(key)
+        while len(_figure_cache) > MAX_CACHED_FIGURES:
+            _figure_cache.popitem(last=False)
+        _record_payload(kind, payload_bytes, hit=False)
+
+    return fig
+
+def decimate_frame(df, value_columns, max_points=TREND_POINT_BUDGET):
+    """점 개수가 예산을 넘으면 구간별 최솟값/최댓값 행만 남겨 다운샘플링
+
+    시간 순으로 정렬된 df를 구간으로 나누고 각 구간에서 value_columns(컬럼 하나 또는 목록)
+    각각의 최소/최대 행을 남겨 어느 기록의 극값도 사라지지 않게 한다.
+    처음과 마지막 행은 항상 유지한다.
+    """
+    if isinstance(value_columns, str):
+        value_columns = [value_columns]
+    n = len(df)
+    if n <= max_points:
+        return df
+
+    # 구간마다 기록별 최소/최대 2개씩 남기므로 기록 수만큼 구간을 줄여 예산을 맞춤
+    n_buckets = max(1, (max_points - 2) // (2 * len(value_columns)))
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(int)
+    keep = [0, n - 1]
+    for column in value_columns:
+        values = df[column].to_numpy(dtype=float)
+        for start, end in zip(edges[:-1], edges[1:]):
+            if end <= start:
+                continue
+            bucket = values[start:end]
+            keep.append(start + int(np.argmin(bucket)))
+            keep.append(start + int(np.argmax(bucket)))
+    return df.iloc[np.unique(keep)]
+
+def get_payload_stats():
+    """차트 종류별 직렬화 크기 통계를 DataFrame으로 반환"""
+    with _lock:
+        rows = [{'kind': kind, **stats} for kind, stats in _payload_stats.items()]
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        df['avg_bytes'] = (df['total_bytes'] / df['charts']).round(0)
+        df['over_budget'] = df['max_bytes'] > PAYLOAD_BUDGET_BYTES
+    return df
+
+def clear_figure_cache():
+    """차트 캐시 초기화"""
+    with _lock:
+        _figure_cache.clear()
+        _payload_stats.clear()
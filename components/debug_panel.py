@@ -0,0 +1,123 @@
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from database import get_write_metrics, get_replica_stats, get_memory_report
+from profiling import (get_query_summary, get_slow_queries, reset_query_stats, SLOW_QUERY_MS, SLOW_QUERY_LOG_PATH,
+                       RENDER_PROFILE_ENABLED)
+from components.charts import get_payload_stats
+
+# 렌더링 프로파일 구간 종류별 색
+SPAN_COLORS = {'page': '#1f77b4', 'db': '#ff7f0e', 'chart': '#2ca02c'}
+
+def is_debug_mode():
+    """URL에 ?debug=1이 있으면 디버그 패널 표시"""
+    return st.query_params.get('debug') == '1'
+
+def get_profile_mode():
+    """렌더링 프로파일 모드 ('1', 'cprofile' 또는 None)"""
+    mode = st.query_params.get('profile')
+    if mode in ('1', 'cprofile'):
+        return mode
+    return '1' if RENDER_PROFILE_ENABLED else None
+
+def show_debug_panel():
+    """쿼리 프로파일 / 느린 쿼리 / 쓰기 대기열 / 메모리 사용량 디버그 패널"""
+    with st.expander("디버그", expanded=False):
+        query_tab, slow_tab, system_tab = st.tabs(["쿼리 요약", "느린 쿼리", "시스템"])
+
+        with query_tab:
+            summary_df = get_query_summary()
+            if summary_df.empty:
+                st.info("기록된 쿼리가 없습니다.")
+            else:
+                st.caption(f"쿼리 {int(summary_df['calls'].sum())}회, 총 {summary_df['total_ms'].sum():.1f}ms")
+                st.dataframe(
+                    summary_df,
+                    column_config={
+                        "caller": st.column_config.TextColumn("호출 함수", width="medium"),
+                        "sql": st.column_config.TextColumn("쿼리", width="large"),
+                        "calls": st.column_config.NumberColumn("횟수", format="%d"),
+                        "total_ms": st.column_config.NumberColumn("총 시간", format="%.1f ms"),
+                        "avg_ms": st.column_config.NumberColumn("평균", format="%.2f ms"),
+                        "max_ms": st.column_config.NumberColumn("최대", format="%.2f ms"),
+                        "avg_rows": st.column_config.NumberColumn("평균 행 수", format="%.1f")
+                    },
+                    hide_index=True
+                )
+            if st.button("쿼리 기록 초기화", key="debug_reset_queries"):
+                reset_query_stats()
+
+        with slow_tab:
+            st.caption(f"{SLOW_QUERY_MS:.0f}ms 이상 쿼리 (로그 파일: {SLOW_QUERY_LOG_PATH})")
+            slow_df = get_slow_queries()
+            if slow_df.empty:
+                st.info("느린 쿼리가 없습니다.")
+            for _, row in slow_df.head(20).iterrows():
+                st.markdown(f"**{row['ms']:.1f}ms** · {row['rows']}행 · `{row['caller']}`")
+                st.code(row['sql'], language='sql')
+                if row['plan']:
+                    st.code(row['plan'], language='text')
+
+        with system_tab:
+            st.subheader("쓰기 대기열")
+            st.dataframe(pd.DataFrame([get_write_metrics()]), hide_index=True)
+            st.subheader("읽기 복제본")
+            st.dataframe(pd.DataFrame([get_replica_stats()]), hide_index=True)
+            st.subheader("조회 결과 메모리")
+            st.dataframe(get_memory_report(), hide_index=True)
+            st.subheader("차트 크기")
+            payload_df = get_payload_stats()
+            if payload_df.empty:
+                st.info("생성된 차트가 없습니다.")
+            else:
+                st.dataframe(payload_df, hide_index=True)
+
+def create_waterfall_chart(spans_df):
+    """구간별 시작 시각 / 소요 시간 워터폴 차트"""
+    fig = go.Figure()
+    labels = [f"{'  ' * depth}{name}" for name, depth in zip(spans_df['name'], spans_df['depth'])]
+    for kind, color in SPAN_COLORS.items():
+        mask = (spans_df['kind'] == kind).to_numpy()
+        if not mask.any():
+            continue
+        fig.add_trace(go.Bar(
+            y=[f"{i:03d} {label}" for i, label in enumerate(labels) if mask[i]],
+            x=spans_df.loc[mask, 'duration_ms'],
+            base=spans_df.loc[mask, 'start_ms'],
+            orientation='h',
+            name=kind,
+            marker_color=color,
+            hovertemplate='%{y}<br>시작 %{base:.1f}ms, %{x:.1f}ms<extra></extra>'
+        ))
+    fig.update_layout(
+        barmode='overlay',
+        height=max(200, 18 * len(spans_df) + 60),
+        margin=dict(l=10, r=10, t=10, b=10),
+        xaxis_title='ms',
+        yaxis=dict(autorange='reversed', showticklabels=False),
+        legend=dict(orientation='h')
+    )
+    return fig
+
+def show_render_profile(profile):
+    """rerun 렌더링 프로파일 (워터폴 / 누적 시간)을 사이드바에 표시"""
+    if profile is None:
+        return
+    spans_df = profile.to_frame()
+    with st.sidebar:
+        st.subheader("렌더링 프로파일")
+        st.caption(f"전체 {profile.total_ms:.1f}ms, 구간 {len(spans_df)}개")
+        if not spans_df.empty:
+            st.plotly_chart(create_waterfall_chart(spans_df), use_container_width=True)
+            st.dataframe(
+                profile.totals(),
+                column_config={
+                    "kind": st.column_config.TextColumn("종류"),
+                    "name": st.column_config.TextColumn("이름"),
+                    "count": st.column_config.NumberColumn("횟수", format="%d"),
+                    "total_ms": st.column_config.NumberColumn("누적", format="%.1f ms")
+                },
+                hide_index=True
+            )
+        if profile.cprofile_path:
+            st.caption(f"cProfile 저장: {profile.cprofile_path}")
@@ -0,0 +1,83 @@
+import streamlit as st
+from database import get_leagues
+from game_log import FILTER_STATS, PAGE_SIZE, GameLogFilter, search_game_log, get_filter_options
+
+def _select_optional(label, options, key, format_func=str):
+    """맨 앞에 '전체'(None)가 있는 선택 상자"""
+    return st.selectbox(
+        label,
+        [None] + list(options),
+        format_func=lambda x: "전체" if x is None else format_func(x),
+        key=key
+    )
+
+def show_game_log_page():
+    """경기 기록 검색 페이지 (조건별 선수 경기 기록, 최근 경기부터 페이지 단위 조회)"""
+    st.title("경기 기록 검색")
+    
+    leagues_df = get_leagues()
+    league_names = dict(zip(leagues_df['league_id'].tolist(), leagues_df['league_name'].tolist()))
+    teams, players_df = get_filter_options()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        league_id = _select_optional("리그", league_names, "game_log_league", lambda x: league_names[x])
+    with col2:
+        team = _select_optional("팀", teams, "game_log_team")
+    with col3:
+        team_players = players_df if team is None else players_df[players_df['team'] == team]
+        player_labels = {row.player_id: f"{row.player_name} ({row.team})" for row in team_players.itertuples()}
+        player_id = _select_optional("선수", player_labels, "game_log_player", lambda x: player_labels[x])
+    with col4:
+        opponent = _select_optional("상대팀", [t for t in teams if t != team], "game_log_opponent")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        date_from = st.text_input("시작 날짜 (YYYY-MM-DD)", key="game_log_date_from").strip() or None
+    with col2:
+        date_to = st.text_input("종료 날짜 (YYYY-MM-DD)", key="game_log_date_to").strip() or None
+    
+    # 기록 조건 (0이면 조건 없음)
+    min_stats = {}
+    for col, (stat, label) in zip(st.columns(len(FILTER_STATS)), FILTER_STATS.items()):
+        with col:
+            value = st.number_input(f"{label} 이상", min_value=0, value=0, step=1, key=f"game_log_min_{stat}")
+            if value > 0:
+                min_stats[stat] = value
+    
+    filters = GameLogFilter(player_id=player_id, team=team, opponent=opponent, league_id=league_id,
+                            date_from=date_from, date_to=date_to, min_stats=min_stats)
+    if filters.is_empty():
+        st.info("검색 조건을 하나 이상 지정하세요.")
+        return
+    
+    # 조건이 바뀌면 첫 페이지부터 (지나온 페이지 cursor를 쌓아 두고 이전 페이지로 돌아감)
+    signature = repr(sorted(vars(filters).items()))
+    if st.session_state.get('game_log_signature') != signature:
+        st.session_state.game_log_signature = signature
+        st.session_state.game_log_cursors = [None]
+    cursors = st.session_state.game_log_cursors
+    
+    try:
+        rows, next_cursor = search_game_log(filters, cursors[-1], PAGE_SIZE)
+    except ValueError as e:
+        st.warning(str(e))
+        return
+    
+    if rows.empty:
+        st.info("조건에 맞는 경기 기록이 없습니다.")
+        return
+    
+    st.dataframe(rows.drop(columns=['row_id']), hide_index=True, use_container_width=True)
+    
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        if st.button("이전", key="game_log_prev", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if st.button("다음", key="game_log_next", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+    with col3:
+        st.caption(f"{len(cursors)}페이지 ({PAGE_SIZE}개씩)")
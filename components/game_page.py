@@ -1,9 +1,31 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from database import (get_leagues, get_league_games, get_player_stats)
+from database import (get_leagues, get_league_games, get_game_box_score, get_player_stats, get_data_version)
+from components.charts import get_cached_figure
+from data_loader import format_seconds, format_percentage
+from percentiles import get_league_percentiles, to_radar_stats
 
-def show_player_stats(df, team_name, game_date):
+def create_game_radar_chart(stats, title):
+    """경기 기록용 레이더 차트 생성"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(
+        r=list(stats.values()),
+        theta=list(stats.keys()),
+        fill='toself'
+    ))
+    fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+        showlegend=False,
+        title=title,
+        width=350,
+        height=350,
+        margin=dict(l=50, r=50, t=50, b=50),
+        autosize=True
+    )
+    return fig
+
+def show_player_stats(df, team_name, game_date, league_id, data_version=0):
     """선수 기록 표시 함수"""
     # 데이터프레임 표시
     st.dataframe(
@@ -43,19 +65,19 @@ def show_player_stats(df, team_name, game_date):
             
             # 데이터를 세 줄로 나누어 표시
             row1_stats = pd.DataFrame([{
-                '시간': f"{player_stats['minutes']}분",
+                '시간': format_seconds(player_stats['seconds_played']),
                 '득점': player_stats['points'],
                 'FGM-A': f"{player_stats['field_goals_made']}-{player_stats['field_goals_attempt']}",
-                'FG%': f"{(player_stats['field_goals_made']/player_stats['field_goals_attempt']*100):.1f}%" if player_stats['field_goals_attempt'] > 0 else "0.0%",
+                'FG%': format_percentage(player_stats['field_goal_percentage']),
                 '2PM-A': f"{player_stats['two_points_made']}-{player_stats['two_points_attempt']}",
-                '2P%': f"{(player_stats['two_points_made']/player_stats['two_points_attempt']*100):.1f}%" if player_stats['two_points_attempt'] > 0 else "0.0%"
+                '2P%': format_percentage(player_stats['two_point_percentage'])
             }])
 
             row2_stats = pd.DataFrame([{
                 '3PM-A': f"{player_stats['three_points_made']}-{player_stats['three_points_attempt']}",
-                '3P%': f"{(player_stats['three_points_made']/player_stats['three_points_attempt']*100):.1f}%" if player_stats['three_points_attempt'] > 0 else "0.0%",
+                '3P%': format_percentage(player_stats['three_point_percentage']),
                 'FTM-A': f"{player_stats['free_throws_made']}-{player_stats['free_throws_attempt']}",
-                'FT%': f"{(player_stats['free_throws_made']/player_stats['free_throws_attempt']*100):.1f}%" if player_stats['free_throws_attempt'] > 0 else "0.0%",
+                'FT%': format_percentage(player_stats['free_throw_percentage']),
                 'REB': f"O/D {player_stats['offensive_rebounds']}/{player_stats['defensive_rebounds']} ({player_stats['rebounds']})",
                 'AST': player_stats['assists']
             }])
@@ -114,52 +136,21 @@ def show_player_stats(df, team_name, game_date):
             with col1:
                 # 슈팅 차트
                 shooting_percentages = {
-                    '2점슛': (player_stats['two_points_made']/player_stats['two_points_attempt']*100 if player_stats['two_points_attempt'] > 0 else 0),
-                    '3점슛': (player_stats['three_points_made']/player_stats['three_points_attempt']*100 if player_stats['three_points_attempt'] > 0 else 0),
-                    '자유투': (player_stats['free_throws_made']/player_stats['free_throws_attempt']*100 if player_stats['free_throws_attempt'] > 0 else 0)
+                    '2점슛': player_stats['two_point_percentage'],
+                    '3점슛': player_stats['three_point_percentage'],
+                    '자유투': player_stats['free_throw_percentage']
                 }
-                fig1 = go.Figure()
-                fig1.add_trace(go.Scatterpolar(
-                    r=list(shooting_percentages.values()),
-                    theta=list(shooting_percentages.keys()),
-                    fill='toself'
-                ))
-                fig1.update_layout(
-                    polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-                    showlegend=False,
-                    title="슈팅 성공률 (%)",
-                    width=350,
-                    height=350,
-                    margin=dict(l=50, r=50, t=50, b=50),
-                    autosize=True
-                )
+                shooting_percentages = {k: 0 if pd.isna(v) else v for k, v in shooting_percentages.items()}
+                fig1 = get_cached_figure("game_radar:shooting", shooting_percentages, data_version,
+                                         lambda: create_game_radar_chart(shooting_percentages, "슈팅 성공률 (%)"))
                 st.plotly_chart(fig1, use_container_width=True)
             
             with col2:
-                # 종합 기여도 차트
-                contribution_stats = {
-                    '득점': min(player_stats['points'] * 4, 100),
-                    '리바운드': min(player_stats['rebounds'] * 10, 100),
-                    '어시스트': min(player_stats['assists'] * 10, 100),
-                    '스틸': min(player_stats['steals'] * 20, 100),
-                    '블록': min(player_stats['blocks'] * 20, 100),
-                    '턴오버': min(100 - player_stats['turnovers'] * 10, 100)
-                }
-                fig2 = go.Figure()
-                fig2.add_trace(go.Scatterpolar(
-                    r=list(contribution_stats.values()),
-                    theta=list(contribution_stats.keys()),
-                    fill='toself'
-                ))
-                fig2.update_layout(
-                    polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-                    showlegend=False,
-                    title="종합 기여도",
-                    width=350,
-                    height=350,
-                    margin=dict(l=50, r=50, t=50, b=50),
-                    autosize=True
-                )
+                # 종합 기여도 차트 (이 경기 기록의 리그 내 백분위)
+                league_percentiles = get_league_percentiles(league_id)
+                contribution_stats = to_radar_stats(league_percentiles.game_percentiles(player_stats))
+                fig2 = get_cached_figure("game_radar:contribution", contribution_stats, data_version,
+                                         lambda: create_game_radar_chart(contribution_stats, "종합 기여도 (리그 백분위)"))
                 st.plotly_chart(fig2, use_container_width=True)
         else:
             st.error(f"DB에서 {selected_player}의 기록을 찾을 수 없습니다. (game_date: {game_date}, team: {team_name})")
@@ -217,27 +208,35 @@ def show_game_page():
                     'PTS': [selected_game['team1_points'], selected_game['team2_points']],
                     '2PM': [selected_game['team1_2PM'], selected_game['team2_2PM']],
                     '2PA': [selected_game['team1_2PA'], selected_game['team2_2PA']],
-                    '2P%': [selected_game['team1_2P_PCT'], selected_game['team2_2P_PCT']],
+                    '2P%': [selected_game['team1_two_point_percentage'], selected_game['team2_two_point_percentage']],
                     '3PM': [selected_game['team1_3PM'], selected_game['team2_3PM']],
                     '3PA': [selected_game['team1_3PA'], selected_game['team2_3PA']],
-                    '3P%': [selected_game['team1_3P_PCT'], selected_game['team2_3P_PCT']],
+                    '3P%': [selected_game['team1_three_point_percentage'], selected_game['team2_three_point_percentage']],
                     'FTM': [selected_game['team1_FTM'], selected_game['team2_FTM']],
                     'FTA': [selected_game['team1_FTA'], selected_game['team2_FTA']],
-                    'FT%': [selected_game['team1_FT_PCT'], selected_game['team2_FT_PCT']],
+                    'FT%': [selected_game['team1_free_throw_percentage'], selected_game['team2_free_throw_percentage']],
                     'REB': [selected_game['team1_rebounds'], selected_game['team2_rebounds']],
                     'AST': [selected_game['team1_assists'], selected_game['team2_assists']],
                     'STL': [selected_game['team1_steals'], selected_game['team2_steals']],
                     'BLK': [selected_game['team1_blocks'], selected_game['team2_blocks']],
                     'TOV': [selected_game['team1_turnovers'], selected_game['team2_turnovers']]
                 })
-                st.dataframe(team_stats_df, hide_index=True)
+                st.dataframe(
+                    team_stats_df,
+                    hide_index=True,
+                    column_config={
+                        col: st.column_config.NumberColumn(col, format="%.1f%%")
+                        for col in ['2P%', '3P%', 'FT%']
+                    }
+                )
                 
                 # 선수 기록 표시
                 st.header("선수 기록")
+                data_version = get_data_version(selected_league)
                 tab1, tab2 = st.tabs([team1, team2])
                 
                 with tab1:
-                    show_player_stats(selected_game['team1_players'], team1, game_date)
+                    show_player_stats(get_game_box_score(game_date, team1), team1, game_date, selected_league, data_version)
                     
                 with tab2:
-                    show_player_stats(selected_game['team2_players'], team2, game_date) 
\ No newline at end of file
+                    show_player_stats(get_game_box_score(game_date, team2), team2, game_date, selected_league, data_version) 
\ No newline at end of file
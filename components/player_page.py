@@ -1,9 +1,13 @@
 import streamlit as st
 import pandas as pd
-import sqlite3
 import plotly.graph_objects as go
-import plotly.express as px
-from database import DB_PATH, get_player_career_stats
+from database import (get_read_connection, read_frame, get_player_id, get_player_career_stats,
+                      get_player_career_splits, get_data_version)
+from components.charts import get_cached_figure, decimate_frame
+from percentiles import get_league_percentiles, to_radar_stats
+from analytics import get_player_season_advanced
+from similarity import find_similar_players
+from data_loader import format_seconds, format_percentage
 
 def get_league_players(league_id):
     """특정 리그에 참여한 모든 선수 목록 조회"""
@@ -15,8 +19,8 @@ def get_league_players(league_id):
     WHERE gl.league_id = ?
     ORDER BY ps.team, ps.player
     '''
-    with sqlite3.connect(DB_PATH) as conn:
-        return pd.read_sql_query(query, conn, params=(league_id,))
+    with get_read_connection() as conn:
+        return read_frame(query, conn, params=(league_id,), label='get_league_players')
 
 def get_player_teams(player_name, league_id):
     """특정 선수가 참여한 모든 팀 목록 조회"""
@@ -28,8 +32,8 @@ def get_player_teams(player_name, league_id):
     WHERE ps.player = ? AND gl.league_id = ?
     ORDER BY ps.team
     '''
-    with sqlite3.connect(DB_PATH) as conn:
-        df = pd.read_sql_query(query, conn, params=(player_name, league_id))
+    with get_read_connection() as conn:
+        df = read_frame(query, conn, params=(player_name, league_id), label='get_player_teams')
         return df['team'].tolist()
 
 def get_player_games(player_name, league_id):
@@ -46,8 +50,8 @@ def get_player_games(player_name, league_id):
     WHERE ps.player = ? AND gl.league_id = ?
     ORDER BY ps.game_date DESC
     '''
-    with sqlite3.connect(DB_PATH) as conn:
-        df = pd.read_sql_query(query, conn, params=(player_name, league_id))
+    with get_read_connection() as conn:
+        df = read_frame(query, conn, params=(player_name, league_id), label='get_player_games')
         df['game_name'] = df.apply(lambda x: f"{x['game_date']} {x['team1']} {x['team1_score']} vs {x['team2_score']} {x['team2']}", axis=1)
         return df
 
@@ -55,11 +59,11 @@ def get_player_game_stats(player_name, game_date):
     """특정 선수의 특정 경기 기록 조회"""
     query = '''
     SELECT *
-    FROM player_stats
+    FROM player_stats_view
     WHERE player = ? AND game_date = ?
     '''
-    with sqlite3.connect(DB_PATH) as conn:
-        return pd.read_sql_query(query, conn, params=(player_name, game_date)).iloc[0]
+    with get_read_connection() as conn:
+        return read_frame(query, conn, params=(player_name, game_date), label='get_player_game_stats').iloc[0]
 
 def create_radar_chart(stats, title):
     """레이더 차트 생성"""
@@ -82,38 +86,58 @@ def create_radar_chart(stats, title):
     )
     return fig
 
-def create_trend_chart(games_stats, title):
-    """트렌드 라인 차트 생성"""
+# 트렌드 차트에 표시할 기록과 이동 평균 기준 경기 수
+TREND_STATS = {
+    'points': '득점',
+    'rebounds': '리바운드',
+    'assists': '어시스트'
+}
+ROLLING_WINDOW = 5
+
+def create_trend_chart(games_stats, title, rolling_window=ROLLING_WINDOW):
+    """트렌드 라인 차트 생성 (WebGL 렌더링, 이동 평균 포함)"""
     fig = go.Figure()
     
-    stat_names = {
-        'points': '득점',
-        'rebounds': '리바운드',
-        'assists': '어시스트'
-    }
+    # 경기 수가 많으면 서버에서 다운샘플링한 뒤 그린다
+    plot_df = decimate_frame(games_stats, list(TREND_STATS))
+    show_markers = len(plot_df) <= 30
     
-    for stat, name in stat_names.items():
-        fig.add_trace(go.Scatter(
-            x=games_stats['game_date'],
-            y=games_stats[stat],
-            name=name
+    for stat, name in TREND_STATS.items():
+        fig.add_trace(go.Scattergl(
+            x=plot_df['game_date'],
+            y=plot_df[stat],
+            name=name,
+            mode='lines+markers' if show_markers else 'markers',
+            marker=dict(size=6 if show_markers else 4),
+            opacity=1.0 if show_markers else 0.35
         ))
+        if len(games_stats) > rolling_window:
+            fig.add_trace(go.Scattergl(
+                x=plot_df['game_date'],
+                y=plot_df[f'{stat}_avg'],
+                name=f"{name} ({rolling_window}경기 평균)",
+                mode='lines',
+                line=dict(dash='dot' if show_markers else 'solid')
+            ))
     
-    # 날짜 포맷 변환
-    date_strings = games_stats['game_date'].dt.strftime('%m-%d').tolist()
+    # 경기 수가 적을 때만 경기별 날짜 눈금 표시
+    if len(plot_df) <= 10:
+        xaxis = dict(
+            tickmode='array',
+            ticktext=plot_df['game_date'].dt.strftime('%m-%d').tolist(),
+            tickvals=plot_df['game_date'],
+            tickangle=0,
+            tickfont=dict(size=11)
+        )
+    else:
+        xaxis = dict(tickformat='%y-%m-%d', tickangle=0, tickfont=dict(size=11))
     
     fig.update_layout(
         title=title,
         xaxis_title="경기 날짜",
         yaxis_title="기록",
         hovermode='x unified',
-        xaxis=dict(
-            tickmode='array',
-            ticktext=date_strings,
-            tickvals=games_stats['game_date'],
-            tickangle=0,
-            tickfont=dict(size=11)
-        ),
+        xaxis=xaxis,
         margin=dict(l=50, r=50, t=50, b=50),
         legend=dict(
             orientation="h",
@@ -126,29 +150,57 @@ def create_trend_chart(games_stats, title):
     )
     return fig
 
-def get_player_recent_games(player_name, league_id, limit=5):
-    """최근 N경기 기록 조회"""
-    query = '''
-    SELECT 
-        ps.game_date,
-        ps.points,
-        ps.rebounds,
-        ps.assists,
-        ps.steals,
-        ps.blocks,
-        ps.turnovers,
-        ps.minutes,
-        ps.two_points_made, ps.two_points_attempt,
-        ps.three_points_made, ps.three_points_attempt,
-        ps.free_throws_made, ps.free_throws_attempt
-    FROM player_stats ps
-    JOIN game_league gl ON ps.game_date = gl.game_date
-    WHERE ps.player = ? AND gl.league_id = ?
-    ORDER BY ps.game_date DESC
-    LIMIT ?
+def get_player_recent_games(player_id, league_id=None, limit=None, rolling_window=ROLLING_WINDOW):
+    """선수(player_id)의 경기별 기록과 이동 평균 조회 (오래된 경기부터)
+
+    league_id가 None이면 모든 리그의 통산 기록을 조회한다. 이름이 같은 다른 팀 선수는 섞이지 않는다.
+    이동 평균은 전체 기록 기준 SQL 윈도 함수로 계산한 뒤 최근 limit 경기만 남긴다.
+    """
+    if league_id is None:
+        source = '''
+            SELECT ps.*
+            FROM player_stats ps
+            WHERE ps.player_id = ?
+        '''
+        params = [player_id]
+    else:
+        source = '''
+            SELECT ps.*
+            FROM player_stats ps
+            JOIN game_league gl ON ps.game_date = gl.game_date 
+                AND (ps.team = gl.team1 OR ps.team = gl.team2)
+            WHERE ps.player_id = ? AND gl.league_id = ?
+        '''
+        params = [player_id, league_id]
+    
+    query = f'''
+    SELECT *
+    FROM (
+        SELECT 
+            g.game_date,
+            g.points,
+            g.rebounds,
+            g.assists,
+            g.steals,
+            g.blocks,
+            g.turnovers,
+            g.seconds_played,
+            g.two_points_made, g.two_points_attempt,
+            g.three_points_made, g.three_points_attempt,
+            g.free_throws_made, g.free_throws_attempt,
+            AVG(g.points) OVER w as points_avg,
+            AVG(g.rebounds) OVER w as rebounds_avg,
+            AVG(g.assists) OVER w as assists_avg
+        FROM ({source}) g
+        WINDOW w AS (ORDER BY g.game_date ROWS BETWEEN ? PRECEDING AND CURRENT ROW)
+        ORDER BY g.game_date DESC
+        LIMIT ?
+    )
+    ORDER BY game_date
     '''
-    with sqlite3.connect(DB_PATH) as conn:
-        df = pd.read_sql_query(query, conn, params=(player_name, league_id, limit))
+    params += [rolling_window - 1, -1 if limit is None else limit]
+    with get_read_connection() as conn:
+        df = read_frame(query, conn, params=params, label='get_player_recent_games')
         df['game_date'] = pd.to_datetime(df['game_date'])
         return df
 
@@ -181,8 +233,9 @@ def show_player_page():
             st.header(f"🏀 {selected_player}")
             st.subheader(f"소속팀: {team}")
             
-            # 2. 주요 기록 요약
-            career_stats = get_player_career_stats(selected_player)
+            # 2. 주요 기록 요약 (같은 이름의 다른 팀 선수와 섞이지 않도록 선수 id 기준)
+            player_id = get_player_id(selected_player, team)
+            career_stats = get_player_career_stats(player_id) if player_id is not None else None
             if career_stats is not None:
                 st.markdown("""
                 <style>
@@ -260,8 +313,35 @@ def show_player_page():
                 </div>
                 """
                 st.markdown(stats_html, unsafe_allow_html=True)
+                
+                # 리그 / 팀별 통산 기록
+                with st.expander("리그 / 팀별 통산 기록"):
+                    st.dataframe(get_player_career_splits(player_id), hide_index=True, use_container_width=True)
+            
+            # 시즌 고급 지표 (선택된 리그 기준)
+            season_advanced = get_player_season_advanced(selected_player, team, selected_league)
+            if season_advanced is not None:
+                st.write("시즌 고급 지표")
+                advanced_df = pd.DataFrame([{
+                    'TS%': season_advanced['true_shooting'],
+                    'eFG%': season_advanced['effective_fg'],
+                    'AST/TOV': season_advanced['ast_tov'],
+                    'USG%': season_advanced['usage_rate'],
+                    'REB%': season_advanced['rebound_rate'],
+                    'ORtg': season_advanced['offensive_rating']
+                }])
+                st.dataframe(
+                    advanced_df,
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={
+                        col: st.column_config.NumberColumn(col, format="%.2f" if col == 'AST/TOV' else "%.1f")
+                        for col in advanced_df.columns
+                    }
+                )
             
-            # 3. 차트 섹션
+            # 3. 차트 섹션 (통산 기록은 전체 DB 버전 기준으로 캐시)
+            data_version = get_data_version()
             col1, col2 = st.columns(2)
             
             with col1:
@@ -271,24 +351,50 @@ def show_player_page():
                     '3점슛': (career_stats['total_3pm']/career_stats['total_3pa']*100 if career_stats['total_3pa'] > 0 else 0),
                     '자유투': (career_stats['total_ftm']/career_stats['total_fta']*100 if career_stats['total_fta'] > 0 else 0)
                 }
-                st.plotly_chart(create_radar_chart(shooting_stats, "슈팅 성공률 (%)"), use_container_width=True)
+                fig = get_cached_figure("player_radar:shooting", shooting_stats, data_version,
+                                        lambda: create_radar_chart(shooting_stats, "슈팅 성공률 (%)"))
+                st.plotly_chart(fig, use_container_width=True)
             
             with col2:
-                # 종합 기여도 차트
-                contribution_stats = {
-                    '득점': min(career_stats['avg_points'] * 4, 100),
-                    '리바운드': min(career_stats['avg_rebounds'] * 10, 100),
-                    '어시스트': min(career_stats['avg_assists'] * 10, 100),
-                    '스틸': min(career_stats['avg_steals'] * 20, 100),
-                    '블록': min(career_stats['avg_blocks'] * 20, 100),
-                    '턴오버': min(100 - career_stats['avg_turnovers'] * 10, 100)
-                }
-                st.plotly_chart(create_radar_chart(contribution_stats, "종합 기여도"), use_container_width=True)
+                # 종합 기여도 차트 (선택된 리그의 경기당 기록 백분위)
+                league_percentiles = get_league_percentiles(selected_league)
+                player_percentiles = league_percentiles.player_percentiles(selected_player, team)
+                if player_percentiles is not None:
+                    contribution_stats = to_radar_stats(player_percentiles)
+                    fig = get_cached_figure("player_radar:contribution", contribution_stats, league_percentiles.version,
+                                            lambda: create_radar_chart(contribution_stats, "종합 기여도 (리그 백분위)"))
+                    st.plotly_chart(fig, use_container_width=True)
+            
+            # 비슷한 선수 (전체 리그 경기당 기록 기준)
+            similar_df = find_similar_players(player_id) if player_id is not None else pd.DataFrame()
+            if not similar_df.empty:
+                st.subheader("비슷한 선수")
+                st.dataframe(
+                    similar_df,
+                    column_config={
+                        "유사도": st.column_config.ProgressColumn(
+                            "유사도", format="%.1f", min_value=-100, max_value=100,
+                            help="경기당 기록 z-score의 코사인 유사도 (x100)"
+                        )
+                    },
+                    hide_index=True,
+                    use_container_width=True
+                )
             
-            # 4. 최근 경기 트렌드
-            st.subheader("최근 경기 트렌드")
-            recent_games = get_player_recent_games(selected_player, selected_league)
-            if not recent_games.empty:
+            # 4. 경기 트렌드
+            st.subheader("경기 트렌드")
+            trend_scope = st.radio(
+                "기간",
+                ["최근 5경기", "리그 전체", "통산"],
+                index=1,
+                horizontal=True,
+                key="player_trend_scope"
+            )
+            trend_league = None if trend_scope == "통산" else selected_league
+            trend_limit = 5 if trend_scope == "최근 5경기" else None
+            trend_games = (get_player_recent_games(player_id, trend_league, limit=trend_limit)
+                           if player_id is not None else pd.DataFrame())
+            if not trend_games.empty:
                 st.markdown("""
                 <style>
                 .element-container:has([data-testid="stPlotlyChart"]) {
@@ -299,7 +405,10 @@ def show_player_page():
                 }
                 </style>
                 """, unsafe_allow_html=True)
-                st.plotly_chart(create_trend_chart(recent_games, "최근 5경기 기록"), use_container_width=True)
+                trend_title = f"{trend_scope} 기록 ({len(trend_games)}경기)"
+                fig = get_cached_figure(f"player_trend:{trend_scope}", trend_games, get_data_version(trend_league),
+                                        lambda: create_trend_chart(trend_games, trend_title))
+                st.plotly_chart(fig, use_container_width=True)
             
             # 5. 상세 기록 테이블
             st.subheader("경기별 상세 기록")
@@ -360,19 +469,19 @@ def show_player_page():
                         
                         # 데이터를 세 줄로 나누어 표시
                         row1_stats = pd.DataFrame([{
-                            '시간': f"{game_stats['minutes']}분",
+                            '시간': format_seconds(game_stats['seconds_played']),
                             '득점': game_stats['points'],
                             'FGM-A': f"{game_stats['field_goals_made']}-{game_stats['field_goals_attempt']}",
-                            'FG%': f"{(game_stats['field_goals_made']/game_stats['field_goals_attempt']*100):.1f}%" if game_stats['field_goals_attempt'] > 0 else "0.0%",
+                            'FG%': format_percentage(game_stats['field_goal_percentage']),
                             '2PM-A': f"{game_stats['two_points_made']}-{game_stats['two_points_attempt']}",
-                            '2P%': f"{(game_stats['two_points_made']/game_stats['two_points_attempt']*100):.1f}%" if game_stats['two_points_attempt'] > 0 else "0.0%"
+                            '2P%': format_percentage(game_stats['two_point_percentage'])
                         }])
 
                         row2_stats = pd.DataFrame([{
                             '3PM-A': f"{game_stats['three_points_made']}-{game_stats['three_points_attempt']}",
-                            '3P%': f"{(game_stats['three_points_made']/game_stats['three_points_attempt']*100):.1f}%" if game_stats['three_points_attempt'] > 0 else "0.0%",
+                            '3P%': format_percentage(game_stats['three_point_percentage']),
                             'FTM-A': f"{game_stats['free_throws_made']}-{game_stats['free_throws_attempt']}",
-                            'FT%': f"{(game_stats['free_throws_made']/game_stats['free_throws_attempt']*100):.1f}%" if game_stats['free_throws_attempt'] > 0 else "0.0%",
+                            'FT%': format_percentage(game_stats['free_throw_percentage']),
                             'REB': f"O/D {game_stats['offensive_rebounds']}/{game_stats['defensive_rebounds']} ({game_stats['rebounds']})",
                             'AST': game_stats['assists']
                         }])
@@ -1,6 +1,10 @@
 import streamlit as st
 import pandas as pd
-from database import get_leagues, get_player_rankings
+from database import get_leagues
+from leaderboard import get_leaderboard, count_leaderboard_players
+
+# 한 페이지에 표시할 선수 수
+PAGE_SIZE = 20
 
 def show_player_ranking_page():
     """개인 순위 페이지"""
@@ -28,7 +32,13 @@ def show_player_ranking_page():
         "블록": "blocks",
         "3점슛": "three_points",
         "자유투": "free_throws",
-        "효율값": "efficiency"
+        "효율값": "efficiency",
+        "TS%": "true_shooting",
+        "eFG%": "effective_fg",
+        "USG%": "usage_rate",
+        "36분당 득점": "points_per36",
+        "36분당 리바운드": "rebounds_per36",
+        "36분당 어시스트": "assists_per36"
     }
     
     if selected_league:
@@ -38,8 +48,35 @@ def show_player_ranking_page():
             list(stat_mapping.keys()),
             key="player_ranking_stat_select"
         )
-            
-        rankings_df = get_player_rankings(selected_league, stat_mapping[selected_stat])
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            selected_basis = st.radio(
+                "순위 방식",
+                ["평균", "총합"],
+                horizontal=True,
+                key="player_ranking_basis_select"
+            )
+        with col2:
+            total_players = count_leaderboard_players(selected_league)
+            page_count = max(1, (total_players + PAGE_SIZE - 1) // PAGE_SIZE)
+            page = st.number_input(
+                "페이지",
+                min_value=1,
+                max_value=page_count,
+                value=1,
+                step=1,
+                key="player_ranking_page"
+            )
+        
+        # 순위표는 리그 데이터가 바뀔 때만 다시 계산되고, 기준 변경은 조회만 한다
+        rankings_df = get_leaderboard(
+            selected_league,
+            stat_mapping[selected_stat],
+            basis='avg' if selected_basis == "평균" else 'total',
+            limit=PAGE_SIZE,
+            offset=(int(page) - 1) * PAGE_SIZE
+        )
         if not rankings_df.empty:
             # 주석 추가 (우측 정렬)
             st.markdown('<div style="text-align: right; font-size: 0.8em; color: gray; margin-bottom: 5px;">* 평균(총합)</div>', unsafe_allow_html=True)
@@ -111,6 +148,24 @@ def show_player_ranking_page():
                         "효율값",
                         help="평균 (총합)",
                         width=None
+                    ),
+                    "TS%": st.column_config.NumberColumn(
+                        "TS%",
+                        help="True Shooting % (시즌 합계 기준)",
+                        format="%.1f",
+                        width=None
+                    ),
+                    "eFG%": st.column_config.NumberColumn(
+                        "eFG%",
+                        help="Effective FG % (시즌 합계 기준)",
+                        format="%.1f",
+                        width=None
+                    ),
+                    "USG%": st.column_config.NumberColumn(
+                        "USG%",
+                        help="팀 공격 점유 비율 (경기 평균)",
+                        format="%.1f",
+                        width=None
                     )
                 },
                 hide_index=True,
@@ -0,0 +1,59 @@
+import streamlit as st
+import pandas as pd
+from database import get_leagues, ALL_LEAGUES
+from records import (RECORD_STATS, get_record_board, get_career_highs, get_milestone_leaders,
+                     get_record_players)
+
+def show_records_page():
+    """기록 페이지 (한 경기 최고 기록, 기록 달성, 선수별 통산 최고 기록)"""
+    st.title("기록")
+    
+    # 리그 선택 (ALL_LEAGUES는 전체 통산 기록판)
+    leagues_df = get_leagues()
+    league_names = dict(zip(leagues_df['league_id'].tolist(), leagues_df['league_name'].tolist()))
+    selected_league = st.selectbox(
+        "리그 선택",
+        [ALL_LEAGUES] + list(league_names),
+        format_func=lambda x: "전체 (통산)" if x == ALL_LEAGUES else league_names[x],
+        key="records_league_select"
+    )
+    
+    # 한 경기 최고 기록
+    st.subheader("한 경기 최고 기록")
+    selected_stat = st.selectbox(
+        "기록 선택",
+        list(RECORD_STATS),
+        format_func=lambda x: RECORD_STATS[x],
+        key="records_stat_select"
+    )
+    board_df = get_record_board(selected_league, selected_stat)
+    if board_df.empty:
+        st.info("기록이 없습니다.")
+    else:
+        st.dataframe(board_df, hide_index=True, use_container_width=True)
+    
+    # 더블더블 / 20-10 / 트리플더블
+    st.subheader("기록 달성")
+    leaders_df = get_milestone_leaders(selected_league)
+    if leaders_df.empty:
+        st.info("달성한 선수가 없습니다.")
+    else:
+        st.dataframe(leaders_df, hide_index=True, use_container_width=True)
+    
+    # 선수별 통산 최고 기록
+    st.subheader("선수 통산 최고 기록")
+    players_df = get_record_players()
+    if players_df.empty:
+        st.info("등록된 선수가 없습니다.")
+        return
+    
+    player_labels = {row.player_id: f"{row.선수명} ({row.팀명})" for row in players_df.itertuples()}
+    selected_player = st.selectbox(
+        "선수 선택",
+        list(player_labels),
+        format_func=lambda x: player_labels[x],
+        key="records_player_select"
+    )
+    highs = get_career_highs(selected_player)
+    if highs:
+        st.dataframe(pd.DataFrame(highs), hide_index=True, use_container_width=True)
@@ -0,0 +1,59 @@
+import streamlit as st
+import plotly.graph_objects as go
+from database import get_leagues, get_data_version
+from team_season import get_season_teams, get_team_season, get_team_roster
+from components.charts import get_cached_figure
+
+def create_quarter_chart(quarter_df):
+    """쿼터별 경기당 득점 / 실점 막대 차트"""
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=quarter_df['쿼터'], y=quarter_df['득점'], name='득점'))
+    fig.add_trace(go.Bar(x=quarter_df['쿼터'], y=quarter_df['실점'], name='실점'))
+    fig.update_layout(barmode='group', height=350, margin=dict(t=30, b=20), yaxis_title='경기당 점수')
+    return fig
+
+def show_team_page():
+    """팀 기록 페이지 (시즌 평균, 홈 / 원정, 쿼터별 득실점, 선수 명단과 비중)"""
+    st.title("팀 기록")
+    
+    leagues_df = get_leagues()
+    if leagues_df.empty:
+        st.info("등록된 리그가 없습니다.")
+        return
+    
+    selected_league = st.selectbox(
+        "리그 선택",
+        leagues_df['league_id'].tolist(),
+        format_func=lambda x: leagues_df[leagues_df['league_id'] == x]['league_name'].iloc[0],
+        key="team_page_league_select"
+    )
+    
+    teams = get_season_teams(selected_league)
+    if not teams:
+        st.info("리그에 할당된 경기가 없습니다.")
+        return
+    selected_team = st.selectbox("팀 선택", teams, key="team_page_team_select")
+    
+    venue_df, quarter_df = get_team_season(selected_league, selected_team)
+    
+    # 시즌 평균과 홈 / 원정 (홈은 game_league의 team1)
+    st.subheader("시즌 평균")
+    st.dataframe(venue_df, hide_index=True, use_container_width=True)
+    
+    # 쿼터별 득실점
+    st.subheader("쿼터별 득실점")
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        fig = get_cached_figure(f"team_quarters:{selected_team}", quarter_df.set_index('쿼터')['득점'],
+                                get_data_version(selected_league), lambda: create_quarter_chart(quarter_df))
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.dataframe(quarter_df, hide_index=True, use_container_width=True)
+    
+    # 선수 명단 (경기당 기록, 팀 기록 대비 비중 %)
+    st.subheader("선수 명단")
+    roster_df = get_team_roster(selected_league, selected_team)
+    if roster_df.empty:
+        st.info("선수 기록이 없습니다.")
+    else:
+        st.dataframe(roster_df, hide_index=True, use_container_width=True)
@@ -1,6 +1,36 @@
 import streamlit as st
 import pandas as pd
-from database import get_leagues, get_team_rankings
+import plotly.graph_objects as go
+from database import get_leagues, get_team_season_shooting
+from standings import get_standings, get_standing_dates
+from head_to_head import get_head_to_head
+from ratings import get_team_ratings
+from simulation import get_season_projection
+from components.charts import get_cached_figure
+
+def create_head_to_head_heatmap(margin_df, records_df):
+    """상대 전적 히트맵 (색: 경기당 득실차, 글자: 승-패)"""
+    limit = max(1.0, float(pd.DataFrame(margin_df).abs().max().max() or 0))
+    fig = go.Figure(go.Heatmap(
+        z=margin_df.values,
+        x=list(margin_df.columns),
+        y=list(margin_df.index),
+        text=records_df.values,
+        texttemplate='%{text}',
+        colorscale='RdBu',
+        zmid=0,
+        zmin=-limit,
+        zmax=limit,
+        colorbar=dict(title='득실차'),
+        hovertemplate='%{y} vs %{x}<br>전적 %{text}<br>경기당 득실차 %{z:.1f}<extra></extra>'
+    ))
+    fig.update_layout(
+        xaxis=dict(side='top'),
+        yaxis=dict(autorange='reversed'),
+        height=max(300, 45 * len(margin_df) + 120),
+        margin=dict(t=80, b=20)
+    )
+    return fig
 
 def show_team_ranking_page():
     """팀 순위 페이지"""
@@ -21,7 +51,15 @@ def show_team_ranking_page():
     
     # 팀 순위 표시
     if selected_league:
-        rankings_df = get_team_rankings(selected_league)
+        # 기준 날짜 (해당 날짜까지의 경기로 계산한 순위)
+        standing_dates = get_standing_dates(selected_league)
+        as_of = st.selectbox(
+            "기준 날짜",
+            [None] + standing_dates,
+            format_func=lambda x: "전체 시즌" if x is None else x,
+            key="team_ranking_as_of_select"
+        )
+        rankings_df = get_standings(selected_league, as_of)
         if not rankings_df.empty:
             st.dataframe(
                 rankings_df,
@@ -78,14 +116,83 @@ def show_team_ranking_page():
                         format="%.1f",
                         width=None
                     ),
-                    "연속": st.column_config.TextColumn(
-                        "연속",
-                        help="최근 5경기",
+                    "최근경기": st.column_config.TextColumn(
+                        "최근경기",
+                        help="최근 5경기 (최근 경기부터)",
                         width=None
                     )
                 },
                 hide_index=True,
                 use_container_width=True
             )
+            
+            # 시즌 전망 (남은 일정 몬테카를로 시뮬레이션, 전체 시즌 기준일 때만)
+            if as_of is None:
+                st.subheader("시즌 전망")
+                projection = get_season_projection(selected_league)
+                if projection.remaining_games:
+                    st.caption(f"남은 {projection.remaining_games}경기를 {projection.n_simulations:,}번 시뮬레이션한 결과")
+                    st.dataframe(
+                        projection.table,
+                        column_config={
+                            "1위 확률": st.column_config.ProgressColumn(
+                                "1위 확률", format="%.1f%%", min_value=0, max_value=100
+                            ),
+                            "플레이오프 확률": st.column_config.ProgressColumn(
+                                "플레이오프 확률", format="%.1f%%", min_value=0, max_value=100
+                            )
+                        },
+                        hide_index=True,
+                        use_container_width=True
+                    )
+                else:
+                    st.info("남은 경기가 없습니다.")
+            
+            # 상대 전적 (행 팀 기준, 순위 순서)
+            st.subheader("상대 전적")
+            h2h = get_head_to_head(selected_league)
+            margin_df, records_df = h2h.to_frame(rankings_df['팀명'].astype(str).tolist(), as_of)
+            fig = get_cached_figure(f"team_h2h:{as_of or 'season'}", margin_df.fillna(0), h2h.version,
+                                    lambda: create_head_to_head_heatmap(margin_df, records_df))
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # 팀 레이팅 (상대 전력을 반영한 Elo)
+            st.subheader("팀 레이팅")
+            st.dataframe(
+                get_team_ratings(selected_league),
+                column_config={
+                    "Elo": st.column_config.NumberColumn("Elo", format="%.1f", help="경기 결과 기준 Elo"),
+                    "점수차보정": st.column_config.NumberColumn(
+                        "점수차보정", format="%.1f", help="점수 차를 반영한 Elo"
+                    )
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+            
+            # 팀 시즌 슈팅 기록 (성공/시도 합계 기준)
+            st.subheader("팀 슈팅")
+            shooting_df = get_team_season_shooting(selected_league)
+            shooting_table = pd.DataFrame({
+                '팀명': shooting_df['team'],
+                '경기수': shooting_df['games'],
+                'FGM-A': shooting_df['field_goals_made'].astype(str) + '-' + shooting_df['field_goals_attempt'].astype(str),
+                'FG%': shooting_df['field_goal_percentage'],
+                '2PM-A': shooting_df['two_points_made'].astype(str) + '-' + shooting_df['two_points_attempt'].astype(str),
+                '2P%': shooting_df['two_point_percentage'],
+                '3PM-A': shooting_df['three_points_made'].astype(str) + '-' + shooting_df['three_points_attempt'].astype(str),
+                '3P%': shooting_df['three_point_percentage'],
+                'FTM-A': shooting_df['free_throws_made'].astype(str) + '-' + shooting_df['free_throws_attempt'].astype(str),
+                'FT%': shooting_df['free_throw_percentage']
+            })
+            st.dataframe(
+                shooting_table,
+                column_config={
+                    col: st.column_config.NumberColumn(col, format="%.1f%%")
+                    for col in ['FG%', '2P%', '3P%', 'FT%']
+                },
+                hide_index=True,
+                use_container_width=True
+            )
         else:
             st.info("해당 리그의 경기 기록이 없습니다.") 
\ No newline at end of file
@@ -5,6 +5,8 @@ import pandas as pd
 from data_loader import load_game_data
 from database import (create_league, get_leagues, is_game_exists,
                      save_game_data, assign_game_to_league)
+from analytics import refresh_advanced_metrics
+from identity import get_alias_suggestions, link_alias, dismiss_alias
 
 def extract_info_from_filename(filename):
     """파일명에서 날짜와 팀명 추출"""
@@ -103,6 +105,8 @@ def show_upload_page():
                                     if save_game_data(game_date, team1, team2, team1_players, team1_total, team2_players, team2_total):
                                         # 리그에 경기 할당
                                         assign_game_to_league(game_date, team1, team2, selected_league)
+                                        # 고급 지표 갱신
+                                        refresh_advanced_metrics(selected_league)
                                         st.success("새로운 경기 데이터가 저장되었습니다!")
                                         st.rerun()
                                     else:
@@ -117,4 +121,29 @@ def show_upload_page():
                 except Exception as e:
                     st.error(f"파일 처리 중 오류가 발생했습니다: {str(e)}")
         else:
-            st.info("먼저 리그를 등록해주세요.") 
\ No newline at end of file
+            st.info("먼저 리그를 등록해주세요.")
+    
+    # 업로드 때 기존 선수와 이름이 비슷해 새 선수로 저장된 이름 확인
+    if 'alias_message' in st.session_state:
+        if st.session_state.alias_message_type == 'success':
+            st.success(st.session_state.alias_message)
+        else:
+            st.error(st.session_state.alias_message)
+        del st.session_state.alias_message
+        del st.session_state.alias_message_type
+    
+    suggestions = get_alias_suggestions()
+    if not suggestions.empty:
+        with st.expander(f"선수 이름 확인 ({len(suggestions)}건)", expanded=False):
+            st.caption("같은 선수라면 합치기, 다른 선수라면 제외를 누르세요. 합치면 경기 기록이 기존 선수로 옮겨집니다.")
+            for i, row in suggestions.iterrows():
+                col1, col2, col3 = st.columns([4, 1, 1])
+                col1.write(f"{row['팀']}: **{row['이름']}** → {row['비슷한선수']} (유사도 {row['유사도']:.2f})")
+                if col2.button("합치기", key=f"link_alias_{i}"):
+                    linked, message = link_alias(row['이름'], row['팀'], int(row['player_id']))
+                    st.session_state.alias_message = message
+                    st.session_state.alias_message_type = 'success' if linked else 'error'
+                    st.rerun()
+                if col3.button("제외", key=f"dismiss_alias_{i}"):
+                    dismiss_alias(row['이름'], row['팀'])
+                    st.rerun()
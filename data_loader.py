@@ -1,11 +1,13 @@
 import pandas as pd
 import os
+import datetime
+import numbers
 
 def clean_value(val):
     """숫자 또는 퍼센트 문자열을 적절한 형태로 변환"""
     if pd.isna(val):
         return 0
-    if isinstance(val, (int, float)):
+    if isinstance(val, numbers.Real):  # numpy 정수/실수 포함
         return int(val)
     if isinstance(val, str):
         # 퍼센트 문자열은 그대로 반환
@@ -17,6 +19,51 @@ def clean_value(val):
             return 0
     return 0
 
+def parse_minutes(val):
+    """출전시간(MIN) 값을 정수 초로 변환
+
+    'MM:SS' 문자열, 분 단위 숫자, 엑셀이 시각으로 읽은 값(datetime.time)을 처리한다.
+    엑셀은 '23:35'를 23시 35분으로 읽으므로 시 단위가 있으면 분:초로 해석한다.
+    """
+    if val is None or (not isinstance(val, (str, datetime.time, datetime.timedelta)) and pd.isna(val)):
+        return 0
+    if isinstance(val, datetime.timedelta):
+        return int(val.total_seconds())
+    if isinstance(val, datetime.time):
+        if val.hour == 0:
+            return val.minute * 60 + val.second
+        return val.hour * 60 + val.minute
+    if isinstance(val, numbers.Real):
+        return int(round(float(val) * 60))
+    if isinstance(val, str):
+        parts = val.strip().split(':')
+        try:
+            if len(parts) == 1:
+                return int(round(float(parts[0] or 0) * 60))
+            if len(parts) == 2:
+                return int(float(parts[0] or 0)) * 60 + int(float(parts[1] or 0))
+            # H:MM:SS 형식은 엑셀 시각 규칙과 동일하게 처리
+            hours, minutes, seconds = (int(float(p or 0)) for p in parts[-3:])
+            if hours == 0:
+                return minutes * 60 + seconds
+            return hours * 60 + minutes
+        except ValueError:
+            return 0
+    return 0
+
+def format_seconds(seconds):
+    """정수 초를 'MM:SS' 문자열로 변환"""
+    if seconds is None or pd.isna(seconds):
+        return "0:00"
+    seconds = int(seconds)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+def format_percentage(pct):
+    """성공률 값을 '45.0%' 문자열로 변환 (시도가 없으면 0.0%)"""
+    if pct is None or pd.isna(pct):
+        return "0.0%"
+    return f"{pct:.1f}%"
+
 def load_csv_data(file_path):
     """CSV 파일에서 데이터 읽기"""
     try:
@@ -3,23 +3,143 @@ import pandas as pd
 from datetime import datetime
 import os
 import time
+import threading
+import queue
+from collections import deque
+from concurrent.futures import Future
+from data_loader import parse_minutes, clean_value
+from profiling import connection_factory
 
 # DB 파일 경로 설정
 DB_PATH = os.path.join('./data', 'basketball_stats.db')
 
+# 성공률 컬럼과 계산에 쓰는 (성공, 시도) 컬럼
+SHOOTING_COLUMNS = {
+    'field_goal_percentage': ('field_goals_made', 'field_goals_attempt'),
+    'two_point_percentage': ('two_points_made', 'two_points_attempt'),
+    'three_point_percentage': ('three_points_made', 'three_points_attempt'),
+    'free_throw_percentage': ('free_throws_made', 'free_throws_attempt')
+}
+
+# 전체 경기(모든 리그 + 미할당)를 뜻하는 league_id (통산 기록판, 전체 DB 데이터 버전)
+ALL_LEAGUES = 0
+
+# 리그에 할당되지 않은 경기를 뜻하는 league_id (선수 통산 기록 테이블)
+UNASSIGNED_LEAGUE = -1
+
+# 선수 통산 기록 테이블(player_career_splits)에 누적하는 기록 컬럼
+CAREER_COLUMNS = (
+    'seconds_played', 'points', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers',
+    'two_points_made', 'two_points_attempt', 'three_points_made', 'three_points_attempt',
+    'free_throws_made', 'free_throws_attempt'
+)
+
+# 통산 기록 테이블에 경기 수로 누적하는 기록 달성 조건 (컬럼명: 조건 SQL)
+_DOUBLE_DIGIT_STATS = '(points >= 10) + (rebounds >= 10) + (assists >= 10) + (steals >= 10) + (blocks >= 10)'
+CAREER_MILESTONES = {
+    'double_doubles': f'{_DOUBLE_DIGIT_STATS} >= 2',
+    'triple_doubles': f'{_DOUBLE_DIGIT_STATS} >= 3',
+    'twenty_tens': 'points >= 20 AND rebounds >= 10'
+}
+
+# 팀 시즌 기록 테이블(team_season_splits)에 누적하는 팀 기록 컬럼
+TEAM_SPLIT_COLUMNS = (
+    'field_goals_made', 'field_goals_attempt', 'three_points_made', 'three_points_attempt',
+    'free_throws_made', 'free_throws_attempt', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers'
+)
+
+def _team_split_sums():
+    """팀 시즌 기록 테이블 컬럼과 경기 기록(ts: 팀, os: 상대팀)에서 더할 값 SQL"""
+    sums = {
+        'wins': 'CASE WHEN ts.total_score > os.total_score THEN 1 ELSE 0 END',
+        'losses': 'CASE WHEN ts.total_score < os.total_score THEN 1 ELSE 0 END',
+        'points_for': 'ts.total_score',
+        'points_against': 'os.total_score'
+    }
+    for quarter in range(1, 5):
+        sums[f'q{quarter}_for'] = f'ts.q{quarter}_score'
+        sums[f'q{quarter}_against'] = f'os.q{quarter}_score'
+    sums.update({col: f'ts.{col}' for col in TEAM_SPLIT_COLUMNS})
+    return sums
+
+def _career_sums():
+    """통산 기록 테이블 컬럼과 경기 기록에서 더할 값 SQL (기록 합계 + 기록 달성 경기 수)"""
+    sums = {col: col for col in CAREER_COLUMNS}
+    sums.update({name: f'CASE WHEN {condition} THEN 1 ELSE 0 END' for name, condition in CAREER_MILESTONES.items()})
+    return sums
+
+# 범주형(category)으로 바꿀 문자열 컬럼 기준: 고유값 수 / 행 수
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+_memory_reports = {}
+_memory_lock = threading.Lock()
+
+def compact_frame(df):
+    """조회 결과를 작은 dtype으로 변환
+
+    정수는 int16 이상의 가장 작은 정수형, 실수는 float32, 반복되는 문자열(팀/선수/날짜)은
+    category로 바꾼다. int8은 이후 연산에서 쉽게 넘치므로 쓰지 않는다.
+    """
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            compact = pd.to_numeric(series, downcast='integer')
+            if compact.dtype.itemsize < 2:
+                compact = compact.astype('int16')
+            df[col] = compact
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='float')
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if len(series) > 1 and series.nunique(dropna=True) <= len(series) * CATEGORY_MAX_UNIQUE_RATIO:
+                df[col] = series.astype('category')
+    return df
+
+def read_frame(query, conn, params=(), label='query', compact=True):
+    """SQL 조회 결과를 (기본적으로) 작은 dtype의 DataFrame으로 반환하고 메모리 사용량 기록"""
+    df = pd.read_sql_query(query, conn, params=params)
+    raw_bytes = int(df.memory_usage(deep=True).sum())
+    if compact:
+        df = compact_frame(df)
+    compact_bytes = int(df.memory_usage(deep=True).sum()) if compact else raw_bytes
+    
+    with _memory_lock:
+        report = _memory_reports.setdefault(label, {
+            'calls': 0, 'rows': 0, 'raw_bytes': 0, 'compact_bytes': 0
+        })
+        report['calls'] += 1
+        report['rows'] = len(df)
+        report['raw_bytes'] = raw_bytes
+        report['compact_bytes'] = compact_bytes
+    return df
+
+def get_memory_report():
+    """조회 함수별 마지막 호출의 메모리 사용량 (행당 바이트 포함)"""
+    with _memory_lock:
+        rows = [{'label': label, **report} for label, report in _memory_reports.items()]
+    df = pd.DataFrame(rows, columns=['label', 'calls', 'rows', 'raw_bytes', 'compact_bytes'])
+    rows_nonzero = df['rows'].where(df['rows'] > 0)
+    df['raw_bytes_per_row'] = (df['raw_bytes'] / rows_nonzero).round(1)
+    df['compact_bytes_per_row'] = (df['compact_bytes'] / rows_nonzero).round(1)
+    return df
+
 def get_db_connection():
     """데이터베이스 연결을 생성하고 반환"""
     # 데이터베이스 파일이 있는 디렉토리 확인 및 생성
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     
     # 연결 시도 (timeout 증가 및 isolation_level 설정)
-    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None, factory=connection_factory())
     conn.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging 모드 사용
     conn.execute("PRAGMA busy_timeout=30000")  # busy timeout 설정 (30초)
     return conn
 
+_lock_retries = 0  # execute_with_retry가 락 때문에 다시 시도한 횟수
+
 def execute_with_retry(func, max_retries=5):
-    """락 문제 발생 시 재시도하는 래퍼 함수"""
+    """락 문제 발생 시 재시도하는 래퍼 함수 (조회용, 쓰기는 run_write 사용)"""
+    global _lock_retries
     last_error = None
     for attempt in range(max_retries):
         try:
@@ -28,6 +148,7 @@ def execute_with_retry(func, max_retries=5):
             last_error = e
             if "database is locked" in str(e) and attempt < max_retries - 1:
                 print(f"데이터베이스 락 감지, {attempt + 1}번째 재시도...")
+                _lock_retries += 1
                 time.sleep(2)  # 대기 시간 증가
                 continue
             raise
@@ -37,260 +158,876 @@ def execute_with_retry(func, max_retries=5):
     if last_error:
         raise last_error
 
+# 쓰기 대기열 최대 길이 (가득 차면 호출한 쪽이 WRITE_QUEUE_TIMEOUT초까지 기다림)
+WRITE_QUEUE_SIZE = 64
+WRITE_QUEUE_TIMEOUT = 60
+
+# 쓰기 지연 시간 통계에 보관할 최근 작업 수
+WRITE_LATENCY_WINDOW = 1000
+
+class DatabaseWriter:
+    """모든 쓰기를 한 스레드, 한 연결에서 순서대로 실행하는 단일 writer
+
+    호출한 쪽은 submit()으로 받은 Future를 기다린다. 작업 함수는 writer 연결을
+    인자로 받고, 작업 하나가 BEGIN IMMEDIATE ~ COMMIT 트랜잭션 하나가 된다.
+    writer 스레드 안에서 다시 쓰기를 요청하면(중첩 호출) 대기열을 거치지 않고
+    같은 트랜잭션 안에서 바로 실행한다.
+    """
+
+    def __init__(self, maxsize=WRITE_QUEUE_SIZE):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._conn = None
+        self._conn_path = None
+        self._latencies = deque(maxlen=WRITE_LATENCY_WINDOW)
+        self._waits = deque(maxlen=WRITE_LATENCY_WINDOW)
+        self.writes = 0
+        self.failures = 0
+        self.max_queue_depth = 0
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='navoto-db-writer', daemon=True)
+                self._thread.start()
+
+    def _connection(self):
+        """writer 전용 연결 (DB_PATH가 바뀌면 다시 연결)"""
+        if self._conn is None or self._conn_path != DB_PATH:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = get_db_connection()
+            self._conn_path = DB_PATH
+        return self._conn
+
+    def _execute(self, func):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = func(conn)
+            conn.execute('COMMIT')
+            return result
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _run(self):
+        while True:
+            func, future, enqueued_at = self._queue.get()
+            started = time.perf_counter()
+            try:
+                if future.set_running_or_notify_cancel():
+                    future.set_result(self._execute(func))
+            except BaseException as e:
+                future.set_exception(e)
+                with self._metrics_lock:
+                    self.failures += 1
+            finally:
+                finished = time.perf_counter()
+                with self._metrics_lock:
+                    self.writes += 1
+                    self._waits.append(started - enqueued_at)
+                    self._latencies.append(finished - enqueued_at)
+                self._queue.task_done()
+
+    def in_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def submit(self, func):
+        """쓰기 작업을 대기열에 넣고 Future 반환"""
+        future = Future()
+        if self.in_writer_thread():
+            # 중첩 호출: 이미 열린 트랜잭션 안에서 바로 실행
+            try:
+                future.set_result(func(self._conn))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+
+        self._ensure_started()
+        try:
+            self._queue.put((func, future, time.perf_counter()), timeout=WRITE_QUEUE_TIMEOUT)
+        except queue.Full:
+            raise TimeoutError(f"쓰기 대기열이 가득 찼습니다 ({self._queue.maxsize}건)")
+        with self._metrics_lock:
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return future
+
+    def metrics(self):
+        """대기열 길이와 쓰기 지연 시간(ms) 통계"""
+        with self._metrics_lock:
+            latencies = sorted(self._latencies)
+            waits = list(self._waits)
+            metrics = {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self.max_queue_depth,
+                'writes': self.writes,
+                'failures': self.failures
+            }
+
+        def _percentile(values, p):
+            return round(values[min(len(values) - 1, int(len(values) * p))] * 1000, 2) if values else 0.0
+
+        metrics.update({
+            'avg_wait_ms': round(sum(waits) / len(waits) * 1000, 2) if waits else 0.0,
+            'p50_latency_ms': _percentile(latencies, 0.5),
+            'p95_latency_ms': _percentile(latencies, 0.95),
+            'max_latency_ms': round(latencies[-1] * 1000, 2) if latencies else 0.0
+        })
+        return metrics
+
+_writer = DatabaseWriter()
+
+def submit_write(func):
+    """쓰기 함수 func(conn)를 writer 스레드에 넘기고 Future 반환"""
+    return _writer.submit(func)
+
+def run_write(func):
+    """쓰기 함수 func(conn)를 writer 스레드에서 실행하고 결과를 기다림"""
+    return _writer.submit(func).result()
+
+def get_write_metrics():
+    """쓰기 대기열 / 지연 시간 / 락 재시도 통계"""
+    metrics = _writer.metrics()
+    metrics['lock_retries'] = _lock_retries
+    return metrics
+
+# 읽기 전용 메모리 복제본 사용 여부 (프로세스마다 DB 전체를 메모리에 복사)
+READ_REPLICA_ENABLED = os.environ.get('NAVOTO_READ_REPLICA', '0') == '1'
+
+class ReadReplica:
+    """파일 DB를 sqlite3 backup API로 복사한 프로세스 단위 메모리 DB
+
+    PRAGMA data_version(다른 연결의 커밋마다 바뀜)을 감시 연결로 확인해
+    파일 DB가 바뀌었으면 새 세대의 메모리 DB로 다시 복사한다. 읽기 연결은
+    이름 있는 공유 캐시 메모리 DB에 붙으므로 파일 락을 전혀 잡지 않는다.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.generation = 0
+        self.refreshes = 0
+        self.last_refresh_seconds = 0.0
+        self._source_version = None
+        self._anchor = None  # 현재 세대 메모리 DB를 유지하는 연결
+        self._lock = threading.Lock()
+        self._watch = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._watch.execute("PRAGMA busy_timeout=30000")
+
+    def _uri(self, generation):
+        return f'file:navoto_replica_{os.getpid()}_{id(self)}_{generation}?mode=memory&cache=shared'
+
+    def _refresh(self, source_version):
+        """파일 DB 전체를 새 세대 메모리 DB로 복사하고 교체"""
+        started = time.perf_counter()
+        generation = self.generation + 1
+        anchor = sqlite3.connect(self._uri(generation), uri=True, isolation_level=None, check_same_thread=False)
+        source = get_db_connection()
+        try:
+            source.backup(anchor)
+        finally:
+            source.close()
+
+        old_anchor = self._anchor
+        self._anchor = anchor
+        self.generation = generation
+        self._source_version = source_version
+        self.refreshes += 1
+        self.last_refresh_seconds = time.perf_counter() - started
+        # 이전 세대는 아직 열려 있는 읽기 연결이 모두 닫히면 사라짐
+        if old_anchor is not None:
+            old_anchor.close()
+
+    def connect(self):
+        """최신 세대 메모리 DB에 대한 읽기 전용 연결 반환"""
+        with self._lock:
+            source_version = self._watch.execute('PRAGMA data_version').fetchone()[0]
+            if self._anchor is None or source_version != self._source_version:
+                self._refresh(source_version)
+            # 세대가 교체되기 전에 연결해야 빈 메모리 DB가 새로 만들어지지 않음
+            conn = sqlite3.connect(self._uri(self.generation), uri=True, isolation_level=None,
+                               factory=connection_factory())
+        conn.execute('PRAGMA query_only=1')
+        return conn
+
+    def invalidate(self):
+        """다음 읽기 때 무조건 다시 복사"""
+        with self._lock:
+            self._source_version = None
+
+_replica = None
+_replica_lock = threading.Lock()
+
+def _get_replica():
+    global _replica
+    with _replica_lock:
+        if _replica is None or _replica.db_path != DB_PATH:
+            _replica = ReadReplica(DB_PATH)
+        return _replica
+
+def get_read_connection():
+    """조회용 연결 반환 (복제본 모드면 메모리 DB, 아니면 파일 DB)"""
+    if not READ_REPLICA_ENABLED or not os.path.exists(DB_PATH):
+        return get_db_connection()
+    return _get_replica().connect()
+
+def get_replica_stats():
+    """메모리 복제본 상태 (세대, 복사 횟수, 마지막 복사 시간)"""
+    if _replica is None:
+        return {'enabled': READ_REPLICA_ENABLED, 'generation': 0, 'refreshes': 0, 'last_refresh_seconds': 0.0}
+    return {
+        'enabled': READ_REPLICA_ENABLED,
+        'generation': _replica.generation,
+        'refreshes': _replica.refreshes,
+        'last_refresh_seconds': round(_replica.last_refresh_seconds, 4)
+    }
+
 def init_db():
     """데이터베이스 초기화 및 테이블 생성"""
-    def _init():
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            
-            # 테이블 생성 (이미 있으면 건너뜀)
-            c.execute('''CREATE TABLE IF NOT EXISTS player_stats
-                         (game_date TEXT, team TEXT, player TEXT, 
-                          player_number INTEGER,
-                          minutes TEXT,
-                          points INTEGER,
-                          two_points_made INTEGER, two_points_attempt INTEGER, two_point_percentage REAL,
-                          three_points_made INTEGER, three_points_attempt INTEGER, three_point_percentage REAL,
-                          field_goals_made INTEGER, field_goals_attempt INTEGER, field_goal_percentage REAL,
-                          free_throws_made INTEGER, free_throws_attempt INTEGER, free_throw_percentage REAL,
-                          offensive_rebounds INTEGER,
-                          defensive_rebounds INTEGER,
-                          rebounds INTEGER,
-                          assists INTEGER,
-                          turnovers INTEGER,
-                          steals INTEGER,
-                          blocks INTEGER,
-                          fouls INTEGER,
-                          plus_minus INTEGER,
-                          efficiency REAL,
-                          UNIQUE(game_date, team, player))''')
-            
-            c.execute('''CREATE TABLE IF NOT EXISTS team_stats
-                         (game_date TEXT, team TEXT, opponent TEXT,
-                          q1_score INTEGER DEFAULT 0,
-                          q2_score INTEGER DEFAULT 0,
-                          q3_score INTEGER DEFAULT 0,
-                          q4_score INTEGER DEFAULT 0,
-                          total_score INTEGER,
-                          field_goals_made INTEGER,
-                          field_goals_attempt INTEGER,
-                          field_goal_percentage TEXT,
-                          two_points_made INTEGER,
-                          two_points_attempt INTEGER,
-                          two_point_percentage TEXT,
-                          three_points_made INTEGER,
-                          three_points_attempt INTEGER,
-                          three_point_percentage TEXT,
-                          free_throws_made INTEGER,
-                          free_throws_attempt INTEGER,
-                          free_throw_percentage TEXT,
-                          offensive_rebounds INTEGER,
-                          defensive_rebounds INTEGER,
-                          rebounds INTEGER,
-                          assists INTEGER,
-                          steals INTEGER,
-                          blocks INTEGER,
-                          turnovers INTEGER,
-                          fouls INTEGER,
-                          plus_minus INTEGER,
-                          UNIQUE(game_date, team))''')
-            
-            c.execute('''CREATE TABLE IF NOT EXISTS leagues
-                         (league_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                          league_name TEXT UNIQUE NOT NULL,
-                          created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-            
-            c.execute('''CREATE TABLE IF NOT EXISTS game_league
-                         (game_date TEXT,
-                          team1 TEXT,
-                          team2 TEXT,
-                          league_id INTEGER,
-                          FOREIGN KEY (league_id) REFERENCES leagues(league_id),
-                          PRIMARY KEY (game_date, team1, team2))''')
-            
-            c.execute('''CREATE TABLE IF NOT EXISTS players
-                         (player_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                          player_name TEXT NOT NULL,
-                          team TEXT,
-                          player_number INTEGER,
-                          created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                          UNIQUE(player_name, team))''')
+    def _init(conn):
+        c = conn.cursor()
+        
+        # 테이블 생성 (이미 있으면 건너뜀)
+        c.execute('''CREATE TABLE IF NOT EXISTS player_stats
+                     (game_date TEXT, team TEXT, player TEXT, 
+                      player_number INTEGER,
+                      minutes TEXT,
+                      seconds_played INTEGER,
+                      points INTEGER,
+                      two_points_made INTEGER, two_points_attempt INTEGER,
+                      three_points_made INTEGER, three_points_attempt INTEGER,
+                      field_goals_made INTEGER, field_goals_attempt INTEGER,
+                      free_throws_made INTEGER, free_throws_attempt INTEGER,
+                      offensive_rebounds INTEGER,
+                      defensive_rebounds INTEGER,
+                      rebounds INTEGER,
+                      assists INTEGER,
+                      turnovers INTEGER,
+                      steals INTEGER,
+                      blocks INTEGER,
+                      fouls INTEGER,
+                      plus_minus INTEGER,
+                      efficiency REAL,
+                      player_id INTEGER,
+                      UNIQUE(game_date, team, player))''')
+        
+        c.execute('''CREATE TABLE IF NOT EXISTS team_stats
+                     (game_date TEXT, team TEXT, opponent TEXT,
+                      q1_score INTEGER DEFAULT 0,
+                      q2_score INTEGER DEFAULT 0,
+                      q3_score INTEGER DEFAULT 0,
+                      q4_score INTEGER DEFAULT 0,
+                      total_score INTEGER,
+                      field_goals_made INTEGER,
+                      field_goals_attempt INTEGER,
+                      two_points_made INTEGER,
+                      two_points_attempt INTEGER,
+                      three_points_made INTEGER,
+                      three_points_attempt INTEGER,
+                      free_throws_made INTEGER,
+                      free_throws_attempt INTEGER,
+                      offensive_rebounds INTEGER,
+                      defensive_rebounds INTEGER,
+                      rebounds INTEGER,
+                      assists INTEGER,
+                      steals INTEGER,
+                      blocks INTEGER,
+                      turnovers INTEGER,
+                      fouls INTEGER,
+                      plus_minus INTEGER,
+                      UNIQUE(game_date, team))''')
+        
+        c.execute('''CREATE TABLE IF NOT EXISTS leagues
+                     (league_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      league_name TEXT UNIQUE NOT NULL,
+                      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+        
+        c.execute('''CREATE TABLE IF NOT EXISTS game_league
+                     (game_date TEXT,
+                      team1 TEXT,
+                      team2 TEXT,
+                      league_id INTEGER,
+                      FOREIGN KEY (league_id) REFERENCES leagues(league_id),
+                      PRIMARY KEY (game_date, team1, team2))''')
+        
+        c.execute('''CREATE TABLE IF NOT EXISTS players
+                     (player_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      player_name TEXT NOT NULL,
+                      team TEXT,
+                      player_number INTEGER,
+                      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                      UNIQUE(player_name, team))''')
+        
+        # 기존 DB 마이그레이션: 출전시간을 정수 초 컬럼으로 정규화
+        _migrate_seconds_played(c)
+        
+        # 기존 DB 마이그레이션: 저장된 성공률 컬럼 제거 (성공/시도 횟수만 저장)
+        _migrate_drop_percentage_columns(c)
+        
+        # 기존 DB 마이그레이션: 경기 기록에 선수 id(players) 연결
+        _migrate_player_ids(c)
+        c.execute('DROP INDEX IF EXISTS idx_player_stats_player_id')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_player_stats_player_date ON player_stats (player_id, game_date)')
+        
+        # 성공률은 조회 시 성공/시도 횟수로 계산하는 뷰로 제공
+        # (SQLite 3.35 미만이라 이전 *_percentage 컬럼이 남아 있어도 계산 컬럼과 겹치지 않게 컬럼을 직접 나열)
+        for view, table in [('player_stats_view', 'player_stats'), ('team_stats_view', 'team_stats')]:
+            columns = [row[1] for row in c.execute(f'PRAGMA table_info({table})') if row[1] not in SHOOTING_COLUMNS]
+            c.execute(f'DROP VIEW IF EXISTS {view}')
+            c.execute(f'''CREATE VIEW {view} AS
+                          SELECT {', '.join(columns)}, {_percentage_columns_sql()}
+                          FROM {table}''')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_team_stats_team ON team_stats (team, game_date)')
+        
+        # 경기 기록 검색 인덱스 (game_log.py 조건별로 전체 스캔 없이 찾도록)
+        from game_log import INDEXED_STATS
+        c.execute('CREATE INDEX IF NOT EXISTS idx_player_stats_team_date ON player_stats (team, game_date)')
+        for stat in INDEXED_STATS:
+            c.execute(f'CREATE INDEX IF NOT EXISTS idx_player_stats_{stat} ON player_stats ({stat}, game_date)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_team_stats_opponent ON team_stats (opponent, game_date)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_game_league_league ON game_league (league_id, game_date)')
+        
+        # 리그별 데이터 버전 (league_id ALL_LEAGUES는 전체 DB 버전)
+        c.execute('''CREATE TABLE IF NOT EXISTS data_versions
+                     (league_id INTEGER PRIMARY KEY,
+                      version INTEGER NOT NULL DEFAULT 0)''')
+        
+        # 파생 데이터가 어느 데이터 버전 기준으로 계산되었는지 기록
+        c.execute('''CREATE TABLE IF NOT EXISTS derived_versions
+                     (name TEXT NOT NULL,
+                      league_id INTEGER NOT NULL,
+                      version INTEGER NOT NULL,
+                      PRIMARY KEY (name, league_id))''')
+        
+        # 고급 지표 (선수 경기별 / 팀 경기별)
+        c.execute('''CREATE TABLE IF NOT EXISTS player_advanced_stats
+                     (game_date TEXT, team TEXT, player TEXT,
+                      league_id INTEGER,
+                      true_shooting REAL,
+                      effective_fg REAL,
+                      ast_tov REAL,
+                      usage_rate REAL,
+                      offensive_rebound_rate REAL,
+                      defensive_rebound_rate REAL,
+                      rebound_rate REAL,
+                      possessions_used REAL,
+                      offensive_rating REAL,
+                      UNIQUE(game_date, team, player))''')
+        
+        c.execute('''CREATE TABLE IF NOT EXISTS team_advanced_stats
+                     (game_date TEXT, team TEXT, opponent TEXT,
+                      league_id INTEGER,
+                      true_shooting REAL,
+                      effective_fg REAL,
+                      ast_tov REAL,
+                      offensive_rebound_rate REAL,
+                      defensive_rebound_rate REAL,
+                      rebound_rate REAL,
+                      possessions REAL,
+                      pace REAL,
+                      offensive_rating REAL,
+                      defensive_rating REAL,
+                      net_rating REAL,
+                      UNIQUE(game_date, team))''')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_player_advanced_league ON player_advanced_stats (league_id, player, team)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_team_advanced_league ON team_advanced_stats (league_id, team)')
+        
+        # 개인 순위표 (리그별 선수 시즌 기록 + 기록별 순위)
+        c.execute('''CREATE TABLE IF NOT EXISTS player_season_stats
+                     (league_id INTEGER, player TEXT, team TEXT,
+                      games_played INTEGER,
+                      avg_minutes REAL,
+                      total_seconds INTEGER,
+                      avg_points REAL, total_points INTEGER,
+                      avg_rebounds REAL, total_rebounds INTEGER,
+                      avg_assists REAL, total_assists INTEGER,
+                      avg_steals REAL, total_steals INTEGER,
+                      avg_blocks REAL, total_blocks INTEGER,
+                      avg_three_points REAL, total_three_points INTEGER,
+                      avg_free_throws REAL, total_free_throws INTEGER,
+                      avg_efficiency REAL, total_efficiency REAL,
+                      avg_true_shooting REAL,
+                      avg_effective_fg REAL,
+                      avg_usage_rate REAL,
+                      avg_points_per36 REAL,
+                      avg_rebounds_per36 REAL,
+                      avg_assists_per36 REAL,
+                      PRIMARY KEY (league_id, player, team))''')
+        
+        c.execute('''CREATE TABLE IF NOT EXISTS player_leaderboard
+                     (league_id INTEGER, stat TEXT, basis TEXT, rank INTEGER,
+                      player TEXT, team TEXT, value REAL,
+                      PRIMARY KEY (league_id, stat, basis, rank))''')
+        
+        # 리그 팀별 경기 결과 + 날짜순 누적 기록 (순위표 / 특정 날짜 기준 순위)
+        c.execute('''CREATE TABLE IF NOT EXISTS league_team_games
+                     (league_id INTEGER, team TEXT, game_date TEXT, opponent TEXT,
+                      points_for INTEGER, points_against INTEGER, result TEXT,
+                      games INTEGER, wins INTEGER, losses INTEGER,
+                      total_points_for INTEGER, total_points_against INTEGER,
+                      form TEXT,
+                      PRIMARY KEY (league_id, team, game_date))''')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_league_team_games_date ON league_team_games (league_id, game_date)')
+        
+        # 팀 레이팅 (리그별 현재 값 + 경기별 변화 이력, 경기 할당 시 증분 갱신)
+        c.execute('''CREATE TABLE IF NOT EXISTS team_ratings
+                     (league_id INTEGER, team TEXT,
+                      elo REAL, margin_rating REAL,
+                      games INTEGER, last_game_date TEXT,
+                      PRIMARY KEY (league_id, team))''')
+        
+        c.execute('''CREATE TABLE IF NOT EXISTS team_rating_history
+                     (league_id INTEGER, team TEXT, game_date TEXT, opponent TEXT,
+                      elo_before REAL, elo_after REAL,
+                      margin_before REAL, margin_after REAL,
+                      PRIMARY KEY (league_id, team, game_date, opponent))''')
+        
+        # 선수 통산 기록 (선수 id / 리그 / 팀 단위 합계, league_id UNASSIGNED_LEAGUE는 리그 미할당 경기)
+        c.execute(f'''CREATE TABLE IF NOT EXISTS player_career_splits
+                     (player_id INTEGER, league_id INTEGER, team TEXT,
+                      games_played INTEGER,
+                      {', '.join(f'{col} INTEGER DEFAULT 0' for col in _career_sums())},
+                      PRIMARY KEY (player_id, league_id, team))''')
+        
+        # 기존 DB 마이그레이션: 미할당 경기 행을 league_id 0에서 UNASSIGNED_LEAGUE로 옮김
+        c.execute('UPDATE player_career_splits SET league_id = ? WHERE league_id = ?',
+                  (UNASSIGNED_LEAGUE, ALL_LEAGUES))
+        
+        # 기존 DB 마이그레이션: 기록 달성 경기 수 컬럼 추가 (추가되면 전체 다시 계산)
+        columns = [row[1] for row in c.execute('PRAGMA table_info(player_career_splits)')]
+        missing = [name for name in CAREER_MILESTONES if name not in columns]
+        for name in missing:
+            c.execute(f'ALTER TABLE player_career_splits ADD COLUMN {name} INTEGER DEFAULT 0')
+        if missing or (c.execute('SELECT COUNT(*) FROM player_career_splits').fetchone()[0] == 0
+                       and c.execute('SELECT COUNT(*) FROM player_stats').fetchone()[0] > 0):
+            _rebuild_career_splits(c)
+        
+        c.execute('CREATE INDEX IF NOT EXISTS idx_player_career_splits_team ON player_career_splits (league_id, team)')
+        
+        # 팀 시즌 기록 (리그 / 팀 / 홈(team1)·원정(team2) 단위 합계, 경기 할당 시 증분 갱신)
+        c.execute(f'''CREATE TABLE IF NOT EXISTS team_season_splits
+                     (league_id INTEGER, team TEXT, venue TEXT,
+                      games INTEGER,
+                      {', '.join(f'{col} INTEGER DEFAULT 0' for col in _team_split_sums())},
+                      PRIMARY KEY (league_id, team, venue))''')
+        if (c.execute('SELECT COUNT(*) FROM team_season_splits').fetchone()[0] == 0
+                and c.execute('SELECT COUNT(*) FROM game_league').fetchone()[0] > 0):
+            _rebuild_team_splits(c)
+        
+        # 한 경기 최고 기록판 (리그별 기록마다 상위 K개, league_id ALL_LEAGUES는 통산)과 선수별 통산 최고 기록
+        c.execute('''CREATE TABLE IF NOT EXISTS player_game_records
+                     (league_id INTEGER, stat TEXT, game_date TEXT, team TEXT, player TEXT,
+                      player_id INTEGER, value REAL,
+                      PRIMARY KEY (league_id, stat, game_date, team, player))''')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_player_game_records_value ON player_game_records (league_id, stat, value)')
+        
+        c.execute('''CREATE TABLE IF NOT EXISTS player_career_highs
+                     (player_id INTEGER, stat TEXT, value REAL, game_date TEXT, team TEXT,
+                      PRIMARY KEY (player_id, stat))''')
+        
+        if (c.execute('SELECT COUNT(*) FROM player_game_records').fetchone()[0] == 0
+                and c.execute('SELECT COUNT(*) FROM player_stats').fetchone()[0] > 0):
+            from records import rebuild_records, rebuild_career_highs
+            for (league_id,) in [(ALL_LEAGUES,)] + c.execute('SELECT DISTINCT league_id FROM game_league').fetchall():
+                rebuild_records(conn, league_id)
+            rebuild_career_highs(conn)
+        
+        # 선수 이름 별칭 (업로드 이름 변형 → 기존 선수, status: linked / suggested / dismissed)
+        c.execute('''CREATE TABLE IF NOT EXISTS player_aliases
+                     (alias TEXT NOT NULL, team TEXT NOT NULL,
+                      player_id INTEGER NOT NULL,
+                      score REAL,
+                      status TEXT NOT NULL,
+                      created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                      PRIMARY KEY (alias, team))''')
+        
+        # 레이팅 도입 전에 할당된 경기가 있으면 리그별로 한 번 재생
+        if c.execute('SELECT COUNT(*) FROM team_ratings').fetchone()[0] == 0:
+            from ratings import rebuild_league_ratings
+            for (league_id,) in c.execute('SELECT DISTINCT league_id FROM game_league').fetchall():
+                rebuild_league_ratings(conn, league_id)
+    
+    return run_write(_init)
+
+def _migrate_seconds_played(c):
+    """player_stats에 seconds_played 컬럼을 추가하고 기존 행을 채움"""
+    columns = [row[1] for row in c.execute('PRAGMA table_info(player_stats)')]
+    if 'seconds_played' not in columns:
+        c.execute('ALTER TABLE player_stats ADD COLUMN seconds_played INTEGER')
     
-    return execute_with_retry(_init)
+    rows = c.execute('SELECT rowid, minutes FROM player_stats WHERE seconds_played IS NULL').fetchall()
+    if rows:
+        c.executemany('UPDATE player_stats SET seconds_played = ? WHERE rowid = ?',
+                      [(parse_minutes(minutes), rowid) for rowid, minutes in rows])
+        print(f"출전시간 마이그레이션: {len(rows)}행")
+
+def _percentage_columns_sql(prefix='', name_prefix=''):
+    """성공/시도 횟수로 성공률(%) 컬럼을 계산하는 SQL 조각 (prefix: 테이블 별칭, name_prefix: 결과 컬럼 접두어)"""
+    return ',\n'.join(
+        f'ROUND({prefix}{made} * 100.0 / NULLIF({prefix}{attempt}, 0), 1) as {name_prefix}{name}'
+        for name, (made, attempt) in SHOOTING_COLUMNS.items()
+    )
+
+def _migrate_drop_percentage_columns(c):
+    """이전 스키마의 *_percentage 컬럼 제거 (SQLite 3.35 이상)"""
+    if sqlite3.sqlite_version_info < (3, 35, 0):
+        return
+    for table in ('player_stats', 'team_stats'):
+        columns = [row[1] for row in c.execute(f'PRAGMA table_info({table})')]
+        stale = [name for name in SHOOTING_COLUMNS if name in columns]
+        if stale:
+            # 뷰가 컬럼을 참조하고 있으면 DROP COLUMN이 실패하므로 먼저 제거 후 다시 생성
+            c.execute(f'DROP VIEW IF EXISTS {table}_view')
+            for name in stale:
+                c.execute(f'ALTER TABLE {table} DROP COLUMN {name}')
+            print(f"{table} 성공률 컬럼 제거: {', '.join(stale)}")
+
+def _migrate_player_ids(c):
+    """player_stats에 player_id 컬럼 추가 후 비어 있는 행을 players 테이블 id로 채움"""
+    columns = [row[1] for row in c.execute('PRAGMA table_info(player_stats)')]
+    if 'player_id' not in columns:
+        c.execute('ALTER TABLE player_stats ADD COLUMN player_id INTEGER')
+    
+    if c.execute('SELECT 1 FROM player_stats WHERE player_id IS NULL LIMIT 1').fetchone() is None:
+        return
+    c.execute('''INSERT OR IGNORE INTO players (player_name, team, player_number)
+                 SELECT player, team, MAX(player_number) FROM player_stats
+                 WHERE player_id IS NULL GROUP BY player, team''')
+    c.execute('''UPDATE player_stats SET player_id = (
+                     SELECT p.player_id FROM players p
+                     WHERE p.player_name = player_stats.player AND p.team = player_stats.team)
+                 WHERE player_id IS NULL''')
+    print(f"player_stats 선수 id 연결: {c.rowcount}행")
+
+def _rebuild_career_splits(c, player_ids=None):
+    """선수 통산 기록 테이블을 경기 기록에서 다시 계산 (player_ids가 있으면 그 선수들만)"""
+    where, params = '', ()
+    if player_ids is not None:
+        where = f"WHERE player_id IN ({', '.join('?' * len(player_ids))})"
+        params = tuple(player_ids)
+    c.execute(f'DELETE FROM player_career_splits {where}', params)
+    sums = _career_sums()
+    c.execute(f'''INSERT INTO player_career_splits
+                  (player_id, league_id, team, games_played, {', '.join(sums)})
+                  SELECT ps.player_id, COALESCE(gl.league_id, {UNASSIGNED_LEAGUE}), ps.team, COUNT(*),
+                         {', '.join(f'COALESCE(SUM({expr}), 0)' for expr in sums.values())}
+                  FROM player_stats ps
+                  LEFT JOIN game_league gl ON ps.game_date = gl.game_date
+                      AND (ps.team = gl.team1 OR ps.team = gl.team2)
+                  {where.replace('player_id', 'ps.player_id')}
+                  GROUP BY ps.player_id, COALESCE(gl.league_id, {UNASSIGNED_LEAGUE}), ps.team''', params)
+
+def _add_career_splits(conn, game_date, team1, team2, league_id, sign=1):
+    """경기 하나의 선수 기록을 통산 기록 테이블의 league_id 행에 더하거나(sign=1) 뺌(sign=-1)"""
+    sums = _career_sums()
+    conn.execute(f'''INSERT INTO player_career_splits
+                     (player_id, league_id, team, games_played, {', '.join(sums)})
+                     SELECT player_id, ?, team, ? * COUNT(*),
+                            {', '.join(f'? * COALESCE(SUM({expr}), 0)' for expr in sums.values())}
+                     FROM player_stats
+                     WHERE game_date = ? AND team IN (?, ?)
+                     GROUP BY player_id, team
+                     ON CONFLICT(player_id, league_id, team) DO UPDATE SET
+                     games_played = games_played + excluded.games_played,
+                     {', '.join(f'{col} = {col} + excluded.{col}' for col in sums)}''',
+                 (league_id, sign, *[sign] * len(sums), game_date, team1, team2))
+    if sign < 0:
+        conn.execute('DELETE FROM player_career_splits WHERE league_id = ? AND games_played <= 0',
+                     (league_id,))
+
+def _rebuild_team_splits(c, league_ids=None):
+    """팀 시즌 기록 테이블을 리그 경기 기록에서 다시 계산 (league_ids가 있으면 그 리그들만)"""
+    where, params = '', ()
+    if league_ids is not None:
+        where = f"WHERE league_id IN ({', '.join('?' * len(league_ids))})"
+        params = tuple(league_ids)
+    c.execute(f'DELETE FROM team_season_splits {where}', params)
+    sums = _team_split_sums()
+    c.execute(f'''INSERT INTO team_season_splits
+                  (league_id, team, venue, games, {', '.join(sums)})
+                  SELECT gl.league_id, ts.team,
+                         CASE WHEN ts.team = gl.team1 THEN 'home' ELSE 'away' END as venue, COUNT(*),
+                         {', '.join(f'COALESCE(SUM({expr}), 0)' for expr in sums.values())}
+                  FROM game_league gl
+                  JOIN team_stats ts ON ts.game_date = gl.game_date AND ts.team IN (gl.team1, gl.team2)
+                  JOIN team_stats os ON os.game_date = ts.game_date AND os.team = ts.opponent
+                  {where.replace('league_id', 'gl.league_id')}
+                  GROUP BY gl.league_id, ts.team, venue''', params)
+
+def _add_team_splits(conn, game_date, team1, team2, league_id, sign=1):
+    """경기 하나의 두 팀 기록을 팀 시즌 기록 테이블의 league_id 행에 더하거나(sign=1) 뺌(sign=-1)
+
+    team1이 홈, team2가 원정이다 (game_league와 같은 기준).
+    """
+    sums = _team_split_sums()
+    conn.execute(f'''INSERT INTO team_season_splits
+                     (league_id, team, venue, games, {', '.join(sums)})
+                     SELECT ?, ts.team, CASE WHEN ts.team = ? THEN 'home' ELSE 'away' END, ?,
+                            {', '.join(f'? * COALESCE({expr}, 0)' for expr in sums.values())}
+                     FROM team_stats ts
+                     JOIN team_stats os ON os.game_date = ts.game_date AND os.team = ts.opponent
+                     WHERE ts.game_date = ? AND ts.team IN (?, ?)
+                     ON CONFLICT(league_id, team, venue) DO UPDATE SET
+                     games = games + excluded.games,
+                     {', '.join(f'{col} = {col} + excluded.{col}' for col in sums)}''',
+                 (league_id, team1, sign, *[sign] * len(sums), game_date, team1, team2))
+    if sign < 0:
+        conn.execute('DELETE FROM team_season_splits WHERE league_id = ? AND games <= 0', (league_id,))
+
+def _bump_data_version(conn, league_id=None):
+    """데이터 변경 시 버전 증가 (캐시 무효화용)"""
+    league_ids = [ALL_LEAGUES] if league_id is None else [ALL_LEAGUES, league_id]
+    for lid in league_ids:
+        conn.execute('''INSERT INTO data_versions (league_id, version) VALUES (?, 1)
+                        ON CONFLICT(league_id) DO UPDATE SET version = version + 1''',
+                     (lid,))
+
+def get_data_version(league_id=None):
+    """리그(또는 전체 DB)의 데이터 버전 조회"""
+    def _get_version():
+        with get_read_connection() as conn:
+            row = conn.execute('SELECT version FROM data_versions WHERE league_id = ?',
+                               (ALL_LEAGUES if league_id is None else league_id,)).fetchone()
+            return row[0] if row else 0
+    
+    return execute_with_retry(_get_version)
+
+def get_derived_version(name, league_id):
+    """파생 데이터(name)가 계산된 데이터 버전 조회 (없으면 None)"""
+    def _get_version():
+        with get_read_connection() as conn:
+            row = conn.execute('SELECT version FROM derived_versions WHERE name = ? AND league_id = ?',
+                               (name, league_id)).fetchone()
+            return row[0] if row else None
+    
+    return execute_with_retry(_get_version)
+
+def set_derived_version(conn, name, league_id, version):
+    """파생 데이터(name)가 계산된 데이터 버전 기록"""
+    conn.execute('''INSERT OR REPLACE INTO derived_versions (name, league_id, version)
+                    VALUES (?, ?, ?)''', (name, league_id, version))
+
+def _game_exists(conn, game_date, team1, team2):
+    """해당 경기가 이미 저장되어 있는지 주어진 연결로 확인"""
+    c = conn.cursor()
+
+    # game_league 테이블에서 확인 (팀 순서 상관없이)
+    c.execute('''SELECT COUNT(*) FROM game_league 
+                WHERE game_date = ? AND 
+                      ((team1 = ? AND team2 = ?) OR 
+                       (team1 = ? AND team2 = ?))''', 
+             (game_date, team1, team2, team2, team1))
+    
+    exists_in_game_league = c.fetchone()[0] > 0
+    print(f"game_league 테이블 확인 결과: {exists_in_game_league}")
+    
+    # player_stats 테이블에서도 확인
+    c.execute('''SELECT COUNT(*) FROM player_stats 
+                WHERE game_date = ? AND (team = ? OR team = ?)''', 
+             (game_date, team1, team2))
+
+    exists_in_player_stats = c.fetchone()[0] > 0
+    print(f"player_stats 테이블 확인 결과: {exists_in_player_stats}")
+
+    return exists_in_game_league or exists_in_player_stats
 
 def is_game_exists(game_date, team1, team2):
     """해당 경기가 이미 DB에 저장되어 있는지 확인"""
     def _check():
         with get_db_connection() as conn:
-            c = conn.cursor()
-        
-            # game_league 테이블에서 확인 (팀 순서 상관없이)
-            c.execute('''SELECT COUNT(*) FROM game_league 
-                        WHERE game_date = ? AND 
-                              ((team1 = ? AND team2 = ?) OR 
-                               (team1 = ? AND team2 = ?))''', 
-                     (game_date, team1, team2, team2, team1))
-            
-            exists_in_game_league = c.fetchone()[0] > 0
-            print(f"game_league 테이블 확인 결과: {exists_in_game_league}")
-            
-            # player_stats 테이블에서도 확인
-            c.execute('''SELECT COUNT(*) FROM player_stats 
-                        WHERE game_date = ? AND (team = ? OR team = ?)''', 
-                     (game_date, team1, team2))
-        
-            exists_in_player_stats = c.fetchone()[0] > 0
-            print(f"player_stats 테이블 확인 결과: {exists_in_player_stats}")
-        
-            return exists_in_game_league or exists_in_player_stats
+            return _game_exists(conn, game_date, team1, team2)
         
     return execute_with_retry(_check)
 
 def save_game_data(game_date, team1, team2, team1_players, team1_total, team2_players, team2_total):
     """경기 데이터를 DB에 저장"""
-    def _save():
-        if is_game_exists(game_date, team1, team2):
+    from identity import get_identity_index, resolve_player
+    from records import add_game_records, update_career_highs
+
+    def _save(conn):
+        # 중복 확인과 저장을 같은 쓰기 트랜잭션 안에서 처리
+        if _game_exists(conn, game_date, team1, team2):
             print("이미 저장된 경기입니다.")
             return False
+        identity_index = get_identity_index(conn)
             
-        with get_db_connection() as conn:
-            try:
-                # 선수 기록 저장
-                for team_name, players_df in [(team1, team1_players), (team2, team2_players)]:
-                    for _, row in players_df.iterrows():
-                        # 선수 마스터 데이터 저장
-                        player_number = row.get('Nº', 0)
-                        get_or_create_player(row['Player'], team_name, player_number)
-                        
-                        # 경기 기록 저장
-                        player_data = {
-                            'game_date': game_date,
-                            'team': team_name,
-                            'player': row['Player'],
-                            'player_number': player_number,
-                            'minutes': row.get('MIN', '0'),
-                            'points': row.get('PTS', 0),
-                            'two_points_made': row.get('2PM', 0),
-                            'two_points_attempt': row.get('2PA', 0),
-                            'two_point_percentage': row.get('2P%', 0),
-                            'three_points_made': row.get('3PM', 0),
-                            'three_points_attempt': row.get('3PA', 0),
-                            'three_point_percentage': row.get('3P%', 0),
-                            'field_goals_made': row.get('FGM', 0),
-                            'field_goals_attempt': row.get('FGA', 0),
-                            'field_goal_percentage': row.get('FG%', 0),
-                            'free_throws_made': row.get('FTM', 0),
-                            'free_throws_attempt': row.get('FTA', 0),
-                            'free_throw_percentage': row.get('FT%', 0),
-                            'offensive_rebounds': row.get('OREB', 0),
-                            'defensive_rebounds': row.get('DREB', 0),
-                            'rebounds': row.get('REB', 0),
-                            'assists': row.get('AST', 0),
-                            'turnovers': row.get('TOV', 0),
-                            'steals': row.get('STL', 0),
-                            'blocks': row.get('BLK', 0),
-                            'fouls': row.get('PF', 0),
-                            'plus_minus': row.get('+/-', 0),
-                            'efficiency': row.get('EFF', 0)
-                        }
-                        
-                        placeholders = ', '.join(['?'] * len(player_data))
-                        columns = ', '.join(player_data.keys())
-                        sql = f'INSERT OR REPLACE INTO player_stats ({columns}) VALUES ({placeholders})'
-                        conn.execute(sql, list(player_data.values()))
-                
-                # 팀 기록 저장
-                for team, opponent, total_row in [(team1, team2, team1_total), (team2, team1, team2_total)]:
-                    team_data = {
+        try:
+            # 선수 기록 저장
+            for team_name, players_df in [(team1, team1_players), (team2, team2_players)]:
+                game_player_ids = set()
+                for _, row in players_df.iterrows():
+                    # 선수 마스터 데이터 저장 (이름 변형은 기존 선수로 연결)
+                    player_number = row.get('Nº', 0)
+                    player_id, player_name = resolve_player(conn, identity_index, row['Player'],
+                                                            team_name, player_number, game_player_ids)
+                    game_player_ids.add(player_id)
+                    
+                    # 경기 기록 저장
+                    player_data = {
                         'game_date': game_date,
-                        'team': team,
-                        'opponent': opponent,
-                        'q1_score': int(total_row.get('Q1', 0)),
-                        'q2_score': int(total_row.get('Q2', 0)),
-                        'q3_score': int(total_row.get('Q3', 0)),
-                        'q4_score': int(total_row.get('Q4', 0)),
-                        'total_score': int(total_row.get('PTS', 0)),
-                        'field_goals_made': int(total_row.get('FGM', 0)),
-                        'field_goals_attempt': int(total_row.get('FGA', 0)),
-                        'field_goal_percentage': total_row.get('FG%', 0),
-                        'two_points_made': total_row.get('2PM', 0),
-                        'two_points_attempt': total_row.get('2PA', 0),
-                        'two_point_percentage': total_row.get('2P%', 0),
-                        'three_points_made': total_row.get('3PM', 0),
-                        'three_points_attempt': total_row.get('3PA', 0),
-                        'three_point_percentage': total_row.get('3P%', 0),
-                        'free_throws_made': total_row.get('FTM', 0),
-                        'free_throws_attempt': total_row.get('FTA', 0),
-                        'free_throw_percentage': total_row.get('FT%', 0),
-                        'offensive_rebounds': total_row.get('OREB', 0),
-                        'defensive_rebounds': total_row.get('DREB', 0),
-                        'rebounds': total_row.get('REB', 0),
-                        'assists': total_row.get('AST', 0),
-                        'steals': total_row.get('STL', 0),
-                        'blocks': total_row.get('BLK', 0),
-                        'turnovers': total_row.get('TOV', 0),
-                        'fouls': total_row.get('PF', 0),
-                        'plus_minus': total_row.get('+/-', 0)
+                        'team': team_name,
+                        'player': player_name,
+                        'player_number': player_number,
+                        'minutes': str(row.get('MIN', '0')),
+                        'seconds_played': parse_minutes(row.get('MIN', 0)),
+                        'points': row.get('PTS', 0),
+                        'two_points_made': clean_value(row.get('2PM', 0)),
+                        'two_points_attempt': clean_value(row.get('2PA', 0)),
+                        'three_points_made': clean_value(row.get('3PM', 0)),
+                        'three_points_attempt': clean_value(row.get('3PA', 0)),
+                        'field_goals_made': clean_value(row.get('FGM', 0)),
+                        'field_goals_attempt': clean_value(row.get('FGA', 0)),
+                        'free_throws_made': clean_value(row.get('FTM', 0)),
+                        'free_throws_attempt': clean_value(row.get('FTA', 0)),
+                        'offensive_rebounds': row.get('OREB', 0),
+                        'defensive_rebounds': row.get('DREB', 0),
+                        'rebounds': row.get('REB', 0),
+                        'assists': row.get('AST', 0),
+                        'turnovers': row.get('TOV', 0),
+                        'steals': row.get('STL', 0),
+                        'blocks': row.get('BLK', 0),
+                        'fouls': row.get('PF', 0),
+                        'plus_minus': row.get('+/-', 0),
+                        'efficiency': row.get('EFF', 0),
+                        'player_id': player_id
                     }
                     
-                    placeholders = ', '.join(['?'] * len(team_data))
-                    columns = ', '.join(team_data.keys())
-                    sql = f'INSERT OR REPLACE INTO team_stats ({columns}) VALUES ({placeholders})'
-                    conn.execute(sql, list(team_data.values()))
-                
-                print("데이터 저장 완료")
-                conn.commit()
-                return True
+                    placeholders = ', '.join(['?'] * len(player_data))
+                    columns = ', '.join(player_data.keys())
+                    sql = f'INSERT OR REPLACE INTO player_stats ({columns}) VALUES ({placeholders})'
+                    conn.execute(sql, list(player_data.values()))
+            
+            # 팀 기록 저장
+            for team, opponent, total_row in [(team1, team2, team1_total), (team2, team1, team2_total)]:
+                team_data = {
+                    'game_date': game_date,
+                    'team': team,
+                    'opponent': opponent,
+                    'q1_score': int(total_row.get('Q1', 0)),
+                    'q2_score': int(total_row.get('Q2', 0)),
+                    'q3_score': int(total_row.get('Q3', 0)),
+                    'q4_score': int(total_row.get('Q4', 0)),
+                    'total_score': int(total_row.get('PTS', 0)),
+                    'field_goals_made': clean_value(total_row.get('FGM', 0)),
+                    'field_goals_attempt': clean_value(total_row.get('FGA', 0)),
+                    'two_points_made': clean_value(total_row.get('2PM', 0)),
+                    'two_points_attempt': clean_value(total_row.get('2PA', 0)),
+                    'three_points_made': clean_value(total_row.get('3PM', 0)),
+                    'three_points_attempt': clean_value(total_row.get('3PA', 0)),
+                    'free_throws_made': clean_value(total_row.get('FTM', 0)),
+                    'free_throws_attempt': clean_value(total_row.get('FTA', 0)),
+                    'offensive_rebounds': total_row.get('OREB', 0),
+                    'defensive_rebounds': total_row.get('DREB', 0),
+                    'rebounds': total_row.get('REB', 0),
+                    'assists': total_row.get('AST', 0),
+                    'steals': total_row.get('STL', 0),
+                    'blocks': total_row.get('BLK', 0),
+                    'turnovers': total_row.get('TOV', 0),
+                    'fouls': total_row.get('PF', 0),
+                    'plus_minus': total_row.get('+/-', 0)
+                }
                 
-            except Exception as e:
-                print(f"데이터 저장 중 오류 발생: {str(e)}")
-                conn.rollback()
-                raise e
+                placeholders = ', '.join(['?'] * len(team_data))
+                columns = ', '.join(team_data.keys())
+                sql = f'INSERT OR REPLACE INTO team_stats ({columns}) VALUES ({placeholders})'
+                conn.execute(sql, list(team_data.values()))
+            
+            # 통산 기록 누적 (리그 할당 전이므로 미할당(UNASSIGNED_LEAGUE) 행에)
+            _add_career_splits(conn, game_date, team1, team2, UNASSIGNED_LEAGUE)
+            
+            # 통산 기록판과 선수별 최고 기록 갱신
+            add_game_records(conn, game_date, team1, team2, ALL_LEAGUES)
+            update_career_highs(conn, game_date, team1, team2)
+            
+            _bump_data_version(conn)
+            print("데이터 저장 완료")
+            return True
+            
+        except Exception as e:
+            print(f"데이터 저장 중 오류 발생: {str(e)}")
+            raise e
     
-    return execute_with_retry(_save)
+    return run_write(_save)
 
 def get_player_stats(game_date, team, player):
     """특정 선수의 경기 기록 조회"""
-    with get_db_connection() as conn:
-        query = '''SELECT * FROM player_stats 
+    with get_read_connection() as conn:
+        query = '''SELECT * FROM player_stats_view 
                   WHERE game_date = ? AND team = ? AND player = ?'''
-        df = pd.read_sql_query(query, conn, params=(game_date, team, player))
+        df = read_frame(query, conn, params=(game_date, team, player), label='get_player_stats')
         return df.iloc[0] if not df.empty else None 
 
 # 리그 관련 함수들
 def create_league(league_name):
     """새로운 리그 생성"""
-    with get_db_connection() as conn:
+    def _create(conn):
         try:
             c = conn.cursor()
             c.execute('INSERT INTO leagues (league_name) VALUES (?)', (league_name,))
-            conn.commit()
             return True
         except sqlite3.IntegrityError:
             return False
+    
+    return run_write(_create)
 
 def get_leagues():
     """모든 리그 목록 조회 (생성일 역순)"""
-    with get_db_connection() as conn:
+    with get_read_connection() as conn:
         query = 'SELECT * FROM leagues ORDER BY created_at DESC'
-        return pd.read_sql_query(query, conn)
+        return read_frame(query, conn, label='get_leagues')
 
 def assign_game_to_league(game_date, team1, team2, league_id):
     """경기를 리그에 할당"""
-    with get_db_connection() as conn:
+    from ratings import update_game_rating, rebuild_league_ratings
+    from records import add_game_records, rebuild_records
+
+    def _assign(conn):
         c = conn.cursor()
+        c.execute('SELECT league_id FROM game_league WHERE game_date = ? AND team1 = ? AND team2 = ?',
+                  (game_date, team1, team2))
+        previous = c.fetchone()
         c.execute('''INSERT OR REPLACE INTO game_league 
                     (game_date, team1, team2, league_id) 
                     VALUES (?, ?, ?, ?)''',
                  (game_date, team1, team2, league_id))
-        conn.commit()
+        _bump_data_version(conn, league_id)
+        if previous is not None and previous[0] != league_id:
+            # 경기가 빠진 이전 리그의 캐시(순위, 상대 전적 등)도 다시 계산되도록
+            _bump_data_version(conn, previous[0])
+        
+        # 통산 기록을 이전 리그(처음 할당이면 미할당) 행에서 새 리그 행으로 이동
+        from_league = UNASSIGNED_LEAGUE if previous is None else previous[0]
+        if from_league != league_id:
+            _add_career_splits(conn, game_date, team1, team2, from_league, -1)
+            _add_career_splits(conn, game_date, team1, team2, league_id)
+            
+            # 리그 기록판 갱신 (이전 리그 기록판은 이 경기 기록이 빠지므로 다시 계산)
+            if previous is not None:
+                rebuild_records(conn, previous[0])
+            add_game_records(conn, game_date, team1, team2, league_id)
+            
+            # 팀 시즌 기록을 이전 리그 행에서 새 리그 행으로 이동
+            if previous is not None:
+                _add_team_splits(conn, game_date, team1, team2, previous[0], -1)
+            _add_team_splits(conn, game_date, team1, team2, league_id)
+        
+        # 팀 레이팅 갱신 (새 경기는 두 팀만 증분, 다시 할당된 경기는 관련 리그 재생)
+        if previous is None:
+            update_game_rating(conn, league_id, game_date, team1, team2)
+        else:
+            for lid in {previous[0], league_id}:
+                rebuild_league_ratings(conn, lid)
+    
+    return run_write(_assign)
 
 def get_league_games(league_id):
     """특정 리그의 모든 경기 조회 (날짜 역순)"""
     def _get_games():
-        with get_db_connection() as conn:
+        with get_read_connection() as conn:
             # 기본 경기 정보와 팀 스탯 조회
-            query = '''
+            query = f'''
             SELECT 
                 gl.game_date,
                 gl.team1,
@@ -311,9 +1048,7 @@ def get_league_games(league_id):
                 ts1.three_points_attempt as team1_3PA,
                 ts1.free_throws_made as team1_FTM,
                 ts1.free_throws_attempt as team1_FTA,
-                ts1.two_point_percentage as team1_2P_PCT,
-                ts1.three_point_percentage as team1_3P_PCT,
-                ts1.free_throw_percentage as team1_FT_PCT,
+                {_percentage_columns_sql('ts1.', 'team1_')},
                 ts1.rebounds as team1_rebounds,
                 ts1.assists as team1_assists,
                 ts1.steals as team1_steals,
@@ -325,9 +1060,7 @@ def get_league_games(league_id):
                 ts2.three_points_attempt as team2_3PA,
                 ts2.free_throws_made as team2_FTM,
                 ts2.free_throws_attempt as team2_FTA,
-                ts2.two_point_percentage as team2_2P_PCT,
-                ts2.three_point_percentage as team2_3P_PCT,
-                ts2.free_throw_percentage as team2_FT_PCT,
+                {_percentage_columns_sql('ts2.', 'team2_')},
                 ts2.rebounds as team2_rebounds,
                 ts2.assists as team2_assists,
                 ts2.steals as team2_steals,
@@ -340,222 +1073,227 @@ def get_league_games(league_id):
             ORDER BY gl.game_date DESC
             '''
             
-            games_df = pd.read_sql_query(query, conn, params=(league_id,))
-            
-            if not games_df.empty:
-                # 각 경기의 선수 기록을 딕셔너리로 저장
-                games_with_players = []
-                for _, game in games_df.iterrows():
-                    game_dict = game.to_dict()
-                    
-                    # 팀1 선수 기록
-                    team1_query = '''
-                    SELECT 
-                        player_number as "Nº",
-                        player as "Player",
-                        minutes as "MIN",
-                        points as "PTS",
-                        field_goals_made as "FGM",
-                        field_goals_attempt as "FGA",
-                        field_goal_percentage as "FG%",
-                        two_points_made as "2PM",
-                        two_points_attempt as "2PA",
-                        two_point_percentage as "2P%",
-                        three_points_made as "3PM",
-                        three_points_attempt as "3PA",
-                        three_point_percentage as "3P%",
-                        free_throws_made as "FTM",
-                        free_throws_attempt as "FTA",
-                        free_throw_percentage as "FT%",
-                        offensive_rebounds as "OREB",
-                        defensive_rebounds as "DREB",
-                        rebounds as "REB",
-                        assists as "AST",
-                        steals as "STL",
-                        blocks as "BLK",
-                        turnovers as "TOV",
-                        fouls as "PF",
-                        plus_minus as "+/-",
-                        efficiency as "EFF"
-                    FROM player_stats
-                    WHERE game_date = ? AND team = ?
-                    ORDER BY player_number
-                    '''
-                    team1_players = pd.read_sql_query(team1_query, conn, 
-                                                    params=(game['game_date'], game['team1']))
-                    game_dict['team1_players'] = team1_players
-                    
-                    # 팀2 선수 기록
-                    team2_players = pd.read_sql_query(team1_query, conn, 
-                                                    params=(game['game_date'], game['team2']))
-                    game_dict['team2_players'] = team2_players
-                    
-                    games_with_players.append(game_dict)
-                
-                print(f"리그 {league_id}의 경기 수: {len(games_with_players)}")
-                return pd.DataFrame(games_with_players)
-            
+            games_df = read_frame(query, conn, params=(league_id,), label='get_league_games')
+            print(f"리그 {league_id}의 경기 수: {len(games_df)}")
             return games_df
     
     return execute_with_retry(_get_games)
 
+def get_game_box_score(game_date, team):
+    """경기 한 팀의 선수별 기록 조회 (박스스코어 형식)"""
+    def _get_box_score():
+        with get_read_connection() as conn:
+            query = '''
+            SELECT 
+                player_number as "Nº",
+                player as "Player",
+                printf('%d:%02d', seconds_played / 60, seconds_played % 60) as "MIN",
+                points as "PTS",
+                field_goals_made as "FGM",
+                field_goals_attempt as "FGA",
+                field_goal_percentage as "FG%",
+                two_points_made as "2PM",
+                two_points_attempt as "2PA",
+                two_point_percentage as "2P%",
+                three_points_made as "3PM",
+                three_points_attempt as "3PA",
+                three_point_percentage as "3P%",
+                free_throws_made as "FTM",
+                free_throws_attempt as "FTA",
+                free_throw_percentage as "FT%",
+                offensive_rebounds as "OREB",
+                defensive_rebounds as "DREB",
+                rebounds as "REB",
+                assists as "AST",
+                steals as "STL",
+                blocks as "BLK",
+                turnovers as "TOV",
+                fouls as "PF",
+                plus_minus as "+/-",
+                efficiency as "EFF"
+            FROM player_stats_view
+            WHERE game_date = ? AND team = ?
+            ORDER BY player_number
+            '''
+            return read_frame(query, conn, params=(game_date, team), label='get_game_box_score')
+    
+    return execute_with_retry(_get_box_score)
+
 # 선수 관련 함수들
+def _get_or_create_player(conn, player_name, team, player_number):
+    """선수 정보 조회 또는 생성 (주어진 쓰기 연결 사용)"""
+    c = conn.cursor()
+    c.execute('''INSERT OR IGNORE INTO players 
+                (player_name, team, player_number)
+                VALUES (?, ?, ?)''',
+             (player_name, team, player_number))
+    
+    c.execute('''SELECT player_id FROM players 
+                WHERE player_name = ? AND team = ?''',
+             (player_name, team))
+    return c.fetchone()[0]
+
 def get_or_create_player(player_name, team, player_number):
     """선수 정보 조회 또는 생성"""
-    with get_db_connection() as conn:
-        c = conn.cursor()
-        c.execute('''INSERT OR IGNORE INTO players 
-                    (player_name, team, player_number)
-                    VALUES (?, ?, ?)''',
-                 (player_name, team, player_number))
-        conn.commit()
-        
-        c.execute('''SELECT player_id FROM players 
-                    WHERE player_name = ? AND team = ?''',
-                 (player_name, team))
-        return c.fetchone()[0]
-
-def get_player_career_stats(player_name):
-    """선수의 통산 기록 조회"""
+    return run_write(lambda conn: _get_or_create_player(conn, player_name, team, player_number))
+
+def get_player_id(player_name, team):
+    """선수 이름과 팀으로 players 테이블 id 조회 (없으면 None)"""
+    def _get_id():
+        with get_read_connection() as conn:
+            row = conn.execute('SELECT player_id FROM players WHERE player_name = ? AND team = ?',
+                               (player_name, team)).fetchone()
+            return row[0] if row else None
+
+    return execute_with_retry(_get_id)
+
+def get_player_career_stats(player_id):
+    """선수의 통산 기록 조회 (리그 / 팀별 합계 테이블에서 선수 id로 합산)"""
     query = '''
     SELECT 
-        COUNT(*) as games_played,
-        AVG(points) as avg_points,
-        AVG(rebounds) as avg_rebounds,
-        AVG(assists) as avg_assists,
-        AVG(steals) as avg_steals,
-        AVG(blocks) as avg_blocks,
-        AVG(turnovers) as avg_turnovers,
-        AVG(minutes) as avg_minutes,
+        SUM(games_played) as games_played,
+        SUM(points) * 1.0 / SUM(games_played) as avg_points,
+        SUM(rebounds) * 1.0 / SUM(games_played) as avg_rebounds,
+        SUM(assists) * 1.0 / SUM(games_played) as avg_assists,
+        SUM(steals) * 1.0 / SUM(games_played) as avg_steals,
+        SUM(blocks) * 1.0 / SUM(games_played) as avg_blocks,
+        SUM(turnovers) * 1.0 / SUM(games_played) as avg_turnovers,
+        SUM(seconds_played) / 60.0 / SUM(games_played) as avg_minutes,
+        SUM(seconds_played) as total_seconds,
         SUM(two_points_made) as total_2pm,
         SUM(two_points_attempt) as total_2pa,
         SUM(three_points_made) as total_3pm,
         SUM(three_points_attempt) as total_3pa,
         SUM(free_throws_made) as total_ftm,
         SUM(free_throws_attempt) as total_fta
-    FROM player_stats
-    WHERE player = ?
+    FROM player_career_splits
+    WHERE player_id = ?
     '''
-    with sqlite3.connect(DB_PATH) as conn:
-        df = pd.read_sql_query(query, conn, params=(player_name,))
-        if df['games_played'].iloc[0] > 0:
-            return df.iloc[0]
-        return None 
-
-def get_team_rankings(league_id):
-    """특정 리그의 팀 순위 조회"""
-    def _get_rankings():
-        with get_db_connection() as conn:
-            # 팀별 경기 결과 조회
+    def _get_career():
+        with get_read_connection() as conn:
+            df = read_frame(query, conn, params=(player_id,), label='get_player_career_stats')
+            if df['games_played'].fillna(0).iloc[0] > 0:
+                return df.iloc[0]
+            return None
+
+    return execute_with_retry(_get_career)
+
+def get_player_career_splits(player_id):
+    """선수의 리그 / 팀별 통산 기록 (경기당 평균)"""
+    def _get_splits():
+        with get_read_connection() as conn:
             query = '''
-            WITH team_games AS (
-                -- 홈팀 기준 결과
-                SELECT 
-                    gl.team1 as team,
-                    gl.game_date,
-                    ts1.total_score as team_score,
-                    ts2.total_score as opponent_score,
-                    CASE WHEN ts1.total_score > ts2.total_score THEN 1 ELSE 0 END as win,
-                    CASE WHEN ts1.total_score < ts2.total_score THEN 1 ELSE 0 END as loss
-                FROM game_league gl
-                JOIN team_stats ts1 ON gl.game_date = ts1.game_date AND gl.team1 = ts1.team
-                JOIN team_stats ts2 ON gl.game_date = ts2.game_date AND gl.team2 = ts2.team
-                WHERE gl.league_id = ?
-                
-                UNION ALL
-                
-                -- 원정팀 기준 결과
-                SELECT 
-                    gl.team2 as team,
-                    gl.game_date,
-                    ts2.total_score as team_score,
-                    ts1.total_score as opponent_score,
-                    CASE WHEN ts2.total_score > ts1.total_score THEN 1 ELSE 0 END as win,
-                    CASE WHEN ts2.total_score < ts1.total_score THEN 1 ELSE 0 END as loss
-                FROM game_league gl
-                JOIN team_stats ts1 ON gl.game_date = ts1.game_date AND gl.team1 = ts1.team
-                JOIN team_stats ts2 ON gl.game_date = ts2.game_date AND gl.team2 = ts2.team
-                WHERE gl.league_id = ?
-            ),
-            team_summary AS (
-                SELECT 
-                    team,
-                    COUNT(*) as games,
-                    SUM(win) as wins,
-                    SUM(loss) as losses,
-                    CAST(SUM(win) AS FLOAT) / COUNT(*) as win_pct,
-                    AVG(team_score) as avg_points_for,
-                    AVG(opponent_score) as avg_points_against,
-                    AVG(team_score - opponent_score) as point_diff,
-                    GROUP_CONCAT(
-                        CASE 
-                            WHEN win = 1 THEN '승'
-                            ELSE '패'
-                        END
-                    ) as recent_results
-                FROM (
-                    SELECT *,
-                        ROW_NUMBER() OVER (PARTITION BY team ORDER BY game_date DESC) as game_num
-                    FROM team_games
-                ) ranked
-                WHERE game_num <= 5  -- 최근 5경기
-                GROUP BY team
-            )
-            SELECT 
-                ROW_NUMBER() OVER (ORDER BY win_pct DESC, point_diff DESC) as 순위,
-                team as 팀명,
-                games as 경기수,
-                wins as 승,
-                losses as 패,
-                win_pct as 승률,
-                ROUND(avg_points_for, 1) as 득점,
-                ROUND(avg_points_against, 1) as 실점,
-                ROUND(point_diff, 1) as 득실차,
-                recent_results as 연속
-            FROM team_summary
-            ORDER BY win_pct DESC, point_diff DESC
+            SELECT
+                COALESCE(l.league_name, '미할당') as 리그,
+                s.team as 팀,
+                s.games_played as 경기수,
+                ROUND(s.seconds_played / 60.0 / s.games_played, 1) as 출전시간,
+                ROUND(s.points * 1.0 / s.games_played, 1) as 득점,
+                ROUND(s.rebounds * 1.0 / s.games_played, 1) as 리바운드,
+                ROUND(s.assists * 1.0 / s.games_played, 1) as 어시스트,
+                ROUND(s.steals * 1.0 / s.games_played, 1) as 스틸,
+                ROUND(s.blocks * 1.0 / s.games_played, 1) as 블록,
+                ROUND(s.turnovers * 1.0 / s.games_played, 1) as 턴오버
+            FROM player_career_splits s
+            LEFT JOIN leagues l ON s.league_id = l.league_id
+            WHERE s.player_id = ?
+            ORDER BY s.league_id, s.team
             '''
-            
-            return pd.read_sql_query(query, conn, params=(league_id, league_id))
+            return read_frame(query, conn, params=(player_id,), label='get_player_career_splits')
+
+    return execute_with_retry(_get_splits)
+
+def get_team_season_shooting(league_id):
+    """리그 팀별 시즌 슈팅 기록 (성공/시도 합계로 성공률 계산)"""
+    def _get_shooting():
+        with get_read_connection() as conn:
+            query = '''
+            SELECT
+                ts.team,
+                COUNT(*) as games,
+                SUM(ts.field_goals_made) as field_goals_made,
+                SUM(ts.field_goals_attempt) as field_goals_attempt,
+                SUM(ts.two_points_made) as two_points_made,
+                SUM(ts.two_points_attempt) as two_points_attempt,
+                SUM(ts.three_points_made) as three_points_made,
+                SUM(ts.three_points_attempt) as three_points_attempt,
+                SUM(ts.free_throws_made) as free_throws_made,
+                SUM(ts.free_throws_attempt) as free_throws_attempt
+            FROM game_league gl
+            JOIN team_stats ts ON ts.game_date = gl.game_date AND ts.team IN (gl.team1, gl.team2)
+            WHERE gl.league_id = ?
+            GROUP BY ts.team
+            '''
+            return read_frame(
+                f'SELECT *, {_percentage_columns_sql()} FROM ({query}) ORDER BY field_goal_percentage DESC',
+                conn, params=(league_id,), label='get_team_season_shooting')
     
-    return execute_with_retry(_get_rankings)
+    return execute_with_retry(_get_shooting)
+
+# 개인 순위 기준으로 사용할 수 있는 기록 (player_season_query의 avg_/total_ 접미어)
+RANKING_STATS = ('points', 'rebounds', 'assists', 'steals', 'blocks', 'three_points',
+                 'free_throws', 'efficiency', 'true_shooting', 'effective_fg', 'usage_rate',
+                 'points_per36', 'rebounds_per36', 'assists_per36')
+
+# 비율 기록은 총합이 없어 평균 기준으로만 순위를 매긴다
+RATE_STATS = ('true_shooting', 'effective_fg', 'usage_rate',
+              'points_per36', 'rebounds_per36', 'assists_per36')
+
+# 자유투 시도를 공격 기회로 환산하는 계수 (TS%, 공격 기회 계산에 공통으로 사용)
+FT_POSSESSION_FACTOR = 0.44
+
+# 리그의 선수(선수, 팀)별 시즌 평균/총합 집계
+PLAYER_SEASON_QUERY = f'''
+    SELECT 
+        ps.player,
+        ps.team,
+        COUNT(DISTINCT ps.game_date) as games_played,
+        AVG(ps.seconds_played) / 60.0 as avg_minutes,
+        SUM(ps.seconds_played) as total_seconds,
+        AVG(ps.points) as avg_points,
+        SUM(ps.points) as total_points,
+        AVG(ps.rebounds) as avg_rebounds,
+        SUM(ps.rebounds) as total_rebounds,
+        AVG(ps.assists) as avg_assists,
+        SUM(ps.assists) as total_assists,
+        AVG(ps.steals) as avg_steals,
+        SUM(ps.steals) as total_steals,
+        AVG(ps.blocks) as avg_blocks,
+        SUM(ps.blocks) as total_blocks,
+        AVG(ps.three_points_made) as avg_three_points,
+        SUM(ps.three_points_made) as total_three_points,
+        AVG(ps.free_throws_made) as avg_free_throws,
+        SUM(ps.free_throws_made) as total_free_throws,
+        AVG(ps.efficiency) as avg_efficiency,
+        SUM(ps.efficiency) as total_efficiency,
+        SUM(ps.points) * 100.0 / NULLIF(2 * (SUM(ps.field_goals_attempt) + {FT_POSSESSION_FACTOR} * SUM(ps.free_throws_attempt)), 0) as avg_true_shooting,
+        (SUM(ps.field_goals_made) + 0.5 * SUM(ps.three_points_made)) * 100.0 / NULLIF(SUM(ps.field_goals_attempt), 0) as avg_effective_fg,
+        SUM(pas.usage_rate * ps.seconds_played)
+            / NULLIF(SUM(CASE WHEN pas.usage_rate IS NOT NULL THEN ps.seconds_played END), 0) as avg_usage_rate,
+        SUM(ps.points) * 36 * 60.0 / NULLIF(SUM(ps.seconds_played), 0) as avg_points_per36,
+        SUM(ps.rebounds) * 36 * 60.0 / NULLIF(SUM(ps.seconds_played), 0) as avg_rebounds_per36,
+        SUM(ps.assists) * 36 * 60.0 / NULLIF(SUM(ps.seconds_played), 0) as avg_assists_per36
+    FROM player_stats ps
+    JOIN game_league gl ON ps.game_date = gl.game_date 
+        AND (ps.team = gl.team1 OR ps.team = gl.team2)
+    LEFT JOIN player_advanced_stats pas ON pas.game_date = ps.game_date
+        AND pas.team = ps.team AND pas.player = ps.player
+    WHERE gl.league_id = ?
+    GROUP BY ps.player, ps.team
+'''
 
 def get_player_rankings(league_id, stat_column, limit=20):
     """특정 리그의 개인 순위 조회"""
+    if stat_column not in RANKING_STATS:
+        raise ValueError(f"지원하지 않는 순위 기준입니다: {stat_column}")
+    
     def _get_rankings():
-        with get_db_connection() as conn:
-            # 선수별 평균 기록 조회
+        with get_read_connection() as conn:
+            # 선수별 평균 기록 조회 (stat_column은 RANKING_STATS로 검증된 값)
             query = f'''
-            WITH player_games AS (
-                SELECT 
-                    ps.player,
-                    ps.team,
-                    COUNT(DISTINCT ps.game_date) as games_played,
-                    AVG(ps.minutes) as avg_minutes,
-                    AVG(ps.points) as avg_points,
-                    SUM(ps.points) as total_points,
-                    AVG(ps.rebounds) as avg_rebounds,
-                    SUM(ps.rebounds) as total_rebounds,
-                    AVG(ps.assists) as avg_assists,
-                    SUM(ps.assists) as total_assists,
-                    AVG(ps.steals) as avg_steals,
-                    SUM(ps.steals) as total_steals,
-                    AVG(ps.blocks) as avg_blocks,
-                    SUM(ps.blocks) as total_blocks,
-                    AVG(ps.three_points_made) as avg_three_points,
-                    SUM(ps.three_points_made) as total_three_points,
-                    AVG(ps.free_throws_made) as avg_free_throws,
-                    SUM(ps.free_throws_made) as total_free_throws,
-                    AVG(ps.efficiency) as avg_efficiency,
-                    SUM(ps.efficiency) as total_efficiency
-                FROM player_stats ps
-                JOIN game_league gl ON ps.game_date = gl.game_date 
-                    AND (ps.team = gl.team1 OR ps.team = gl.team2)
-                WHERE gl.league_id = ?
-                GROUP BY ps.player, ps.team
-            )
+            WITH player_games AS ({PLAYER_SEASON_QUERY})
             SELECT 
-                ROW_NUMBER() OVER (ORDER BY avg_{stat_column} DESC) as 순위,
+                ROW_NUMBER() OVER (ORDER BY avg_{stat_column} IS NULL, avg_{stat_column} DESC) as 순위,
                 player as 선수명,
                 team as 팀명,
                 games_played as 경기수,
@@ -567,12 +1305,15 @@ def get_player_rankings(league_id, stat_column, limit=20):
                 ROUND(avg_blocks, 1) || ' (' || total_blocks || ')' as 블록,
                 ROUND(avg_three_points, 1) || ' (' || total_three_points || ')' as "3점슛",
                 ROUND(avg_free_throws, 1) || ' (' || total_free_throws || ')' as 자유투,
-                ROUND(avg_efficiency, 1) || ' (' || total_efficiency || ')' as 효율값
+                ROUND(avg_efficiency, 1) || ' (' || total_efficiency || ')' as 효율값,
+                ROUND(avg_true_shooting, 1) as "TS%",
+                ROUND(avg_effective_fg, 1) as "eFG%",
+                ROUND(avg_usage_rate, 1) as "USG%"
             FROM player_games
-            ORDER BY avg_{stat_column} DESC
-            LIMIT {limit}
+            ORDER BY avg_{stat_column} IS NULL, avg_{stat_column} DESC
+            LIMIT ?
             '''
             
-            return pd.read_sql_query(query, conn, params=(league_id,))
+            return read_frame(query, conn, params=(league_id, limit), label='get_player_rankings')
     
     return execute_with_retry(_get_rankings)
@@ -0,0 +1,182 @@
+import os
+from database import get_read_connection, execute_with_retry, read_frame
+from data_loader import format_seconds
+
+# 조건으로 쓸 수 있는 선수 기록 (컬럼명: 표시 이름)
+FILTER_STATS = {
+    'points': '득점',
+    'rebounds': '리바운드',
+    'assists': '어시스트',
+    'steals': '스틸',
+    'blocks': '블록',
+    'three_points_made': '3점슛',
+    'efficiency': '효율값'
+}
+
+# 기록 조건만으로도 인덱스를 타는 기록 (init_db에서 (기록, 날짜) 인덱스 생성)
+INDEXED_STATS = ('points', 'rebounds', 'assists')
+
+# 한 페이지 행 수
+PAGE_SIZE = 50
+
+# player_stats 행 수(최대 rowid로 추정)가 이보다 많으면 인덱스 없이 전체를 읽는 쿼리는 거부
+FULL_SCAN_ROW_LIMIT = int(os.environ.get('NAVOTO_GAME_LOG_SCAN_LIMIT', '50000'))
+
+# 실행 계획에서 전체 스캔을 확인할 테이블 별칭
+_SCAN_GUARDED = ('ps', 'ts', 'gl')
+
+class GameLogFilter:
+    """경기 기록 검색 조건 (지정하지 않은 조건은 None)
+
+    min_stats는 {기록 컬럼: 최솟값} 형태다 (예: {'points': 20}).
+    """
+
+    def __init__(self, player_id=None, team=None, opponent=None, league_id=None,
+                 date_from=None, date_to=None, min_stats=None):
+        self.player_id = player_id
+        self.team = team
+        self.opponent = opponent
+        self.league_id = league_id
+        self.date_from = date_from
+        self.date_to = date_to
+        self.min_stats = {stat: value for stat, value in (min_stats or {}).items() if value is not None}
+
+        unknown = set(self.min_stats) - set(FILTER_STATS)
+        if unknown:
+            raise ValueError(f"지원하지 않는 기록 조건입니다: {', '.join(sorted(unknown))}")
+
+    def is_empty(self):
+        return (self.player_id is None and self.team is None and self.opponent is None
+                and self.league_id is None and self.date_from is None and self.date_to is None
+                and not self.min_stats)
+
+def build_game_log_query(filters, cursor=None, limit=PAGE_SIZE):
+    """검색 조건을 파라미터 바인딩 SQL로 변환 (최근 경기부터, 키셋 페이지)
+
+    cursor는 이전 페이지 마지막 행의 (경기날짜, row_id)다. OFFSET 대신
+    (game_date, rowid) 범위 조건으로 다음 페이지를 찾으므로 뒤 페이지도 앞 페이지만큼 빠르다.
+    반환값: (sql, params)
+    """
+    joins, where, params = [], [], []
+    index = _driving_index(filters)
+
+    if filters.league_id is not None:
+        joins.append('''JOIN game_league gl ON gl.game_date = ps.game_date
+            AND (gl.team1 = ps.team OR gl.team2 = ps.team)''')
+        where.append('gl.league_id = ?')
+        params.append(filters.league_id)
+    if filters.player_id is not None:
+        where.append('ps.player_id = ?')
+        params.append(filters.player_id)
+    if filters.team is not None:
+        where.append('ps.team = ?')
+        params.append(filters.team)
+    if filters.opponent is not None:
+        where.append('ts.opponent = ?')
+        params.append(filters.opponent)
+    if filters.date_from is not None:
+        where.append('ps.game_date >= ?')
+        params.append(str(filters.date_from))
+    if filters.date_to is not None:
+        where.append('ps.game_date <= ?')
+        params.append(str(filters.date_to))
+    for stat, value in filters.min_stats.items():
+        # 컬럼명은 FILTER_STATS에 있는 것만 들어오므로 SQL에 직접 넣어도 안전
+        where.append(f'ps.{stat} >= ?')
+        params.append(value)
+    if cursor is not None:
+        where.append('(ps.game_date, ps.rowid) < (?, ?)')
+        params.extend([cursor[0], int(cursor[1])])
+
+    query = f'''
+    SELECT
+        ps.rowid as row_id,
+        ps.game_date as 경기날짜,
+        ps.player as 선수명,
+        ps.team as 팀명,
+        ts.opponent as 상대팀,
+        CASE WHEN ts.total_score > os.total_score THEN '승'
+             WHEN ts.total_score < os.total_score THEN '패' ELSE '무' END as 결과,
+        ts.total_score || ' - ' || os.total_score as 점수,
+        ps.seconds_played as 출전시간,
+        {', '.join(f'ps.{stat} as "{label}"' for stat, label in FILTER_STATS.items())}
+    FROM player_stats ps {f'INDEXED BY {index}' if index else ''}
+    JOIN team_stats ts ON ts.game_date = ps.game_date AND ts.team = ps.team
+    LEFT JOIN team_stats os ON os.game_date = ts.game_date AND os.team = ts.opponent
+    {' '.join(joins)}
+    {'WHERE ' + ' AND '.join(where) if where else ''}
+    ORDER BY ps.game_date DESC, ps.rowid DESC
+    LIMIT ?
+    '''
+    params.append(int(limit))
+    return query, tuple(params)
+
+def explain_game_log_query(conn, query, params):
+    """쿼리 실행 계획 (EXPLAIN QUERY PLAN의 detail 목록)"""
+    return [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + query, params).fetchall()]
+
+def full_scans(plan):
+    """실행 계획에서 검색 조건 없이 전체를 읽는 테이블 별칭 목록 (인덱스 순서로 훑는 SCAN 포함)"""
+    scans = []
+    for detail in plan:
+        words = detail.split()
+        if len(words) >= 2 and words[0] == 'SCAN' and words[1] in _SCAN_GUARDED:
+            scans.append(words[1])
+    return scans
+
+def _driving_index(filters):
+    """기록 조건 말고 범위를 좁힐 조건이 없을 때 강제로 쓸 (기록, 날짜) 인덱스
+
+    통계 정보가 없으면 SQLite는 정렬을 피하려고 날짜 순서로 전체를 훑는 계획을 고르므로,
+    인덱스가 있는 기록 조건이 유일한 조건이면 INDEXED BY로 그 인덱스를 지정한다.
+    """
+    narrowed = (filters.player_id, filters.team, filters.opponent, filters.league_id,
+                filters.date_from, filters.date_to)
+    if any(value is not None for value in narrowed):
+        return None
+    for stat in INDEXED_STATS:
+        if stat in filters.min_stats:
+            return f'idx_player_stats_{stat}'
+    return None
+
+def search_game_log(filters, cursor=None, limit=PAGE_SIZE):
+    """조건에 맞는 선수 경기 기록 한 페이지와 다음 페이지 cursor (마지막 페이지면 None)
+
+    player_stats가 FULL_SCAN_ROW_LIMIT행보다 크면 실행 계획을 먼저 확인해
+    인덱스를 쓰지 못하는 조건 조합은 ValueError로 거부한다.
+    """
+    if filters.is_empty():
+        raise ValueError("검색 조건을 하나 이상 지정하세요.")
+    query, params = build_game_log_query(filters, cursor, limit + 1)
+
+    def _search():
+        with get_read_connection() as conn:
+            total = conn.execute('SELECT MAX(rowid) FROM player_stats').fetchone()[0] or 0
+            if total > FULL_SCAN_ROW_LIMIT:
+                scans = full_scans(explain_game_log_query(conn, query, params))
+                if scans:
+                    raise ValueError(
+                        f"인덱스를 쓸 수 없는 검색 조건입니다 (전체 스캔: {', '.join(scans)}). "
+                        f"선수, 팀, 상대팀, 리그, 기간 또는 {', '.join(FILTER_STATS[s] for s in INDEXED_STATS)} "
+                        f"조건을 추가하세요.")
+            return read_frame(query, conn, params=params, label='search_game_log', compact=False)
+
+    rows = execute_with_retry(_search)
+    rows['출전시간'] = rows['출전시간'].map(format_seconds)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows.iloc[:limit]
+        last = rows.iloc[-1]
+        next_cursor = (last['경기날짜'], int(last['row_id']))
+    return rows, next_cursor
+
+def get_filter_options():
+    """검색 조건 선택지 (팀 목록, 팀별 선수 목록)"""
+    def _get_options():
+        with get_read_connection() as conn:
+            teams = [row[0] for row in conn.execute('SELECT DISTINCT team FROM team_stats ORDER BY team')]
+            players = read_frame('SELECT player_id, player_name, team FROM players ORDER BY team, player_name',
+                                 conn, label='get_filter_options', compact=False)
+        return teams, players
+
+    return execute_with_retry(_get_options)
@@ -0,0 +1,153 @@
+import threading
+import numpy as np
+import pandas as pd
+from database import get_read_connection, execute_with_retry, get_data_version
+
+_cache = {}  # league_id -> HeadToHead
+_lock = threading.Lock()
+
+class HeadToHead:
+    """리그 한 개의 팀 x 팀 상대 전적 행렬
+
+    wins[i, j]는 i팀이 j팀에게 이긴 횟수, games[i, j]는 맞대결 수,
+    margin[i, j]는 맞대결 득실차 합계(i팀 기준)다.
+    """
+
+    def __init__(self, league_id, version, games_df):
+        self.league_id = league_id
+        self.version = version
+
+        # 경기마다 (홈, 원정) 팀 번호와 득실차
+        codes, uniques = pd.factorize(pd.concat([games_df['team1'], games_df['team2']], ignore_index=True),
+                                      sort=True)
+        n_games = len(games_df)
+        self.teams = [str(t) for t in uniques]
+        self.index = {team: i for i, team in enumerate(self.teams)}
+        self.game_dates = games_df['game_date'].astype(str).to_numpy()
+        self.home = codes[:n_games]
+        self.away = codes[n_games:]
+        self.diff = (games_df['score1'].to_numpy(dtype=float) - games_df['score2'].to_numpy(dtype=float))
+
+        self.wins, self.games, self.margin = self._build(np.ones(n_games, dtype=bool))
+
+    def _build(self, mask):
+        """mask에 해당하는 경기만으로 행렬 세 개를 한 번에 누적"""
+        n = len(self.teams)
+        home, away, diff = self.home[mask], self.away[mask], self.diff[mask]
+        wins = np.zeros((n, n), dtype=int)
+        games = np.zeros((n, n), dtype=int)
+        margin = np.zeros((n, n))
+        np.add.at(wins, (home, away), diff > 0)
+        np.add.at(wins, (away, home), diff < 0)
+        np.add.at(games, (home, away), 1)
+        np.add.at(games, (away, home), 1)
+        np.add.at(margin, (home, away), diff)
+        np.add.at(margin, (away, home), -diff)
+        return wins, games, margin
+
+    def matrices(self, as_of=None):
+        """(wins, games, margin) 행렬 (as_of가 있으면 그 날짜까지의 경기만)"""
+        if as_of is None:
+            return self.wins, self.games, self.margin
+        return self._build(self.game_dates <= as_of)
+
+    def to_frame(self, teams=None, as_of=None):
+        """히트맵용 행렬 DataFrame (경기당 득실차, 전적 문자열)"""
+        wins, games, margin = self.matrices(as_of)
+        teams = [t for t in (teams or self.teams) if t in self.index]
+        idx = [self.index[t] for t in teams]
+        games = games[np.ix_(idx, idx)]
+        wins = wins[np.ix_(idx, idx)]
+        losses = wins.T
+        avg_margin = np.full(games.shape, np.nan)
+        np.divide(margin[np.ix_(idx, idx)], games, out=avg_margin, where=games > 0)
+        records = np.where(games > 0, np.char.add(np.char.add(wins.astype(str), '-'), losses.astype(str)), '')
+        return (pd.DataFrame(avg_margin, index=teams, columns=teams),
+                pd.DataFrame(records, index=teams, columns=teams))
+
+    def order_tied(self, teams, overall_margin, as_of=None):
+        """동률 팀 순서 결정: 맞대결 승률 → 맞대결 득실차 → 전체 득실차
+
+        단계마다 동률 그룹이 나뉘면, 아직 같은 그룹끼리는 그 팀들끼리의
+        맞대결로 처음 단계부터 다시 비교한다.
+        """
+        wins, games, margin = self.matrices(as_of)
+        return self._order(list(teams), overall_margin, wins, games, margin)
+
+    def _order(self, teams, overall_margin, wins, games, margin):
+        if len(teams) <= 1:
+            return teams
+        idx = np.array([self.index.get(t, -1) for t in teams])
+        known = idx >= 0
+        sub = np.ix_(idx[known], idx[known])
+
+        # 동률 팀끼리의 맞대결만 집계 (상대 전적이 없는 팀은 0)
+        h2h_games = games[sub].sum(axis=1)
+        pct = np.zeros(len(h2h_games))
+        np.divide(wins[sub].sum(axis=1), h2h_games, out=pct, where=h2h_games > 0)
+        h2h_pct = np.zeros(len(teams))
+        h2h_pct[known] = pct
+        h2h_margin = np.zeros(len(teams))
+        h2h_margin[known] = margin[sub].sum(axis=1)
+        overall = np.array([overall_margin.get(t, 0.0) for t in teams], dtype=float)
+
+        for key in (h2h_pct, h2h_margin, overall):
+            values = np.round(key, 6)
+            distinct = np.unique(values)[::-1]
+            if len(distinct) > 1:
+                ordered = []
+                for value in distinct:
+                    group = [t for t, v in zip(teams, values) if v == value]
+                    ordered += self._order(group, overall_margin, wins, games, margin)
+                return ordered
+        return teams
+
+def _load_games(league_id):
+    """리그 경기별 (날짜, 홈팀, 원정팀, 점수) 조회"""
+    def _get_games():
+        with get_read_connection() as conn:
+            query = '''
+            SELECT gl.game_date, gl.team1, gl.team2,
+                   ts1.total_score as score1, ts2.total_score as score2
+            FROM game_league gl
+            JOIN team_stats ts1 ON gl.game_date = ts1.game_date AND gl.team1 = ts1.team
+            JOIN team_stats ts2 ON gl.game_date = ts2.game_date AND gl.team2 = ts2.team
+            WHERE gl.league_id = ?
+            '''
+            return pd.read_sql_query(query, conn, params=(league_id,))
+
+    return execute_with_retry(_get_games)
+
+def get_head_to_head(league_id):
+    """리그 상대 전적 행렬 조회 (데이터 버전이 바뀌었을 때만 다시 계산)"""
+    version = get_data_version(league_id)
+    with _lock:
+        cached = _cache.get(league_id)
+        if cached is not None and cached.version == version:
+            return cached
+
+    h2h = HeadToHead(league_id, version, _load_games(league_id))
+    with _lock:
+        _cache[league_id] = h2h
+    return h2h
+
+def apply_tiebreakers(standings_df, h2h, as_of=None):
+    """승률이 같은 팀들을 상대 전적 기준으로 다시 정렬하고 순위 재부여
+
+    standings_df는 팀명 / 승률 / 득실차 컬럼을 가진 순위표다.
+    """
+    if standings_df.empty:
+        return standings_df
+    df = standings_df.copy()
+    df['팀명'] = df['팀명'].astype(str)
+    overall_margin = dict(zip(df['팀명'], df['득실차'].astype(float)))
+
+    ordered = []
+    win_pct = df['승률'].astype(float).round(6)
+    for value in sorted(win_pct.unique(), reverse=True):
+        tied = df.loc[win_pct == value, '팀명'].tolist()
+        ordered += h2h.order_tied(tied, overall_margin, as_of) if len(tied) > 1 else tied
+
+    df = df.set_index('팀명').loc[ordered].reset_index()
+    df['순위'] = np.arange(1, len(df) + 1)
+    return df[standings_df.columns]
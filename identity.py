@@ -0,0 +1,224 @@
+import re
+import threading
+import unicodedata
+
+# 새 선수로 저장하되 기존 선수와 같은 사람일 수 있다고 기록하는 유사도
+# (자동 연결은 정규화 이름이 같을 때만 한다. 한 글자 차이 이름도 bigram 유사도가 0.8까지 나와
+#  다른 선수를 합칠 수 있으므로 나머지는 모두 확인 후보로 남김)
+SUGGEST_THRESHOLD = 0.5
+
+# 이름 비교에 쓰는 문자 n-gram 길이
+NGRAM_SIZE = 2
+
+_NAME_NOISE = re.compile(r"[\s\.\-_'`·,()]+")
+_DIGITS = re.compile(r"\d+")
+
+_index = None
+_lock = threading.Lock()
+
+def normalize_name(name):
+    """선수 이름 정규화 (전각/반각 통일, 소문자, 공백과 구두점 제거)"""
+    return _NAME_NOISE.sub('', unicodedata.normalize('NFKC', str(name)).lower())
+
+def name_ngrams(normalized):
+    """양 끝 표시를 붙인 문자 n-gram 집합"""
+    padded = f"^{normalized}$"
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+def name_digits(normalized):
+    """이름에 들어 있는 숫자 (숫자가 다르면 다른 선수로 봄)"""
+    return tuple(_DIGITS.findall(normalized))
+
+def ngram_similarity(a, b):
+    """n-gram 집합 두 개의 Dice 계수 (0~1)"""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+class PlayerIdentityIndex:
+    """팀별 선수 이름 색인 (정규화 이름 → id, n-gram → id 목록)
+
+    선수 id는 (이름, 팀) 단위이므로 같은 팀 안에서만 후보를 찾는다.
+    팀 로스터 크기만큼만 비교하므로 행마다 거의 상수 시간이다.
+    """
+
+    def __init__(self, db_path, max_player_id):
+        self.db_path = db_path
+        self.max_player_id = max_player_id
+        self.exact = {}  # (팀, 정규화 이름) -> player_id
+        self.grams = {}  # (팀, n-gram) -> {player_id}
+        self.names = {}  # player_id -> (이름, n-gram 집합, 숫자)
+
+    def add(self, player_id, name, team, canonical=True):
+        """선수 이름(또는 별칭)을 색인에 추가"""
+        normalized = normalize_name(name)
+        self.exact.setdefault((team, normalized), player_id)
+        grams = name_ngrams(normalized)
+        for gram in grams:
+            self.grams.setdefault((team, gram), set()).add(player_id)
+        if canonical:
+            self.names[player_id] = (name, grams, name_digits(normalized))
+            self.max_player_id = max(self.max_player_id, player_id)
+
+    def exact_match(self, name, team, exclude=()):
+        """같은 팀에서 정규화 이름(또는 연결된 별칭)이 같은 선수 id, 없으면 None"""
+        player_id = self.exact.get((team, normalize_name(name)))
+        return player_id if player_id not in exclude else None
+
+    def best_match(self, name, team, exclude=()):
+        """같은 팀에서 가장 비슷한 기존 선수 (player_id, 유사도), 후보가 없으면 (None, 0)
+
+        exclude에는 같은 경기에 이미 나온 선수 id를 넘긴다 (한 경기에 같은 선수가 두 번 나올 수 없음).
+        """
+        player_id = self.exact_match(name, team, exclude)
+        if player_id is not None:
+            return player_id, 1.0
+
+        normalized = normalize_name(name)
+        grams = name_ngrams(normalized)
+        digits = name_digits(normalized)
+        candidates = set()
+        for gram in grams:
+            candidates |= self.grams.get((team, gram), set())
+        best_id, best_score = None, 0.0
+        for candidate in sorted(candidates - set(exclude)):
+            _, candidate_grams, candidate_digits = self.names[candidate]
+            if candidate_digits != digits:
+                continue
+            score = ngram_similarity(grams, candidate_grams)
+            if score > best_score:
+                best_id, best_score = candidate, score
+        return best_id, best_score
+
+def _build_index(conn, db_path, max_player_id):
+    index = PlayerIdentityIndex(db_path, max_player_id or 0)
+    for player_id, name, team in conn.execute('SELECT player_id, player_name, team FROM players'):
+        index.add(player_id, name, team)
+    for alias, team, player_id in conn.execute(
+            "SELECT alias, team, player_id FROM player_aliases WHERE status = 'linked'"):
+        index.add(player_id, alias, team, canonical=False)
+    return index
+
+def get_identity_index(conn):
+    """선수 이름 색인 조회 (다른 연결에서 선수가 추가되었거나 DB가 바뀌었으면 다시 생성)"""
+    global _index
+    from database import DB_PATH
+
+    max_player_id = conn.execute('SELECT MAX(player_id) FROM players').fetchone()[0] or 0
+    with _lock:
+        if _index is None or _index.db_path != DB_PATH or _index.max_player_id != max_player_id:
+            _index = _build_index(conn, DB_PATH, max_player_id)
+        return _index
+
+def _record_alias(conn, alias, team, player_id, score, status):
+    conn.execute('''INSERT OR REPLACE INTO player_aliases (alias, team, player_id, score, status)
+                    VALUES (?, ?, ?, ?, ?)''', (alias, team, player_id, score, status))
+
+def resolve_player(conn, index, player_name, team, player_number, exclude=()):
+    """업로드된 선수 이름을 기존 선수에 연결하거나 새 선수로 등록 (주어진 쓰기 연결 사용)
+
+    정규화 이름이 같으면 기존 선수로 자동 연결하고, 비슷하기만 한 이름은 새 선수로 저장한 뒤
+    'suggested' 후보로 남긴다.
+    반환값: (player_id, 저장에 쓸 선수 이름). 자동 연결되면 기존 선수 이름을 돌려주므로
+    이름 기준 집계도 한 선수로 모인다.
+    """
+    from database import _get_or_create_player
+
+    row = conn.execute('SELECT player_id FROM players WHERE player_name = ? AND team = ?',
+                       (player_name, team)).fetchone()
+    if row is not None:
+        return row[0], player_name
+
+    player_id = index.exact_match(player_name, team, exclude)
+    if player_id is not None:
+        canonical = index.names[player_id][0]
+        _record_alias(conn, player_name, team, player_id, 1.0, 'linked')
+        index.add(player_id, player_name, team, canonical=False)
+        print(f"선수 이름 연결: {player_name} → {canonical} ({team})")
+        return player_id, canonical
+
+    player_id, score = index.best_match(player_name, team, exclude)
+    new_id = _get_or_create_player(conn, player_name, team, player_number)
+    index.add(new_id, player_name, team)
+    if player_id is not None and score >= SUGGEST_THRESHOLD:
+        # 새 선수로 저장하고 같은 사람일 수 있는 선수를 후보로 기록 (link_alias로 확정)
+        _record_alias(conn, player_name, team, player_id, score, 'suggested')
+    return new_id, player_name
+
+def get_alias_suggestions():
+    """확인이 필요한 선수 이름 후보 목록 (새 선수로 저장된 이름, 비슷한 기존 선수)"""
+    from database import get_read_connection, execute_with_retry, read_frame
+
+    def _get_suggestions():
+        with get_read_connection() as conn:
+            query = '''
+            SELECT a.alias as 이름, a.team as 팀, p.player_name as 비슷한선수,
+                   ROUND(a.score, 2) as 유사도, a.player_id
+            FROM player_aliases a
+            JOIN players p ON a.player_id = p.player_id
+            WHERE a.status = 'suggested'
+            ORDER BY a.score DESC
+            '''
+            return read_frame(query, conn, label='get_alias_suggestions', compact=False)
+
+    return execute_with_retry(_get_suggestions)
+
+def link_alias(alias, team, player_id):
+    """새 선수로 저장된 이름(alias)을 기존 선수(player_id)로 합침
+
+    경기 기록의 선수 id와 이름, 통산 기록 테이블을 함께 옮긴다.
+    두 선수가 같은 경기에 함께 나온 적이 있으면 다른 선수이므로 합치지 않는다.
+    반환값: (합쳤는지 여부, 메시지)
+    """
+    global _index
+    from database import run_write, _bump_data_version, _rebuild_career_splits
+    from records import rebuild_career_highs
+
+    def _link(conn):
+        row = conn.execute('SELECT player_id FROM players WHERE player_name = ? AND team = ?',
+                           (alias, team)).fetchone()
+        canonical = conn.execute('SELECT player_name FROM players WHERE player_id = ?', (player_id,)).fetchone()
+        if canonical is None:
+            return False, "합칠 선수를 찾을 수 없습니다."
+        if row is not None and row[0] != player_id:
+            shared = conn.execute('''SELECT COUNT(*) FROM player_stats a
+                                     JOIN player_stats b ON a.game_date = b.game_date AND a.team = b.team
+                                     WHERE a.player_id = ? AND b.player_id = ?''', (row[0], player_id)).fetchone()[0]
+            if shared:
+                return False, f"{alias}, {canonical[0]} 선수는 같은 경기에 함께 출전한 기록({shared}경기)이 있어 합칠 수 없습니다."
+            league_ids = [r[0] for r in conn.execute('''
+                SELECT DISTINCT gl.league_id FROM player_stats ps
+                JOIN game_league gl ON ps.game_date = gl.game_date
+                    AND (ps.team = gl.team1 OR ps.team = gl.team2)
+                WHERE ps.player_id = ?''', (row[0],))]
+            conn.execute('UPDATE player_stats SET player_id = ?, player = ? WHERE player_id = ?',
+                         (player_id, canonical[0], row[0]))
+            conn.execute('DELETE FROM players WHERE player_id = ?', (row[0],))
+            # 합쳐진 선수를 가리키던 이름 후보도 합친 선수로 옮김
+            conn.execute('UPDATE player_aliases SET player_id = ? WHERE player_id = ?', (player_id, row[0]))
+            conn.execute('UPDATE player_advanced_stats SET player = ? WHERE player = ? AND team = ?',
+                         (canonical[0], alias, team))
+            _rebuild_career_splits(conn, (row[0], player_id))
+            conn.execute('UPDATE player_game_records SET player_id = ?, player = ? WHERE player_id = ?',
+                         (player_id, canonical[0], row[0]))
+            rebuild_career_highs(conn, (row[0], player_id))
+            for league_id in league_ids:
+                _bump_data_version(conn, league_id)
+        _record_alias(conn, alias, team, player_id, 1.0, 'linked')
+        _bump_data_version(conn)
+        return True, f"{alias}을(를) {canonical[0]}(으)로 합쳤습니다."
+
+    result = run_write(_link)
+    with _lock:
+        _index = None
+    return result
+
+def dismiss_alias(alias, team):
+    """같은 선수가 아닌 이름 후보를 확인 목록에서 제외 (status: dismissed)"""
+    from database import run_write
+
+    def _dismiss(conn):
+        conn.execute("""UPDATE player_aliases SET status = 'dismissed'
+                        WHERE alias = ? AND team = ? AND status = 'suggested'""", (alias, team))
+
+    run_write(_dismiss)
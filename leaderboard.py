@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+from database import (get_db_connection, get_read_connection, execute_with_retry, run_write,
+                      get_data_version, read_frame, get_derived_version, set_derived_version,
+                      PLAYER_SEASON_QUERY, RANKING_STATS, RATE_STATS)
+
+# 파생 데이터 이름 (derived_versions 테이블 키)
+DERIVED_NAME = 'leaderboard'
+
+# 순위 방식 (경기당 평균 / 시즌 총합)
+BASES = ('avg', 'total')
+
+# 순위표 표시 컬럼 (표시 이름: 기록)
+DISPLAY_STATS = {
+    '득점': 'points',
+    '리바운드': 'rebounds',
+    '어시스트': 'assists',
+    '스틸': 'steals',
+    '블록': 'blocks',
+    '3점슛': 'three_points',
+    '자유투': 'free_throws',
+    '효율값': 'efficiency'
+}
+
+def _value_column(stat, basis):
+    """기록과 순위 방식에 해당하는 player_season_stats 컬럼"""
+    if stat in RATE_STATS:
+        return f'avg_{stat}'
+    return f'{basis}_{stat}'
+
+def compute_ranks(season_df):
+    """모든 기록 x 순위 방식의 순위를 한 번에 계산해 (stat, basis, rank, 행 번호) 테이블로 반환"""
+    frames = []
+    for stat in RANKING_STATS:
+        for basis in BASES:
+            values = season_df[_value_column(stat, basis)].to_numpy(dtype=float)
+            # 값이 없는 선수는 맨 뒤로, 같은 값은 먼저 집계된 순서대로
+            order = np.lexsort((np.arange(len(values)), -np.nan_to_num(values, nan=-np.inf), np.isnan(values)))
+            frames.append(pd.DataFrame({
+                'stat': stat,
+                'basis': basis,
+                'rank': np.arange(1, len(order) + 1),
+                'row': order,
+                'value': values[order]
+            }))
+    if not frames:
+        return pd.DataFrame(columns=['stat', 'basis', 'rank', 'row', 'value'])
+    return pd.concat(frames, ignore_index=True)
+
+def build_leaderboard(league_id):
+    """리그의 선수 시즌 기록을 한 번 집계하고 모든 기록의 순위표를 저장"""
+    version = get_data_version(league_id)
+
+    def _load():
+        with get_db_connection() as conn:
+            return pd.read_sql_query(PLAYER_SEASON_QUERY, conn, params=(league_id,))
+
+    season_df = execute_with_retry(_load)
+    ranks = compute_ranks(season_df)
+    ranks['player'] = season_df['player'].to_numpy()[ranks['row']]
+    ranks['team'] = season_df['team'].to_numpy()[ranks['row']]
+
+    season_rows = season_df.astype(object).where(season_df.notna(), None)
+    rank_rows = ranks[['stat', 'basis', 'rank', 'player', 'team', 'value']]
+    rank_rows = rank_rows.astype(object).where(rank_rows.notna(), None)
+
+    def _write(conn):
+        conn.execute('DELETE FROM player_season_stats WHERE league_id = ?', (league_id,))
+        conn.execute('DELETE FROM player_leaderboard WHERE league_id = ?', (league_id,))
+        conn.executemany(
+            f'''INSERT INTO player_season_stats (league_id, {', '.join(season_df.columns)})
+                VALUES (?, {', '.join(['?'] * len(season_df.columns))})''',
+            ((league_id, *row) for row in season_rows.itertuples(index=False, name=None)))
+        conn.executemany(
+            '''INSERT INTO player_leaderboard (league_id, stat, basis, rank, player, team, value)
+               VALUES (?, ?, ?, ?, ?, ?, ?)''',
+            ((league_id, *row) for row in rank_rows.itertuples(index=False, name=None)))
+        set_derived_version(conn, DERIVED_NAME, league_id, version)
+
+    run_write(_write)
+    print(f"리그 {league_id} 순위표 갱신: 선수 {len(season_df)}명, 순위 {len(ranks)}행")
+
+def ensure_leaderboard(league_id):
+    """저장된 순위표가 현재 데이터 버전보다 오래되었으면 다시 계산"""
+    if get_derived_version(DERIVED_NAME, league_id) != get_data_version(league_id):
+        build_leaderboard(league_id)
+
+def _format_avg_total(avg, total):
+    """'평균 (총합)' 형식 문자열"""
+    if pd.isna(avg):
+        return None
+    return f"{avg:.1f} ({float(total):g})"
+
+def get_leaderboard(league_id, stat, basis='avg', limit=20, offset=0):
+    """순위표에서 (기록, 순위 방식) 기준 top-K 조회 (offset부터 limit명)"""
+    if stat not in RANKING_STATS:
+        raise ValueError(f"지원하지 않는 순위 기준입니다: {stat}")
+    if basis not in BASES:
+        raise ValueError(f"지원하지 않는 순위 방식입니다: {basis}")
+    if stat in RATE_STATS:
+        basis = 'avg'
+    ensure_leaderboard(league_id)
+
+    def _get_rows():
+        with get_read_connection() as conn:
+            query = '''
+            SELECT lb.rank, pss.*
+            FROM player_leaderboard lb
+            JOIN player_season_stats pss ON pss.league_id = lb.league_id
+                AND pss.player = lb.player AND pss.team = lb.team
+            WHERE lb.league_id = ? AND lb.stat = ? AND lb.basis = ?
+            ORDER BY lb.rank
+            LIMIT ? OFFSET ?
+            '''
+            return read_frame(query, conn, params=(league_id, stat, basis, limit, offset), label='get_leaderboard')
+
+    rows = execute_with_retry(_get_rows)
+
+    # 화면 표시용 컬럼 구성 (get_player_rankings와 같은 형식)
+    result = pd.DataFrame({
+        '순위': rows['rank'],
+        '선수명': rows['player'],
+        '팀명': rows['team'],
+        '경기수': rows['games_played'],
+        '출전시간': rows['avg_minutes'].map(lambda m: None if pd.isna(m) else f"{m:.1f}분")
+    })
+    for label, column in DISPLAY_STATS.items():
+        result[label] = [_format_avg_total(a, t) for a, t in zip(rows[f'avg_{column}'], rows[f'total_{column}'])]
+    result['TS%'] = rows['avg_true_shooting'].round(1)
+    result['eFG%'] = rows['avg_effective_fg'].round(1)
+    result['USG%'] = rows['avg_usage_rate'].round(1)
+    return result
+
+def count_leaderboard_players(league_id):
+    """순위표에 오른 선수 수"""
+    ensure_leaderboard(league_id)
+
+    def _count():
+        with get_read_connection() as conn:
+            row = conn.execute('SELECT COUNT(*) FROM player_season_stats WHERE league_id = ?',
+                               (league_id,)).fetchone()
+            return row[0]
+
+    return execute_with_retry(_count)
@@ -0,0 +1,99 @@
+import threading
+import numpy as np
+import pandas as pd
+from database import get_data_version
+from snapshot import open_league_snapshot
+
+# 백분위를 계산할 경기당 기록 (컬럼명: 표시 이름)
+PERCENTILE_STATS = {
+    'points': '득점',
+    'rebounds': '리바운드',
+    'assists': '어시스트',
+    'steals': '스틸',
+    'blocks': '블록',
+    'turnovers': '턴오버',
+    'three_points_made': '3점슛',
+    'free_throws_made': '자유투',
+    'efficiency': '효율값'
+}
+
+# 낮을수록 좋은 기록 (백분위를 뒤집어서 계산)
+LOWER_IS_BETTER = {'turnovers'}
+
+_cache = {}  # league_id -> LeaguePercentiles
+_lock = threading.Lock()
+
+def _percentile_ranks(values, sorted_values):
+    """정렬된 분포 기준 백분위 (동점은 중간 순위) 계산"""
+    n = len(sorted_values)
+    if n == 0:
+        return np.zeros(len(values))
+    lo = np.searchsorted(sorted_values, values, side='left')
+    hi = np.searchsorted(sorted_values, values, side='right')
+    return (lo + (hi - lo) / 2) / n * 100
+
+class LeaguePercentiles:
+    """리그 한 개의 선수별 경기당 기록 백분위 테이블"""
+
+    def __init__(self, league_id, version, games_df):
+        self.league_id = league_id
+        self.version = version
+        self.stats = list(PERCENTILE_STATS.keys())
+
+        # (선수, 팀) 단위로 묶어 경기당 평균 계산
+        keys = pd.MultiIndex.from_frame(games_df[['player', 'team']])
+        codes, uniques = pd.factorize(keys)
+        n_players = len(uniques)
+        values = games_df[self.stats].to_numpy(dtype=float)
+        counts = np.bincount(codes, minlength=n_players).astype(float)
+        sums = np.zeros((n_players, len(self.stats)))
+        np.add.at(sums, codes, values)
+        self.averages = sums / np.maximum(counts, 1)[:, None]
+        self.games_played = counts.astype(int)
+        self.index = {key: i for i, key in enumerate(uniques)}
+
+        # 스탯별 분포 정렬 (선수 평균 / 개별 경기 기록)
+        self.sorted_averages = np.sort(self.averages, axis=0)
+        self.sorted_games = np.sort(values, axis=0)
+
+        self.percentiles = np.empty_like(self.averages)
+        for j, stat in enumerate(self.stats):
+            pct = _percentile_ranks(self.averages[:, j], self.sorted_averages[:, j])
+            self.percentiles[:, j] = 100 - pct if stat in LOWER_IS_BETTER else pct
+
+    def player_percentiles(self, player, team):
+        """선수의 스탯별 백분위 조회 (O(1))"""
+        i = self.index.get((player, team))
+        if i is None:
+            return None
+        return dict(zip(self.stats, self.percentiles[i]))
+
+    def game_percentiles(self, game_stats):
+        """한 경기 기록이 리그 전체 경기 기록 중 몇 백분위인지 계산"""
+        result = {}
+        for j, stat in enumerate(self.stats):
+            if stat not in game_stats:
+                continue
+            pct = _percentile_ranks(np.array([float(game_stats[stat])]), self.sorted_games[:, j])[0]
+            result[stat] = 100 - pct if stat in LOWER_IS_BETTER else pct
+        return result
+
+def get_league_percentiles(league_id):
+    """리그 백분위 테이블 조회 (데이터 버전이 바뀌었을 때만 다시 계산)"""
+    version = get_data_version(league_id)
+    with _lock:
+        cached = _cache.get(league_id)
+        if cached is not None and cached.version == version:
+            return cached
+
+    # 리그 컬럼 스냅샷(memmap)에서 필요한 컬럼만 읽음
+    snapshot = open_league_snapshot(league_id)
+    games_df = snapshot.to_frame(['player', 'team'] + list(PERCENTILE_STATS))
+    percentiles = LeaguePercentiles(league_id, snapshot.version, games_df)
+    with _lock:
+        _cache[league_id] = percentiles
+    return percentiles
+
+def to_radar_stats(percentiles, stats=('points', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers')):
+    """백분위 딕셔너리를 레이더 차트 입력(표시 이름: 값)으로 변환"""
+    return {PERCENTILE_STATS[s]: round(float(percentiles.get(s, 0)), 1) for s in stats}
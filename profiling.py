@@ -0,0 +1,376 @@
+import os
+import sys
+import time
+import sqlite3
+import logging
+import threading
+import cProfile
+from contextlib import contextmanager
+from datetime import datetime
+from collections import deque
+from logging.handlers import RotatingFileHandler
+import pandas as pd
+
+# 쿼리 프로파일링 사용 여부 (기본 끔, NAVOTO_QUERY_PROFILE=1이거나 ?debug=1이면 켬)
+QUERY_PROFILE_ENABLED = os.environ.get('NAVOTO_QUERY_PROFILE', '0') == '1'
+
+# 이 시간(ms)을 넘는 쿼리는 실행 계획과 함께 느린 쿼리 로그에 기록
+SLOW_QUERY_MS = float(os.environ.get('NAVOTO_SLOW_QUERY_MS', '100'))
+
+# 느린 쿼리 로그 파일 (크기 기준 순환)
+SLOW_QUERY_LOG_PATH = os.path.join('./data', 'logs', 'slow_queries.log')
+SLOW_QUERY_LOG_MAX_BYTES = 1_000_000
+SLOW_QUERY_LOG_BACKUPS = 3
+
+# 메모리에 보관할 최근 쿼리 기록 수
+QUERY_HISTORY_SIZE = 5000
+SLOW_QUERY_HISTORY_SIZE = 200
+
+# 호출 위치를 찾을 때 건너뛸 모듈 (프로파일러, sqlite3, pandas 내부)
+_SKIP_PATHS = (os.path.abspath(__file__), os.path.dirname(sqlite3.__file__), os.path.dirname(pd.__file__))
+
+# 호출 위치로 치지 않을 공용 조회 헬퍼 함수
+_SKIP_FUNCTIONS = {'read_frame', 'get_db_connection', 'get_read_connection'}
+
+_records = deque(maxlen=QUERY_HISTORY_SIZE)
+_slow_queries = deque(maxlen=SLOW_QUERY_HISTORY_SIZE)
+_lock = threading.Lock()
+_slow_logger = None
+_listeners = []
+
+def _normalize_sql(sql):
+    """공백을 정리한 쿼리 문자열 (집계 키)"""
+    return ' '.join(sql.split())
+
+def _find_caller():
+    """프로파일러/sqlite3/pandas 밖의 첫 호출 함수 ('파일:함수')"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if (not path.startswith(_SKIP_PATHS) and not path.startswith('<')
+                and frame.f_code.co_name not in _SKIP_FUNCTIONS):
+            name = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name).replace('.<locals>', '')
+            return f"{os.path.basename(path)}:{name}"
+        frame = frame.f_back
+    return 'unknown'
+
+def _get_slow_logger():
+    global _slow_logger
+    if _slow_logger is None:
+        os.makedirs(os.path.dirname(SLOW_QUERY_LOG_PATH), exist_ok=True)
+        logger = logging.getLogger('navoto.slow_query')
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        if not logger.handlers:
+            handler = RotatingFileHandler(SLOW_QUERY_LOG_PATH, maxBytes=SLOW_QUERY_LOG_MAX_BYTES,
+                                          backupCount=SLOW_QUERY_LOG_BACKUPS, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            logger.addHandler(handler)
+        _slow_logger = logger
+    return _slow_logger
+
+def add_query_listener(listener):
+    """쿼리가 끝날 때마다 listener(record)를 호출하도록 등록"""
+    _listeners.append(listener)
+
+class QueryRecord:
+    """쿼리 한 번의 실행 기록 (실행 + 결과 읽기 시간 합계)"""
+    __slots__ = ('sql', 'params', 'caller', 'started_at', 'elapsed', 'rows', 'plan', 'finished')
+
+    def __init__(self, sql, params, caller):
+        self.sql = sql
+        self.params = params
+        self.caller = caller
+        self.started_at = time.time()
+        self.elapsed = 0.0
+        self.rows = 0
+        self.plan = None
+        self.finished = False
+
+def _finish_record(conn, record, rowcount=-1):
+    """쿼리 기록을 마무리 (느린 쿼리면 실행 계획 수집, listener 호출)"""
+    if record is None or record.finished:
+        return
+    record.finished = True
+    if rowcount > 0 and record.rows == 0:
+        record.rows = rowcount  # INSERT/UPDATE/DELETE 영향 행 수
+    if record.elapsed * 1000 >= SLOW_QUERY_MS:
+        _record_slow_query(conn, record)
+    for listener in _listeners:
+        listener(record)
+
+class ProfilingCursor(sqlite3.Cursor):
+    """execute와 fetch 시간을 합쳐 쿼리별로 기록하는 커서
+
+    끝까지 읽지 않은 SELECT 기록은 연결의 대기 목록에 남겨 두었다가
+    연결이 다음 쿼리를 시작하거나 닫힐 때 마무리한다.
+    """
+
+    _record = None
+
+    def _finish(self):
+        """이전 쿼리 기록을 마무리"""
+        record = self._record
+        if record is None or record.finished:
+            return
+        self.connection._pending.discard(record)
+        _finish_record(self.connection, record, self.rowcount)
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            if self._record is not None:
+                self._record.elapsed += time.perf_counter() - started
+
+    def _start(self, sql, parameters):
+        self._finish()
+        self._record = QueryRecord(sql, parameters, _find_caller())
+        with _lock:
+            _records.append(self._record)
+
+    def execute(self, sql, parameters=()):
+        self._start(sql, parameters)
+        self._timed(super().execute, sql, parameters)
+        if self.description is None:
+            self._finish()  # 결과 행이 없는 쿼리는 바로 마무리
+        else:
+            self.connection._pending.add(self._record)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._start(sql, None)
+        self._timed(super().executemany, sql, seq_of_parameters)
+        self._finish()
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        elif self._record is not None:
+            self._record.rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, self.arraysize if size is None else size)
+        if self._record is not None:
+            self._record.rows += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._record is not None:
+            self._record.rows += len(rows)
+        self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+class ProfilingConnection(sqlite3.Connection):
+    """모든 쿼리를 ProfilingCursor로 실행하는 연결 (sqlite3.connect의 factory)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = set()  # 결과를 끝까지 읽지 않은 쿼리 기록
+
+    def finish_pending(self):
+        """conn.execute(...).fetchone()처럼 끝까지 읽지 않은 쿼리 기록을 마무리"""
+        pending, self._pending = self._pending, set()
+        for record in pending:
+            _finish_record(self, record)
+
+    def cursor(self, factory=ProfilingCursor):
+        self.finish_pending()
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def __exit__(self, *exc_info):
+        self.finish_pending()
+        return super().__exit__(*exc_info)
+
+    def close(self):
+        self.finish_pending()
+        super().close()
+
+def enable_query_profiling():
+    """이후 새로 여는 연결부터 쿼리 프로파일링을 켬 (?debug=1일 때 app.py에서 호출)"""
+    global QUERY_PROFILE_ENABLED
+    QUERY_PROFILE_ENABLED = True
+
+def connection_factory():
+    """get_db_connection에서 쓸 연결 클래스 (프로파일링을 끄면 기본 연결)"""
+    return ProfilingConnection if QUERY_PROFILE_ENABLED else sqlite3.Connection
+
+def _explain(conn, record):
+    """쿼리 실행 계획 (EXPLAIN QUERY PLAN) 문자열"""
+    if record.params is None or not record.sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return None
+    try:
+        cursor = sqlite3.Cursor(conn)  # 기록하지 않는 기본 커서
+        rows = cursor.execute('EXPLAIN QUERY PLAN ' + record.sql, record.params).fetchall()
+        cursor.close()
+        return '\n'.join(f"{row[0]}|{row[1]}|{row[3]}" for row in rows)
+    except sqlite3.Error as e:
+        return f"(실행 계획 조회 실패: {e})"
+
+def _record_slow_query(conn, record):
+    """느린 쿼리를 메모리와 순환 로그 파일에 기록"""
+    record.plan = _explain(conn, record)
+    with _lock:
+        _slow_queries.append(record)
+    try:
+        _get_slow_logger().info(
+            "%.1fms rows=%d caller=%s sql=%s params=%r plan=%s",
+            record.elapsed * 1000, record.rows, record.caller, _normalize_sql(record.sql),
+            record.params, (record.plan or '').replace('\n', ' / ')
+        )
+    except OSError as e:
+        print(f"느린 쿼리 로그 기록 실패: {e}")
+
+def get_query_summary():
+    """(호출 함수, 쿼리)별 실행 횟수 / 시간 / 행 수 요약 (총 시간 내림차순)"""
+    with _lock:
+        rows = [(r.caller, _normalize_sql(r.sql), r.elapsed * 1000, r.rows) for r in _records]
+    df = pd.DataFrame(rows, columns=['caller', 'sql', 'ms', 'rows'])
+    if df.empty:
+        return pd.DataFrame(columns=['caller', 'sql', 'calls', 'total_ms', 'avg_ms', 'max_ms', 'avg_rows'])
+    summary = df.groupby(['caller', 'sql'], sort=False).agg(
+        calls=('ms', 'size'), total_ms=('ms', 'sum'), avg_ms=('ms', 'mean'),
+        max_ms=('ms', 'max'), avg_rows=('rows', 'mean')
+    ).reset_index()
+    return summary.sort_values('total_ms', ascending=False).round(2).reset_index(drop=True)
+
+def get_slow_queries():
+    """최근 느린 쿼리 목록 (실행 계획 포함)"""
+    with _lock:
+        records = list(_slow_queries)
+    return pd.DataFrame([{
+        'time': pd.Timestamp(r.started_at, unit='s'),
+        'caller': r.caller,
+        'ms': round(r.elapsed * 1000, 2),
+        'rows': r.rows,
+        'sql': _normalize_sql(r.sql),
+        'plan': r.plan
+    } for r in reversed(records)], columns=['time', 'caller', 'ms', 'rows', 'sql', 'plan'])
+
+def reset_query_stats():
+    """쿼리 기록 초기화"""
+    with _lock:
+        _records.clear()
+        _slow_queries.clear()
+
+# 화면 렌더링 프로파일 사용 여부 (?profile=1 또는 NAVOTO_RENDER_PROFILE=1)
+RENDER_PROFILE_ENABLED = os.environ.get('NAVOTO_RENDER_PROFILE', '0') == '1'
+
+# cProfile 결과 저장 경로 (?profile=cprofile 또는 NAVOTO_CPROFILE=1일 때 rerun마다 저장)
+CPROFILE_ENABLED = os.environ.get('NAVOTO_CPROFILE', '0') == '1'
+CPROFILE_DIR = os.path.join('./data', 'profiles')
+
+_render = threading.local()  # Streamlit 세션 스크립트 스레드별 현재 프로파일
+_profile_listeners = []
+
+class RenderProfile:
+    """rerun 한 번 동안의 구간(span) 기록 (페이지 / DB / 차트)"""
+
+    def __init__(self, cprofile=False):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.spans = []
+        self.depth = 0
+        self.cprofile_path = None
+        self._profiler = None
+        if cprofile:
+            self._profiler = cProfile.Profile()
+            try:
+                self._profiler.enable()
+            except ValueError as e:
+                # 다른 프로파일러가 이미 동작 중이면 cProfile 없이 진행
+                print(f"cProfile 시작 실패: {e}")
+                self._profiler = None
+
+    def add_span(self, kind, name, start, end, depth):
+        self.spans.append((kind, name, (start - self.started) * 1000, (end - start) * 1000, depth))
+
+    def finish(self):
+        self.finished = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.disable()
+            os.makedirs(CPROFILE_DIR, exist_ok=True)
+            self.cprofile_path = os.path.join(
+                CPROFILE_DIR, f"rerun_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.prof")
+            self._profiler.dump_stats(self.cprofile_path)
+
+    @property
+    def total_ms(self):
+        return ((self.finished or time.perf_counter()) - self.started) * 1000
+
+    def to_frame(self):
+        """구간 목록 (시작 시각 순)"""
+        df = pd.DataFrame(self.spans, columns=['kind', 'name', 'start_ms', 'duration_ms', 'depth'])
+        return df.sort_values('start_ms', kind='stable').reset_index(drop=True)
+
+    def totals(self):
+        """(종류, 이름)별 누적 시간 (내림차순)"""
+        df = self.to_frame()
+        if df.empty:
+            return pd.DataFrame(columns=['kind', 'name', 'count', 'total_ms'])
+        totals = df.groupby(['kind', 'name'], sort=False).agg(
+            count=('duration_ms', 'size'), total_ms=('duration_ms', 'sum')
+        ).reset_index()
+        return totals.sort_values('total_ms', ascending=False).round(2).reset_index(drop=True)
+
+def start_render_profile(cprofile=False):
+    """현재 스레드(세션 rerun)의 렌더링 프로파일 시작"""
+    _render.profile = RenderProfile(cprofile=cprofile or CPROFILE_ENABLED)
+    return _render.profile
+
+def finish_render_profile():
+    """현재 스레드의 렌더링 프로파일을 끝내고 반환 (없으면 None)"""
+    profile = getattr(_render, 'profile', None)
+    _render.profile = None
+    if profile is not None:
+        profile.finish()
+        for listener in _profile_listeners:
+            listener(profile)
+    return profile
+
+def add_profile_listener(listener):
+    """rerun 프로파일이 끝날 때마다 listener(profile)를 호출하도록 등록"""
+    _profile_listeners.append(listener)
+
+@contextmanager
+def render_span(kind, name):
+    """렌더링 프로파일이 켜져 있으면 with 블록 실행 시간을 구간으로 기록"""
+    profile = getattr(_render, 'profile', None)
+    if profile is None:
+        yield
+        return
+    depth = profile.depth
+    profile.depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.depth = depth
+        profile.add_span(kind, name, start, time.perf_counter(), depth)
+
+def _record_query_span(record):
+    """쿼리 기록을 현재 rerun의 DB 구간으로 추가"""
+    profile = getattr(_render, 'profile', None)
+    if profile is None:
+        return
+    end = time.perf_counter()
+    profile.add_span('db', record.caller, end - record.elapsed, end, profile.depth)
+
+add_query_listener(_record_query_span)
@@ -0,0 +1,195 @@
+import argparse
+import numpy as np
+import pandas as pd
+from database import get_read_connection, execute_with_retry, run_write, read_frame
+
+# Elo 초기값과 경기당 변동 계수
+INITIAL_RATING = 1500.0
+K_FACTOR = 20.0
+
+# 점수 차 보정 레이팅의 배수 계산 상수 (레이팅 차가 큰 팀이 이길 때 배수를 줄임)
+MARGIN_SCALE = 2.2
+
+# 리그 경기 결과 (점수 포함, 저장 순서대로)
+GAMES_QUERY = '''
+SELECT gl.game_date, gl.team1, gl.team2,
+       ts1.total_score as score1, ts2.total_score as score2
+FROM game_league gl
+JOIN team_stats ts1 ON gl.game_date = ts1.game_date AND gl.team1 = ts1.team
+JOIN team_stats ts2 ON gl.game_date = ts2.game_date AND gl.team2 = ts2.team
+WHERE gl.league_id = ?
+'''
+
+def expected_score(rating, opponent):
+    """rating 팀이 opponent 팀을 이길 기대 확률 (벡터 지원)"""
+    return 1.0 / (1.0 + 10.0 ** ((opponent - rating) / 400.0))
+
+def rating_deltas(elo1, elo2, margin1, margin2, diff):
+    """경기별 (Elo 변동, 점수 차 보정 레이팅 변동) 계산 (team1 기준, 벡터 지원)
+
+    diff는 team1 득점 - team2 득점이다. team2의 변동은 부호만 반대다.
+    """
+    diff = np.asarray(diff, dtype=float)
+    actual = np.where(diff > 0, 1.0, np.where(diff < 0, 0.0, 0.5))
+    elo_delta = K_FACTOR * (actual - expected_score(elo1, elo2))
+
+    # 이긴 팀 기준 레이팅 차로 배수 보정 (무승부는 배수 1)
+    winner_gap = np.where(diff >= 0, margin1 - margin2, margin2 - margin1)
+    multiplier = np.where(diff == 0, 1.0,
+                          np.log(np.abs(diff) + 1) * MARGIN_SCALE / (winner_gap * 0.001 + MARGIN_SCALE))
+    margin_delta = K_FACTOR * multiplier * (actual - expected_score(margin1, margin2))
+    return elo_delta, margin_delta
+
+def _insert_history(conn, league_id, rows):
+    conn.executemany('''INSERT OR REPLACE INTO team_rating_history
+                        (league_id, team, game_date, opponent, elo_before, elo_after,
+                         margin_before, margin_after)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                     [(league_id, *row) for row in rows])
+
+def _save_ratings(conn, league_id, rows):
+    conn.executemany('''INSERT OR REPLACE INTO team_ratings
+                        (league_id, team, elo, margin_rating, games, last_game_date)
+                        VALUES (?, ?, ?, ?, ?, ?)''',
+                     [(league_id, *row) for row in rows])
+
+def _batches(home, away):
+    """팀이 겹치지 않는 연속 경기 묶음 (같은 묶음은 한 번에 계산해도 순차 계산과 같음)"""
+    start, seen = 0, set()
+    for i, (t1, t2) in enumerate(zip(home, away)):
+        if t1 in seen or t2 in seen:
+            yield start, i
+            start, seen = i, set()
+        seen.update((t1, t2))
+    if start < len(home):
+        yield start, len(home)
+
+def rebuild_league_ratings(conn, league_id):
+    """리그 경기를 날짜순으로 다시 재생해 레이팅과 이력 전체를 다시 계산 (주어진 연결 사용)"""
+    games = pd.read_sql_query(GAMES_QUERY + ' ORDER BY gl.game_date, gl.rowid', conn, params=(league_id,))
+    conn.execute('DELETE FROM team_ratings WHERE league_id = ?', (league_id,))
+    conn.execute('DELETE FROM team_rating_history WHERE league_id = ?', (league_id,))
+    if games.empty:
+        return 0
+
+    codes, teams = pd.factorize(pd.concat([games['team1'], games['team2']], ignore_index=True))
+    n_games = len(games)
+    home, away = codes[:n_games], codes[n_games:]
+    diff = games['score1'].to_numpy(dtype=float) - games['score2'].to_numpy(dtype=float)
+
+    elo = np.full(len(teams), INITIAL_RATING)
+    margin = np.full(len(teams), INITIAL_RATING)
+    before = np.empty((n_games, 4))  # elo1, elo2, margin1, margin2
+    after = np.empty((n_games, 4))
+    for start, end in _batches(home, away):
+        h, a = home[start:end], away[start:end]
+        before[start:end] = np.column_stack([elo[h], elo[a], margin[h], margin[a]])
+        elo_delta, margin_delta = rating_deltas(elo[h], elo[a], margin[h], margin[a], diff[start:end])
+        elo[h] += elo_delta
+        elo[a] -= elo_delta
+        margin[h] += margin_delta
+        margin[a] -= margin_delta
+        after[start:end] = np.column_stack([elo[h], elo[a], margin[h], margin[a]])
+
+    dates = games['game_date'].astype(str).tolist()
+    team1, team2 = games['team1'].tolist(), games['team2'].tolist()
+    history = [(team1[i], dates[i], team2[i], before[i, 0], after[i, 0], before[i, 2], after[i, 2])
+               for i in range(n_games)]
+    history += [(team2[i], dates[i], team1[i], before[i, 1], after[i, 1], before[i, 3], after[i, 3])
+                for i in range(n_games)]
+    _insert_history(conn, league_id, history)
+
+    played = np.bincount(codes, minlength=len(teams))
+    last_dates = pd.Series(dates * 2).groupby(codes).max()
+    _save_ratings(conn, league_id, [(str(team), float(elo[i]), float(margin[i]), int(played[i]), last_dates[i])
+                                    for i, team in enumerate(teams)])
+    return n_games
+
+def update_game_rating(conn, league_id, game_date, team1, team2):
+    """새로 할당된 경기 하나로 두 팀 레이팅 갱신 (주어진 연결 사용)
+
+    두 팀의 마지막 경기보다 이전 날짜의 경기면 순서가 바뀌므로 리그 전체를 다시 재생한다.
+    """
+    game = conn.execute(GAMES_QUERY + ' AND gl.game_date = ? AND gl.team1 = ? AND gl.team2 = ?',
+                        (league_id, game_date, team1, team2)).fetchone()
+    if game is None:
+        return
+
+    current = {row[0]: row[1:] for row in conn.execute(
+        '''SELECT team, elo, margin_rating, games, last_game_date FROM team_ratings
+           WHERE league_id = ? AND team IN (?, ?)''', (league_id, team1, team2))}
+    if any(row[3] > game_date for row in current.values()):
+        rebuild_league_ratings(conn, league_id)
+        return
+
+    elo1, margin1, games1, _ = current.get(team1, (INITIAL_RATING, INITIAL_RATING, 0, None))
+    elo2, margin2, games2, _ = current.get(team2, (INITIAL_RATING, INITIAL_RATING, 0, None))
+    elo_delta, margin_delta = rating_deltas(elo1, elo2, margin1, margin2, game[3] - game[4])
+    elo_delta, margin_delta = float(elo_delta), float(margin_delta)
+
+    _insert_history(conn, league_id, [
+        (team1, game_date, team2, elo1, elo1 + elo_delta, margin1, margin1 + margin_delta),
+        (team2, game_date, team1, elo2, elo2 - elo_delta, margin2, margin2 - margin_delta)
+    ])
+    _save_ratings(conn, league_id, [
+        (team1, elo1 + elo_delta, margin1 + margin_delta, games1 + 1, game_date),
+        (team2, elo2 - elo_delta, margin2 - margin_delta, games2 + 1, game_date)
+    ])
+
+def replay_ratings(league_id):
+    """리그 레이팅 전체 재계산 (재생한 경기 수 반환)"""
+    games = run_write(lambda conn: rebuild_league_ratings(conn, league_id))
+    print(f"리그 {league_id} 레이팅 재계산: {games}경기")
+    return games
+
+def get_team_ratings(league_id):
+    """리그 팀 레이팅 (Elo 높은 순)"""
+    def _get_ratings():
+        with get_read_connection() as conn:
+            query = '''
+            SELECT
+                ROW_NUMBER() OVER (ORDER BY elo DESC) as 순위,
+                team as 팀명,
+                ROUND(elo, 1) as Elo,
+                ROUND(margin_rating, 1) as 점수차보정,
+                games as 경기수,
+                last_game_date as 마지막경기
+            FROM team_ratings
+            WHERE league_id = ?
+            ORDER BY 순위
+            '''
+            return read_frame(query, conn, params=(league_id,), label='get_team_ratings')
+
+    return execute_with_retry(_get_ratings)
+
+def get_rating_history(league_id, team=None):
+    """팀 레이팅 변화 이력 (날짜순)"""
+    def _get_history():
+        with get_read_connection() as conn:
+            query = '''
+            SELECT team, game_date, opponent, elo_before, elo_after, margin_before, margin_after
+            FROM team_rating_history
+            WHERE league_id = ?
+            '''
+            params = [league_id]
+            if team is not None:
+                query += ' AND team = ?'
+                params.append(team)
+            query += ' ORDER BY game_date, team'
+            return read_frame(query, conn, params=params, label='get_rating_history')
+
+    return execute_with_retry(_get_history)
+
+def main(argv=None):
+    from database import get_leagues
+
+    parser = argparse.ArgumentParser(description='팀 레이팅 재계산 (경기 날짜순 재생)')
+    parser.add_argument('--league', type=int, action='append', help='리그 id (여러 번 지정 가능, 기본: 전체)')
+    args = parser.parse_args(argv)
+
+    league_ids = args.league or get_leagues()['league_id'].astype(int).tolist()
+    for league_id in league_ids:
+        replay_ratings(league_id)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+from database import get_read_connection, execute_with_retry, read_frame, CAREER_MILESTONES, ALL_LEAGUES
+
+# 한 경기 최고 기록을 관리하는 기록 (컬럼명: 표시 이름)
+RECORD_STATS = {
+    'points': '득점',
+    'rebounds': '리바운드',
+    'assists': '어시스트',
+    'steals': '스틸',
+    'blocks': '블록',
+    'three_points_made': '3점슛',
+    'efficiency': '효율값'
+}
+
+# 리그(또는 통산)별 기록마다 보관하는 상위 기록 수
+RECORDS_K = 10
+
+# 기록 달성 표시 이름
+MILESTONE_LABELS = {
+    'double_doubles': '더블더블',
+    'twenty_tens': '20-10',
+    'triple_doubles': '트리플더블'
+}
+
+# 경기 기록 한 행 (기록판 / 최고 기록 갱신에 쓰는 컬럼)
+_GAME_ROWS_QUERY = f'''
+SELECT game_date, team, player, player_id, {', '.join(RECORD_STATS)}
+FROM player_stats
+WHERE game_date = ? AND team IN (?, ?)
+'''
+
+def _add_to_board(conn, league_id, stat, rows):
+    """기록판(league_id, stat)에 경기 행을 넣고 상위 RECORDS_K개만 유지
+
+    기록판은 최대 K행이라 (league_id, stat, value) 인덱스로 최솟값 확인과
+    삽입 / 삭제가 O(log K)에 끝난다. 값이 큰 행부터 넣으므로 한 행이 들어가지 못하면
+    나머지 행도 들어갈 수 없어 바로 멈춘다.
+    """
+    rows = [row for row in rows if row[4] is not None]
+    for game_date, team, player, player_id, value in sorted(rows, key=lambda r: r[4], reverse=True):
+        count, lowest = conn.execute('''SELECT COUNT(*), MIN(value) FROM player_game_records
+                                        WHERE league_id = ? AND stat = ?''', (league_id, stat)).fetchone()
+        if count >= RECORDS_K and value <= lowest:
+            break
+        conn.execute('''INSERT OR REPLACE INTO player_game_records
+                        (league_id, stat, game_date, team, player, player_id, value)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                     (league_id, stat, game_date, team, player, player_id, value))
+        if count >= RECORDS_K:
+            # 가장 낮은 기록 중 가장 최근 기록을 제거 (같은 기록이면 먼저 달성한 기록 유지)
+            conn.execute('''DELETE FROM player_game_records WHERE rowid = (
+                                SELECT rowid FROM player_game_records
+                                WHERE league_id = ? AND stat = ?
+                                ORDER BY value ASC, game_date DESC LIMIT 1)''', (league_id, stat))
+
+def add_game_records(conn, game_date, team1, team2, league_id):
+    """경기 하나의 선수 기록을 리그(league_id, ALL_LEAGUES는 통산) 기록판에 반영 (주어진 쓰기 연결 사용)"""
+    rows = conn.execute(_GAME_ROWS_QUERY, (game_date, team1, team2)).fetchall()
+    for i, stat in enumerate(RECORD_STATS):
+        _add_to_board(conn, league_id, stat, [row[:4] + (row[4 + i],) for row in rows])
+
+def update_career_highs(conn, game_date, team1, team2):
+    """경기 하나의 선수 기록으로 선수별 통산 최고 기록 갱신 (주어진 쓰기 연결 사용)"""
+    for stat in RECORD_STATS:
+        conn.execute(f'''INSERT INTO player_career_highs (player_id, stat, value, game_date, team)
+                         SELECT player_id, ?, {stat}, game_date, team
+                         FROM player_stats
+                         WHERE game_date = ? AND team IN (?, ?) AND {stat} IS NOT NULL
+                         ON CONFLICT(player_id, stat) DO UPDATE SET
+                         value = excluded.value, game_date = excluded.game_date, team = excluded.team
+                         WHERE excluded.value > player_career_highs.value''',
+                     (stat, game_date, team1, team2))
+
+def rebuild_records(conn, league_id):
+    """리그(ALL_LEAGUES는 통산) 기록판을 경기 기록에서 다시 계산 (주어진 쓰기 연결 사용)"""
+    conn.execute('DELETE FROM player_game_records WHERE league_id = ?', (league_id,))
+    join = '' if league_id == ALL_LEAGUES else '''
+        JOIN game_league gl ON ps.game_date = gl.game_date
+            AND (ps.team = gl.team1 OR ps.team = gl.team2) AND gl.league_id = :league_id'''
+    for stat in RECORD_STATS:
+        conn.execute(f'''INSERT INTO player_game_records
+                         (league_id, stat, game_date, team, player, player_id, value)
+                         SELECT :league_id, :stat, ps.game_date, ps.team, ps.player, ps.player_id, ps.{stat}
+                         FROM player_stats ps {join}
+                         WHERE ps.{stat} IS NOT NULL
+                         ORDER BY ps.{stat} DESC, ps.game_date
+                         LIMIT :k''', {'league_id': league_id, 'stat': stat, 'k': RECORDS_K})
+
+def rebuild_career_highs(conn, player_ids=None):
+    """선수별 통산 최고 기록을 다시 계산 (player_ids가 있으면 그 선수들만)"""
+    where, params = '', ()
+    if player_ids is not None:
+        where = f"AND player_id IN ({', '.join('?' * len(player_ids))})"
+        params = tuple(player_ids)
+    conn.execute(f'DELETE FROM player_career_highs WHERE 1 = 1 {where}', params)
+    for stat in RECORD_STATS:
+        conn.execute(f'''INSERT INTO player_career_highs (player_id, stat, value, game_date, team)
+                         SELECT player_id, ?, value, game_date, team FROM (
+                             SELECT player_id, {stat} as value, game_date, team,
+                                    ROW_NUMBER() OVER (PARTITION BY player_id
+                                                       ORDER BY {stat} DESC, game_date) as rn
+                             FROM player_stats
+                             WHERE {stat} IS NOT NULL {where}
+                         ) WHERE rn = 1''', (stat, *params))
+
+def get_record_board(league_id, stat):
+    """리그(ALL_LEAGUES는 통산) 한 경기 최고 기록 상위 목록"""
+    def _get_board():
+        with get_read_connection() as conn:
+            query = '''
+            SELECT
+                ROW_NUMBER() OVER (ORDER BY r.value DESC, r.game_date) as 순위,
+                r.player as 선수명,
+                r.team as 팀명,
+                ts.opponent as 상대팀,
+                r.game_date as 경기날짜,
+                r.value as 기록
+            FROM player_game_records r
+            LEFT JOIN team_stats ts ON r.game_date = ts.game_date AND r.team = ts.team
+            WHERE r.league_id = ? AND r.stat = ?
+            ORDER BY 순위
+            '''
+            return read_frame(query, conn, params=(league_id, stat), label='get_record_board')
+
+    return execute_with_retry(_get_board)
+
+def get_career_highs(player_id):
+    """선수의 기록별 통산 최고 기록 (달성 날짜 포함)"""
+    def _get_highs():
+        with get_read_connection() as conn:
+            rows = conn.execute('''SELECT stat, value, game_date, team FROM player_career_highs
+                                   WHERE player_id = ?''', (player_id,)).fetchall()
+        highs = {stat: (value, game_date, team) for stat, value, game_date, team in rows}
+        return [
+            {'기록': label, '최고 기록': highs[stat][0], '경기날짜': highs[stat][1], '팀명': highs[stat][2]}
+            for stat, label in RECORD_STATS.items() if stat in highs
+        ]
+
+    return execute_with_retry(_get_highs)
+
+def get_milestone_leaders(league_id=ALL_LEAGUES, limit=20):
+    """더블더블 / 20-10 / 트리플더블 달성 경기 수 상위 선수 (ALL_LEAGUES면 미할당 경기까지 통산)"""
+    def _get_leaders():
+        with get_read_connection() as conn:
+            where = '' if league_id == ALL_LEAGUES else 'WHERE s.league_id = ?'
+            query = f'''
+            SELECT
+                p.player_name as 선수명,
+                p.team as 팀명,
+                SUM(s.games_played) as 경기수,
+                {', '.join(f'SUM(s.{name}) as "{label}"' for name, label in MILESTONE_LABELS.items())}
+            FROM player_career_splits s
+            JOIN players p ON s.player_id = p.player_id
+            {where}
+            GROUP BY s.player_id
+            HAVING {' + '.join(f'SUM(s.{name})' for name in CAREER_MILESTONES)} > 0
+            ORDER BY SUM(s.triple_doubles) DESC, SUM(s.twenty_tens) DESC, SUM(s.double_doubles) DESC
+            LIMIT ?
+            '''
+            params = (limit,) if league_id == ALL_LEAGUES else (league_id, limit)
+            return read_frame(query, conn, params=params, label='get_milestone_leaders')
+
+    return execute_with_retry(_get_leaders)
+
+def get_record_players():
+    """통산 최고 기록이 있는 선수 목록 (player_id, 선수명, 팀명)"""
+    def _get_players():
+        with get_read_connection() as conn:
+            query = '''
+            SELECT p.player_id, p.player_name as 선수명, p.team as 팀명
+            FROM players p
+            WHERE EXISTS (SELECT 1 FROM player_career_highs h WHERE h.player_id = p.player_id)
+            ORDER BY p.team, p.player_name
+            '''
+            return read_frame(query, conn, label='get_record_players', compact=False)
+
+    return execute_with_retry(_get_players)
@@ -0,0 +1,172 @@
+import threading
+import numpy as np
+import pandas as pd
+from database import get_read_connection, execute_with_retry, get_data_version
+
+# 선수별로 누적하는 원시 기록 (경기당 평균 / 성공률 계산용)
+SUM_COLUMNS = [
+    'seconds_played', 'points', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers',
+    'field_goals_made', 'field_goals_attempt', 'three_points_made', 'three_points_attempt',
+    'free_throws_made', 'free_throws_attempt'
+]
+
+# 유사도 비교에 쓰는 특성 (컬럼명: 표시 이름)
+FEATURES = {
+    'minutes': '출전시간',
+    'points': '득점',
+    'rebounds': '리바운드',
+    'assists': '어시스트',
+    'steals': '스틸',
+    'blocks': '블록',
+    'turnovers': '턴오버',
+    'field_goal_pct': 'FG%',
+    'three_point_pct': '3P%',
+    'free_throw_pct': 'FT%'
+}
+
+# 비슷한 선수 후보가 되기 위한 최소 경기 수
+MIN_GAMES = 3
+
+_index = None
+_lock = threading.Lock()
+
+class PlayerSimilarityIndex:
+    """전체 선수(리그 통합)의 경기당 기록 z-score 행렬과 단위 벡터
+
+    선수는 player_id 단위다 (이름이 같아도 팀이 다르면 다른 선수).
+    선수별 원시 기록 합계를 누적해 두고, 새 경기 행(rowid 기준)만 더한 뒤
+    정규화 단계만 다시 계산한다.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.watermark = 0  # 반영한 player_stats 마지막 rowid
+        self.row_count = 0
+        self.player_count = 0  # players 테이블 행 수 (선수 합치기 감지용)
+        self.players = []  # 행 번호 -> player_id
+        self.names = {}  # player_id -> (선수명, 팀명)
+        self.index = {}  # player_id -> 행 번호
+        self.sums = np.zeros((0, len(SUM_COLUMNS)))
+        self.games = np.zeros(0, dtype=int)
+        self.features = np.zeros((0, len(FEATURES)))
+        self.unit = np.zeros((0, len(FEATURES)))
+
+    def copy(self):
+        """조회 중인 인덱스를 건드리지 않고 갱신하기 위한 복사본"""
+        other = PlayerSimilarityIndex()
+        other.__dict__.update(self.__dict__)
+        other.players = list(self.players)
+        other.names = dict(self.names)
+        other.index = dict(self.index)
+        other.sums = self.sums.copy()
+        other.games = self.games.copy()
+        return other
+
+    def add_rows(self, rows_df):
+        """새 경기 행을 선수별 합계에 누적하고 행렬 다시 정규화"""
+        if rows_df.empty:
+            return
+        player_ids = rows_df['player_id'].astype(int)
+        new_players = [p for p in dict.fromkeys(player_ids.tolist()) if p not in self.index]
+        self.names.update(zip(player_ids.tolist(), zip(rows_df['player'].astype(str), rows_df['team'].astype(str))))
+        if new_players:
+            self.index.update({p: len(self.players) + i for i, p in enumerate(new_players)})
+            self.players += new_players
+            self.sums = np.vstack([self.sums, np.zeros((len(new_players), len(SUM_COLUMNS)))])
+            self.games = np.concatenate([self.games, np.zeros(len(new_players), dtype=int)])
+
+        codes = player_ids.map(self.index).to_numpy()
+        np.add.at(self.sums, codes, rows_df[SUM_COLUMNS].fillna(0).to_numpy(dtype=float))
+        np.add.at(self.games, codes, 1)
+        self.watermark = max(self.watermark, int(rows_df['rowid'].max()))
+        self.row_count += len(rows_df)
+        self._normalize()
+
+    def _normalize(self):
+        """경기당 기록 → 특성별 z-score → 행별 단위 벡터"""
+        s = dict(zip(SUM_COLUMNS, self.sums.T))
+        games = np.maximum(self.games, 1).astype(float)
+
+        def ratio(made, attempt):
+            return np.divide(made, attempt, out=np.zeros(len(made)), where=attempt > 0) * 100
+
+        self.features = np.column_stack([
+            s['seconds_played'] / 60 / games,
+            s['points'] / games,
+            s['rebounds'] / games,
+            s['assists'] / games,
+            s['steals'] / games,
+            s['blocks'] / games,
+            s['turnovers'] / games,
+            ratio(s['field_goals_made'], s['field_goals_attempt']),
+            ratio(s['three_points_made'], s['three_points_attempt']),
+            ratio(s['free_throws_made'], s['free_throws_attempt'])
+        ])
+
+        # 후보 선수(최소 경기 수 이상) 분포로 평균 / 표준편차 계산
+        eligible = self.games >= MIN_GAMES
+        basis = self.features[eligible] if eligible.sum() > 1 else self.features
+        mean = basis.mean(axis=0)
+        std = basis.std(axis=0)
+        std[std == 0] = 1.0
+        z = (self.features - mean) / std
+        norms = np.linalg.norm(z, axis=1)
+        self.unit = z / np.where(norms > 0, norms, 1.0)[:, None]
+
+    def similar(self, player_id, k=5):
+        """코사인 유사도 상위 k명 (행렬-벡터 곱 한 번)"""
+        i = self.index.get(player_id)
+        if i is None:
+            return pd.DataFrame()
+        scores = self.unit @ self.unit[i]
+        scores[self.games < MIN_GAMES] = -np.inf
+        scores[i] = -np.inf
+
+        n = int(np.isfinite(scores).sum())
+        if n == 0:
+            return pd.DataFrame()
+        top = np.argpartition(-scores, min(k, n) - 1)[:min(k, n)]
+        top = top[np.argsort(-scores[top])]
+
+        df = pd.DataFrame(np.round(self.features[top], 1), columns=list(FEATURES.values()))
+        df.insert(0, '선수명', [self.names[self.players[j]][0] for j in top])
+        df.insert(1, '팀명', [self.names[self.players[j]][1] for j in top])
+        df.insert(2, '유사도', np.round(scores[top] * 100, 1))
+        df.insert(3, '경기수', self.games[top])
+        return df
+
+def _load_rows(after_rowid):
+    """player_stats에서 rowid가 after_rowid보다 큰 행과 전체 행 수, 선수 수 조회"""
+    def _get_rows():
+        with get_read_connection() as conn:
+            total = conn.execute('SELECT COUNT(*) FROM player_stats WHERE player_id IS NOT NULL').fetchone()[0]
+            player_count = conn.execute('SELECT COUNT(*) FROM players').fetchone()[0]
+            query = f'''SELECT rowid, player_id, player, team, {', '.join(SUM_COLUMNS)}
+                        FROM player_stats WHERE rowid > ? AND player_id IS NOT NULL ORDER BY rowid'''
+            return total, player_count, pd.read_sql_query(query, conn, params=(after_rowid,))
+
+    return execute_with_retry(_get_rows)
+
+def get_similarity_index():
+    """선수 유사도 인덱스 조회 (전체 데이터 버전이 바뀌면 새 행만 반영)"""
+    global _index
+    version = get_data_version()
+    with _lock:
+        if _index is not None and _index.version == version:
+            return _index
+
+        index = _index.copy() if _index is not None else PlayerSimilarityIndex()
+        total, player_count, rows_df = _load_rows(index.watermark)
+        if index.row_count + len(rows_df) != total or player_count < index.player_count:
+            # 기존 행이 바뀌거나 지워졌거나 선수가 합쳐졌으면 처음부터 다시 계산
+            index = PlayerSimilarityIndex()
+            total, player_count, rows_df = _load_rows(0)
+        index.add_rows(rows_df)
+        index.player_count = player_count
+        index.version = version
+        _index = index
+        return index
+
+def find_similar_players(player_id, k=5):
+    """경기당 기록이 가장 비슷한 선수 k명 (player_id 기준)"""
+    return get_similarity_index().similar(player_id, k)
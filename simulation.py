@@ -0,0 +1,146 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from database import get_data_version
+from head_to_head import get_head_to_head
+from ratings import get_team_ratings, expected_score, INITIAL_RATING
+
+# 시즌 시뮬레이션 횟수
+N_SIMULATIONS = 20000
+
+# 플레이오프 진출 팀 수 (팀 수가 적으면 절반까지)
+PLAYOFF_SPOTS = 4
+
+# 프로세스 풀로 나눠 돌릴 작업자 수 (0이면 현재 프로세스에서 계산)
+SIM_WORKERS = int(os.environ.get('NAVOTO_SIM_WORKERS', '0'))
+
+# 작업자 하나가 맡는 최소 시뮬레이션 수 (이보다 적으면 나누지 않음)
+MIN_SHARD_SIZE = 5000
+
+_cache = {}  # league_id -> SeasonProjection
+_lock = threading.Lock()
+
+class SeasonProjection:
+    """리그 한 개의 남은 일정 시뮬레이션 결과"""
+
+    def __init__(self, league_id, version, table, remaining_games, n_simulations):
+        self.league_id = league_id
+        self.version = version
+        self.table = table
+        self.remaining_games = remaining_games
+        self.n_simulations = n_simulations
+
+def remaining_schedule(games):
+    """맞대결 수 행렬로 남은 경기 (팀 번호 쌍) 목록 계산
+
+    별도 일정표가 없으므로 가장 많이 만난 두 팀의 맞대결 수만큼
+    모든 팀이 서로 만나는 라운드 로빈으로 시즌 일정을 추정한다.
+    """
+    n = len(games)
+    if n < 2:
+        return np.empty((0, 2), dtype=int)
+    rounds = max(1, int(games.max()))
+    i, j = np.triu_indices(n, k=1)
+    left = rounds - games[i, j]
+    return np.column_stack([np.repeat(i, left), np.repeat(j, left)])
+
+def simulate_shard(win_prob, pairs, base_wins, base_margin, n_simulations, playoff_spots, seed):
+    """시뮬레이션 n_simulations번을 한 배열로 계산해 팀별 집계 반환
+
+    반환값: (최종 승수 합계, 순위 합계, 1위 횟수, 플레이오프 진출 횟수)
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(base_wins)
+    n_games = len(pairs)
+
+    # (시뮬레이션 x 남은 경기) 결과를 한 번에 뽑아 팀별 승수로 합산
+    home_wins = rng.random((n_simulations, n_games)) < win_prob
+    wins = np.tile(base_wins.astype(float), (n_simulations, 1))
+    if n_games:
+        home = np.zeros((n_games, n_teams))
+        home[np.arange(n_games), pairs[:, 0]] = 1
+        away = np.zeros((n_games, n_teams))
+        away[np.arange(n_games), pairs[:, 1]] = 1
+        wins += home_wins @ home + (~home_wins) @ away
+
+    # 승수 → 현재 득실차 → 무작위 순으로 순위 결정
+    margin_order = base_margin.argsort().argsort() / max(n_teams, 1)
+    key = wins + margin_order * 0.1 + rng.random((n_simulations, n_teams)) * 0.01
+    positions = (-key).argsort(axis=1).argsort(axis=1) + 1
+
+    return (wins.sum(axis=0),
+            positions.sum(axis=0),
+            (positions == 1).sum(axis=0),
+            (positions <= playoff_spots).sum(axis=0))
+
+def _simulate_shard(args):
+    return simulate_shard(*args)
+
+def simulate_season(win_prob, pairs, base_wins, base_margin, n_simulations=N_SIMULATIONS,
+                    playoff_spots=PLAYOFF_SPOTS, workers=SIM_WORKERS, seed=None):
+    """남은 일정 몬테카를로 시뮬레이션 (workers > 1이면 프로세스 풀로 나눠 계산)"""
+    seeds = np.random.SeedSequence(seed)
+    n_shards = min(workers, n_simulations // MIN_SHARD_SIZE) if workers > 1 else 1
+    if n_shards <= 1:
+        totals = simulate_shard(win_prob, pairs, base_wins, base_margin, n_simulations, playoff_spots, seeds)
+    else:
+        sizes = np.full(n_shards, n_simulations // n_shards)
+        sizes[:n_simulations % n_shards] += 1
+        shards = [(win_prob, pairs, base_wins, base_margin, int(size), playoff_spots, child)
+                  for size, child in zip(sizes, seeds.spawn(n_shards))]
+        with ProcessPoolExecutor(max_workers=n_shards) as pool:
+            results = list(pool.map(_simulate_shard, shards))
+        totals = [sum(parts) for parts in zip(*results)]
+    return [np.asarray(t) / n_simulations for t in totals]
+
+def project_season(league_id, n_simulations=N_SIMULATIONS, workers=SIM_WORKERS, seed=None):
+    """리그 현재 결과와 점수 차 보정 레이팅으로 시즌 최종 순위 / 플레이오프 확률 계산"""
+    h2h = get_head_to_head(league_id)
+    wins, games, margin = h2h.matrices()
+    teams = h2h.teams
+    pairs = remaining_schedule(games)
+
+    # 점수 차 보정 레이팅으로 남은 경기 승리 확률 계산
+    ratings_df = get_team_ratings(league_id)
+    rating_map = dict(zip(ratings_df['팀명'].astype(str), ratings_df['점수차보정'].astype(float)))
+    rating = np.array([rating_map.get(t, INITIAL_RATING) for t in teams])
+    win_prob = expected_score(rating[pairs[:, 0]], rating[pairs[:, 1]]) if len(pairs) else np.empty(0)
+
+    base_wins = wins.sum(axis=1)
+    played = games.sum(axis=1)
+    base_margin = np.divide(margin.sum(axis=1), played, out=np.zeros(len(teams)), where=played > 0)
+    playoff_spots = min(PLAYOFF_SPOTS, max(1, len(teams) // 2))
+
+    final_wins, avg_position, first, playoff = simulate_season(
+        win_prob, pairs, base_wins, base_margin, n_simulations, playoff_spots, workers, seed)
+    remaining = np.bincount(pairs.ravel(), minlength=len(teams)) if len(pairs) else np.zeros(len(teams), dtype=int)
+    total_games = played + remaining
+
+    table = pd.DataFrame({
+        '팀명': teams,
+        '현재 승': base_wins,
+        '남은 경기': remaining,
+        '예상 승': np.round(final_wins, 1),
+        '예상 패': np.round(total_games - final_wins, 1),
+        '평균 순위': np.round(avg_position, 2),
+        '1위 확률': np.round(first * 100, 1),
+        '플레이오프 확률': np.round(playoff * 100, 1)
+    }).sort_values(['평균 순위', '팀명']).reset_index(drop=True)
+    return table, len(pairs)
+
+def get_season_projection(league_id):
+    """리그 시즌 전망 조회 (데이터 버전이 바뀌었을 때만 다시 시뮬레이션)"""
+    version = get_data_version(league_id)
+    with _lock:
+        cached = _cache.get(league_id)
+        if cached is not None and cached.version == version:
+            return cached
+
+    # 같은 데이터 버전이면 프로세스가 달라도 같은 결과가 나오도록 버전을 시드로 사용
+    table, remaining_games = project_season(league_id, seed=version)
+    projection = SeasonProjection(league_id, version, table, remaining_games, N_SIMULATIONS)
+    with _lock:
+        _cache[league_id] = projection
+    return projection
@@ -0,0 +1,192 @@
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from database import get_read_connection, execute_with_retry, get_data_version, compact_frame
+
+# 스냅샷 저장 경로 (리그별 / 데이터 버전별 디렉토리)
+SNAPSHOT_DIR = os.path.join('./data', 'snapshots')
+
+MANIFEST_NAME = 'manifest.json'
+
+# 스냅샷에 포함할 문자열 컬럼 (사전 인코딩)
+DICTIONARY_COLUMNS = ['game_date', 'team', 'player']
+
+# 스냅샷에 포함할 숫자 컬럼
+NUMERIC_COLUMNS = [
+    'player_number', 'seconds_played', 'points',
+    'two_points_made', 'two_points_attempt',
+    'three_points_made', 'three_points_attempt',
+    'field_goals_made', 'field_goals_attempt',
+    'free_throws_made', 'free_throws_attempt',
+    'offensive_rebounds', 'defensive_rebounds', 'rebounds',
+    'assists', 'turnovers', 'steals', 'blocks', 'fouls', 'plus_minus', 'efficiency'
+]
+
+_open_snapshots = {}  # league_id -> LeagueSnapshot
+_lock = threading.Lock()
+
+def _league_dir(league_id):
+    return os.path.join(SNAPSHOT_DIR, f'league_{league_id}')
+
+def _version_dir(league_id, version):
+    return os.path.join(_league_dir(league_id), f'v{version}')
+
+def _snapshot_versions(league_id):
+    """리그 디렉토리에 있는 완성된 스냅샷 버전 목록"""
+    versions = []
+    for name in os.listdir(_league_dir(league_id)):
+        if name.startswith('v') and '.tmp-' not in name and name[1:].isdigit():
+            versions.append(int(name[1:]))
+    return versions
+
+def _load_player_stats(league_id):
+    """리그의 선수 경기 기록 조회 (경기 날짜, 팀, 선수 순)"""
+    def _load():
+        with get_read_connection() as conn:
+            query = f'''
+            SELECT {', '.join('ps.' + c for c in DICTIONARY_COLUMNS + NUMERIC_COLUMNS)}
+            FROM player_stats ps
+            JOIN game_league gl ON ps.game_date = gl.game_date
+                AND (ps.team = gl.team1 OR ps.team = gl.team2)
+            WHERE gl.league_id = ?
+            ORDER BY ps.game_date, ps.team, ps.player
+            '''
+            return pd.read_sql_query(query, conn, params=(league_id,))
+
+    return execute_with_retry(_load)
+
+def export_league_snapshot(league_id, version=None):
+    """리그 선수 기록을 컬럼별 .npy 파일 + 사전 인코딩 + manifest로 저장
+
+    임시 디렉토리에 모두 쓴 뒤 이름을 바꿔 완성된 스냅샷만 보이게 하고,
+    바로 이전 버전보다 오래된 버전 디렉토리는 삭제한다.
+    """
+    if version is None:
+        version = get_data_version(league_id)
+    df = _load_player_stats(league_id)
+    df[NUMERIC_COLUMNS] = df[NUMERIC_COLUMNS].apply(pd.to_numeric, errors='coerce').fillna(0)
+    df[NUMERIC_COLUMNS] = compact_frame(df[NUMERIC_COLUMNS].copy())
+
+    target = _version_dir(league_id, version)
+    tmp_dir = f'{target}.tmp-{os.getpid()}-{threading.get_ident()}'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    manifest = {
+        'league_id': league_id,
+        'version': version,
+        'rows': len(df),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'columns': {}
+    }
+    for col in NUMERIC_COLUMNS:
+        values = df[col].to_numpy()
+        np.save(os.path.join(tmp_dir, f'{col}.npy'), values)
+        manifest['columns'][col] = {'encoding': 'plain', 'dtype': str(values.dtype), 'file': f'{col}.npy'}
+    for col in DICTIONARY_COLUMNS:
+        codes, uniques = pd.factorize(df[col].astype(str))
+        codes = codes.astype(np.int32)
+        np.save(os.path.join(tmp_dir, f'{col}.codes.npy'), codes)
+        with open(os.path.join(tmp_dir, f'{col}.values.json'), 'w', encoding='utf-8') as f:
+            json.dump(list(uniques), f, ensure_ascii=False)
+        manifest['columns'][col] = {
+            'encoding': 'dictionary', 'dtype': 'int32',
+            'file': f'{col}.codes.npy', 'values': f'{col}.values.json'
+        }
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    if os.path.exists(target):
+        # 다른 프로세스가 같은 버전을 먼저 만들었으면 그대로 사용
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    else:
+        try:
+            os.replace(tmp_dir, target)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    # 오래된 버전 정리 (다른 프로세스가 방금 만든 더 새 버전과 바로 이전 버전은 남김)
+    older = sorted(v for v in _snapshot_versions(league_id) if v < version)
+    for old_version in older[:-1]:
+        shutil.rmtree(_version_dir(league_id, old_version), ignore_errors=True)
+
+    print(f"리그 {league_id} 스냅샷 생성: v{version}, {len(df)}행")
+    return target
+
+class LeagueSnapshot:
+    """리그 선수 기록 컬럼 스냅샷 (np.load(mmap_mode='r')로 열림)
+
+    생성할 때 모든 컬럼 파일을 열어 두므로, 다른 프로세스가 이 버전 디렉토리를
+    정리해도 열린 memmap은 그대로 읽을 수 있다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_NAME), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.league_id = self.manifest['league_id']
+        self.version = self.manifest['version']
+        self.rows = self.manifest['rows']
+        self._columns = {}
+        self._dictionaries = {}
+        for name, info in self.manifest['columns'].items():
+            self.column(name)
+            if info['encoding'] == 'dictionary':
+                self.dictionary(name)
+
+    def column(self, name):
+        """숫자 컬럼(또는 사전 컬럼의 코드)을 읽기 전용 memmap으로 반환"""
+        if name not in self._columns:
+            info = self.manifest['columns'][name]
+            file_path = os.path.join(self.path, info['file'])
+            if self.rows == 0:
+                self._columns[name] = np.load(file_path)
+            else:
+                self._columns[name] = np.load(file_path, mmap_mode='r')
+        return self._columns[name]
+
+    def dictionary(self, name):
+        """사전 인코딩 컬럼의 값 목록"""
+        if name not in self._dictionaries:
+            info = self.manifest['columns'][name]
+            with open(os.path.join(self.path, info['values']), encoding='utf-8') as f:
+                self._dictionaries[name] = np.array(json.load(f), dtype=object)
+        return self._dictionaries[name]
+
+    def decode(self, name):
+        """사전 인코딩 컬럼을 문자열 배열로 복원"""
+        return self.dictionary(name)[self.column(name)]
+
+    def to_frame(self, columns):
+        """필요한 컬럼만으로 DataFrame 생성 (사전 컬럼은 category)
+
+        숫자 컬럼은 memmap을 복사하지 않고 그대로 감싸므로 읽기 전용이다.
+        """
+        data = {}
+        for name in columns:
+            if self.manifest['columns'][name]['encoding'] == 'dictionary':
+                data[name] = pd.Categorical.from_codes(self.column(name), categories=self.dictionary(name))
+            else:
+                data[name] = self.column(name)
+        return pd.DataFrame(data, copy=False)
+
+def open_league_snapshot(league_id):
+    """리그 스냅샷 열기 (데이터 버전이 바뀌었으면 다시 생성)"""
+    version = get_data_version(league_id)
+    with _lock:
+        cached = _open_snapshots.get(league_id)
+        if cached is not None and cached.version == version:
+            return cached
+
+    path = _version_dir(league_id, version)
+    if not os.path.exists(os.path.join(path, MANIFEST_NAME)):
+        path = export_league_snapshot(league_id, version)
+
+    snapshot = LeagueSnapshot(path)
+    with _lock:
+        _open_snapshots[league_id] = snapshot
+    return snapshot
@@ -0,0 +1,125 @@
+from database import (get_read_connection, execute_with_retry, run_write, get_data_version, read_frame,
+                      get_derived_version, set_derived_version)
+from head_to_head import get_head_to_head, apply_tiebreakers
+
+# 파생 데이터 이름 (derived_versions 테이블 키)
+DERIVED_NAME = 'standings'
+
+# 최근 경기 흐름에 보여줄 경기 수
+FORM_GAMES = 5
+
+# 리그 팀별 경기 결과를 날짜순 누적 기록과 함께 한 번의 윈도우 함수 패스로 저장
+BUILD_QUERY = f'''
+WITH team_games AS (
+    -- 홈팀 기준 결과
+    SELECT gl.team1 as team, gl.team2 as opponent, gl.game_date,
+           ts1.total_score as points_for, ts2.total_score as points_against
+    FROM game_league gl
+    JOIN team_stats ts1 ON gl.game_date = ts1.game_date AND gl.team1 = ts1.team
+    JOIN team_stats ts2 ON gl.game_date = ts2.game_date AND gl.team2 = ts2.team
+    WHERE gl.league_id = :league_id
+
+    UNION ALL
+
+    -- 원정팀 기준 결과
+    SELECT gl.team2 as team, gl.team1 as opponent, gl.game_date,
+           ts2.total_score as points_for, ts1.total_score as points_against
+    FROM game_league gl
+    JOIN team_stats ts1 ON gl.game_date = ts1.game_date AND gl.team1 = ts1.team
+    JOIN team_stats ts2 ON gl.game_date = ts2.game_date AND gl.team2 = ts2.team
+    WHERE gl.league_id = :league_id
+),
+results AS (
+    SELECT *,
+        CASE WHEN points_for > points_against THEN '승'
+             WHEN points_for < points_against THEN '패'
+             ELSE '무' END as result
+    FROM team_games
+)
+INSERT INTO league_team_games
+    (league_id, team, game_date, opponent, points_for, points_against, result,
+     games, wins, losses, total_points_for, total_points_against, form)
+SELECT
+    :league_id, team, game_date, opponent, points_for, points_against, result,
+    COUNT(*) OVER season,
+    SUM(result = '승') OVER season,
+    SUM(result = '패') OVER season,
+    SUM(points_for) OVER season,
+    SUM(points_against) OVER season,
+    -- 최근 경기부터 {FORM_GAMES}경기 (LAG로 순서 보장)
+    result {''.join(f"|| COALESCE(',' || LAG(result, {i}) OVER games_by_date, '')" for i in range(1, FORM_GAMES))}
+FROM results
+WINDOW season AS (PARTITION BY team ORDER BY game_date ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW),
+       games_by_date AS (PARTITION BY team ORDER BY game_date)
+'''
+
+def build_standings(league_id):
+    """리그 팀별 경기 결과 + 누적 기록 테이블 다시 계산"""
+    version = get_data_version(league_id)
+
+    def _write(conn):
+        conn.execute('DELETE FROM league_team_games WHERE league_id = ?', (league_id,))
+        conn.execute(BUILD_QUERY, {'league_id': league_id})
+        set_derived_version(conn, DERIVED_NAME, league_id, version)
+        return conn.execute('SELECT COUNT(*) FROM league_team_games WHERE league_id = ?', (league_id,)).fetchone()[0]
+
+    rows = run_write(_write)
+    print(f"리그 {league_id} 순위 누적 기록 갱신: {rows}행")
+
+def ensure_standings(league_id):
+    """저장된 누적 기록이 현재 데이터 버전보다 오래되었으면 다시 계산"""
+    if get_derived_version(DERIVED_NAME, league_id) != get_data_version(league_id):
+        build_standings(league_id)
+
+def get_standings(league_id, as_of=None):
+    """리그 순위표 (as_of 날짜가 있으면 그 날짜까지의 경기 기준)
+
+    팀마다 as_of 이전 마지막 경기 행의 누적 기록만 읽으므로 시즌 전체를 다시 집계하지 않는다.
+    승률이 같으면 맞대결 승률 → 맞대결 득실차 → 전체 득실차 순으로 정한다.
+    """
+    ensure_standings(league_id)
+
+    def _get_standings():
+        with get_read_connection() as conn:
+            query = '''
+            WITH latest AS (
+                SELECT t.*
+                FROM league_team_games t
+                WHERE t.league_id = :league_id
+                  AND t.game_date = (
+                      SELECT MAX(game_date) FROM league_team_games
+                      WHERE league_id = t.league_id AND team = t.team AND game_date <= :as_of
+                  )
+            )
+            SELECT
+                ROW_NUMBER() OVER (ORDER BY CAST(wins AS FLOAT) / games DESC,
+                                            CAST(total_points_for - total_points_against AS FLOAT) / games DESC) as 순위,
+                team as 팀명,
+                games as 경기수,
+                wins as 승,
+                losses as 패,
+                CAST(wins AS FLOAT) / games as 승률,
+                ROUND(CAST(total_points_for AS FLOAT) / games, 1) as 득점,
+                ROUND(CAST(total_points_against AS FLOAT) / games, 1) as 실점,
+                ROUND(CAST(total_points_for - total_points_against AS FLOAT) / games, 1) as 득실차,
+                form as 최근경기
+            FROM latest
+            ORDER BY 순위
+            '''
+            params = {'league_id': league_id, 'as_of': as_of or '9999-12-31'}
+            return read_frame(query, conn, params=params, label='get_standings')
+
+    # 승률 동률은 상대 전적 행렬로 순서 결정
+    return apply_tiebreakers(execute_with_retry(_get_standings), get_head_to_head(league_id), as_of)
+
+def get_standing_dates(league_id):
+    """순위표 기준 날짜로 고를 수 있는 경기 날짜 목록 (최근 날짜부터)"""
+    ensure_standings(league_id)
+
+    def _get_dates():
+        with get_read_connection() as conn:
+            rows = conn.execute('''SELECT DISTINCT game_date FROM league_team_games
+                                   WHERE league_id = ? ORDER BY game_date DESC''', (league_id,)).fetchall()
+            return [row[0] for row in rows]
+
+    return execute_with_retry(_get_dates)
@@ -0,0 +1,121 @@
+import pandas as pd
+from database import get_read_connection, execute_with_retry, read_frame, TEAM_SPLIT_COLUMNS
+
+# 홈 / 원정 표시 이름
+VENUE_LABELS = {'home': '홈', 'away': '원정'}
+
+# 경기당 평균으로 보여 주는 팀 기록 (컬럼명: 표시 이름)
+AVERAGE_COLUMNS = {
+    'points_for': '득점',
+    'points_against': '실점',
+    'rebounds': '리바운드',
+    'assists': '어시스트',
+    'steals': '스틸',
+    'blocks': '블록',
+    'turnovers': '턴오버'
+}
+
+# 팀 기록 대비 비중을 계산하는 선수 기록 (선수 컬럼, 팀 컬럼, 표시 이름)
+SHARE_COLUMNS = (
+    ('points', 'points_for', '득점 비중'),
+    ('rebounds', 'rebounds', '리바운드 비중'),
+    ('assists', 'assists', '어시스트 비중')
+)
+
+def get_team_splits(league_id, team):
+    """팀 시즌 기록 테이블에서 리그 / 팀의 홈·원정 합계 행 조회 (기본 키 조회)"""
+    def _get_splits():
+        with get_read_connection() as conn:
+            query = 'SELECT * FROM team_season_splits WHERE league_id = ? AND team = ?'
+            return read_frame(query, conn, params=(league_id, team), label='get_team_splits', compact=False)
+
+    return execute_with_retry(_get_splits)
+
+def get_season_teams(league_id):
+    """팀 시즌 기록이 있는 리그 팀 목록"""
+    def _get_teams():
+        with get_read_connection() as conn:
+            rows = conn.execute('SELECT DISTINCT team FROM team_season_splits WHERE league_id = ? ORDER BY team',
+                                (league_id,)).fetchall()
+            return [row[0] for row in rows]
+
+    return execute_with_retry(_get_teams)
+
+def _ratio(made, attempt):
+    return round(made * 100.0 / attempt, 1) if attempt else None
+
+def _summary_row(row):
+    """합계 행 하나를 경기당 평균 / 성공률 행으로 변환"""
+    games = row['games']
+    summary = {'경기': int(games), '승': int(row['wins']), '패': int(row['losses'])}
+    for col, label in AVERAGE_COLUMNS.items():
+        summary[label] = round(row[col] / games, 1) if games else None
+    summary['득실차'] = round((row['points_for'] - row['points_against']) / games, 1) if games else None
+    summary['FG%'] = _ratio(row['field_goals_made'], row['field_goals_attempt'])
+    summary['3P%'] = _ratio(row['three_points_made'], row['three_points_attempt'])
+    summary['FT%'] = _ratio(row['free_throws_made'], row['free_throws_attempt'])
+    return summary
+
+def get_team_season(league_id, team):
+    """팀 시즌 요약 (전체 / 홈 / 원정 경기당 기록, 쿼터별 평균 득실점)
+
+    반환값: (venue_df, quarter_df). 팀 시즌 기록이 없으면 빈 DataFrame 두 개.
+    """
+    splits = get_team_splits(league_id, team)
+    if splits.empty:
+        return pd.DataFrame(), pd.DataFrame()
+
+    total = splits.drop(columns=['league_id', 'team', 'venue']).sum()
+    rows = [{'구분': '전체', **_summary_row(total)}]
+    for venue, label in VENUE_LABELS.items():
+        venue_rows = splits[splits['venue'] == venue]
+        if not venue_rows.empty:
+            rows.append({'구분': label, **_summary_row(venue_rows.iloc[0])})
+    venue_df = pd.DataFrame(rows)
+
+    games = total['games']
+    quarter_df = pd.DataFrame({
+        '쿼터': [f'{q}Q' for q in range(1, 5)],
+        '득점': [round(total[f'q{q}_for'] / games, 1) for q in range(1, 5)],
+        '실점': [round(total[f'q{q}_against'] / games, 1) for q in range(1, 5)]
+    })
+    quarter_df['득실차'] = (quarter_df['득점'] - quarter_df['실점']).round(1)
+    return venue_df, quarter_df
+
+def get_team_roster(league_id, team):
+    """리그 / 팀 선수 명단과 경기당 기록, 팀 기록 대비 비중(%)
+
+    선수 기록은 선수 통산 기록 테이블(player_career_splits)의 (리그, 팀) 행,
+    팀 합계는 팀 시즌 기록 테이블 행에서 읽으므로 경기 기록을 다시 집계하지 않는다.
+    """
+    def _get_roster():
+        with get_read_connection() as conn:
+            query = '''
+            SELECT p.player_name, s.games_played, s.seconds_played,
+                   s.points, s.rebounds, s.assists, s.steals, s.blocks, s.turnovers
+            FROM player_career_splits s
+            JOIN players p ON s.player_id = p.player_id
+            WHERE s.league_id = ? AND s.team = ?
+            '''
+            return read_frame(query, conn, params=(league_id, team), label='get_team_roster', compact=False)
+
+    players = execute_with_retry(_get_roster)
+    if players.empty:
+        return players
+    team_totals = get_team_splits(league_id, team)[['points_for', *TEAM_SPLIT_COLUMNS]].sum()
+
+    games = players['games_played'].where(players['games_played'] > 0)
+    roster = pd.DataFrame({
+        '선수명': players['player_name'],
+        '경기수': players['games_played'],
+        '출전시간': (players['seconds_played'] / 60 / games).round(1),
+        '득점': (players['points'] / games).round(1),
+        '리바운드': (players['rebounds'] / games).round(1),
+        '어시스트': (players['assists'] / games).round(1),
+        '스틸': (players['steals'] / games).round(1),
+        '블록': (players['blocks'] / games).round(1)
+    })
+    for player_col, team_col, label in SHARE_COLUMNS:
+        team_value = team_totals.get(team_col, 0)
+        roster[label] = (players[player_col] * 100.0 / team_value).round(1) if team_value else None
+    return roster.sort_values(['득점 비중', '선수명'], ascending=[False, True]).reset_index(drop=True)